@@ -7,10 +7,18 @@ the training materials generated from it become stale. This CLI detects that dri
 
 Subcommands
 -----------
-  snapshot  Capture the current parsed state of all source files as the new baseline.
-  check     Re-parse current sources, diff against the baseline, emit a drift report.
+  snapshot  Capture the current parsed state of all source files as a new baseline.
+  check     Re-parse current sources, diff against a baseline, emit a drift report.
             Exit code 0 = no drift, 1 = drift detected (suitable for CI gates).
-  status    Show the current snapshot date and a summary of what's tracked.
+            `--against <baseline>` diffs against an older baseline;
+            `--from <rev> --to <rev>` diffs two git revisions, reading blobs
+            from the object store without touching the working tree.
+  status    List baselines and show what's tracked in the latest one.
+  watch     Stay running; re-fingerprint sources as they change (inotify, with
+            a polling fallback) and keep the drift report current. Optionally
+            regenerate the affected trainer scenarios / run.py layers.
+  history   Show how one source's fingerprint moved across baselines
+            (or, with --step <hash>, every baseline containing that step).
 
 Design
 ------
@@ -20,9 +28,19 @@ fingerprint" — a normalized dict capturing only the fields that, if changed,
 would invalidate generated training. Cosmetic changes (descriptions, comments,
 formatting) are intentionally excluded so we don't trigger spurious regenerations.
 
-The fingerprint is stored in poc/snapshots/<file>.snapshot.json. On `check`,
-we recompute and diff. Each diff is mapped through scenario_deps.yaml to the
-list of scenarios and generated artifacts that need regeneration.
+Every baseline lives in one SQLite database, poc/snapshots/snapshots.db —
+one row per source per baseline (fingerprint plus the raw file's size, mtime
+and sha256) and one child row per Tosca step fingerprint. Baselines are never
+overwritten, so older sync points stay queryable. The database is local
+(gitignored); each `snapshot` also exports its baseline as text, one
+poc/snapshots/<file>.snapshot.json per source, which is what gets committed.
+A checkout without the database builds it from those files on first use.
+
+On `check`, a file whose bytes are identical to the baseline is skipped
+without parsing (stat first, hash only when size or mtime moved); only files
+whose bytes changed are re-parsed and diffed. Each diff is mapped through
+scenario_deps.yaml to the list of scenarios and generated artifacts that need
+regeneration.
 
 Output: poc/output/drift_report.json (machine-readable) and
         poc/output/drift_report.md (human-readable).
@@ -31,9 +49,20 @@ Output: poc/output/drift_report.json (machine-readable) and
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
+import ctypes
+import ctypes.util
+import fnmatch
 import hashlib
+import io
 import json
+import os
+import select
+import sqlite3
+import struct
+import subprocess
 import sys
+import time
 from dataclasses import asdict
 from datetime import datetime, timezone
 from pathlib import Path
@@ -50,6 +79,7 @@ from parsers.bpmn_parser import BpmnParser, BpmnProcess  # noqa: E402
 
 
 SNAPSHOT_DIR = SCRIPT_DIR / "snapshots"
+SNAPSHOT_DB = SNAPSHOT_DIR / "snapshots.db"
 OUTPUT_DIR = SCRIPT_DIR / "output"
 CONFIG_PATH = SCRIPT_DIR / "config.yaml"
 DEPS_PATH = SCRIPT_DIR / "data" / "scenario_deps.yaml"
@@ -157,23 +187,262 @@ def fingerprint_bpmn(process: BpmnProcess) -> dict[str, Any]:
     }
 
 
-def fingerprint_overlay(yaml_path: Path) -> dict[str, Any]:
+def fingerprint_overlay(yaml_path: Path, raw: bytes | None = None) -> dict[str, Any]:
     """Treat overlay YAML as a structural dict — full content matters."""
-    with yaml_path.open() as f:
-        data = yaml.safe_load(f) or {}
+    if raw is not None:
+        data = yaml.safe_load(raw) or {}
+    else:
+        with yaml_path.open() as f:
+            data = yaml.safe_load(f) or {}
     return {"kind": "overlay", "content": data, "content_hash": _hash_dict(data)}
 
 
 # ---------------------------------------------------------------------------
-# Snapshot I/O
+# Raw file identity (stat-first short circuit)
 # ---------------------------------------------------------------------------
 
-def _snapshot_path(source_path: Path) -> Path:
-    """Map a source file to its snapshot file in poc/snapshots/."""
-    SNAPSHOT_DIR.mkdir(exist_ok=True)
-    safe_name = str(source_path.relative_to(SCRIPT_DIR)).replace("/", "__").replace("\\", "__")
-    return SNAPSHOT_DIR / f"{safe_name}.snapshot.json"
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def raw_identity(source_path: Path) -> dict[str, Any]:
+    """Size, mtime and content hash of the raw source bytes."""
+    st = source_path.stat()
+    return {
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": _sha256_file(source_path),
+    }
+
+
+def raw_unchanged(source_path: Path, recorded: dict | None) -> bool:
+    """
+    True if the file's bytes are identical to the recorded raw identity.
+
+    Size + mtime matching is trusted without reading the file. If either
+    moved (fresh CI checkout, `touch`, editor save with no edit) we hash
+    the bytes and compare — parsing is only needed when the hash differs.
+    Snapshots captured before raw identity was recorded always fall through.
+    """
+    if not recorded or "sha256" not in recorded:
+        return False
+    st = source_path.stat()
+    if st.st_size != recorded.get("size"):
+        return False
+    if st.st_mtime_ns == recorded.get("mtime_ns"):
+        return True
+    return _sha256_file(source_path) == recorded["sha256"]
+
+
+# ---------------------------------------------------------------------------
+# Snapshot store (SQLite)
+# ---------------------------------------------------------------------------
 
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS baselines (
+    id          INTEGER PRIMARY KEY,
+    name        TEXT NOT NULL UNIQUE,
+    captured_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sources (
+    id               INTEGER PRIMARY KEY,
+    baseline_id      INTEGER NOT NULL REFERENCES baselines(id) ON DELETE CASCADE,
+    source           TEXT NOT NULL,
+    kind             TEXT NOT NULL,
+    captured_at      TEXT NOT NULL,
+    raw_size         INTEGER,
+    raw_mtime_ns     INTEGER,
+    raw_sha256       TEXT,
+    fingerprint_hash TEXT NOT NULL,
+    fingerprint      TEXT NOT NULL,
+    UNIQUE (baseline_id, source)
+);
+CREATE INDEX IF NOT EXISTS idx_sources_source ON sources (source, baseline_id);
+CREATE TABLE IF NOT EXISTS steps (
+    source_row_id INTEGER NOT NULL REFERENCES sources(id) ON DELETE CASCADE,
+    position      INTEGER NOT NULL,
+    step_id       TEXT NOT NULL,
+    step_number   INTEGER,
+    hash          TEXT NOT NULL,
+    PRIMARY KEY (source_row_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_steps_hash ON steps (hash);
+"""
+
+
+class SnapshotStore:
+    """
+    All baselines in one SQLite file (poc/snapshots/snapshots.db).
+
+    Each `snapshot` run creates a new named baseline rather than overwriting
+    the previous one, so `check --against <baseline>` can diff against any
+    earlier sync point and `history <source>` can show how a source moved
+    over time. Per-step fingerprints live in a child table indexed by hash.
+
+    Only `snapshot` opens the store with create=True. Read-only commands
+    open it read-only and get FileNotFoundError when it does not exist yet
+    and there are no exported *.snapshot.json files to build it from.
+    The exported files (or legacy ones from before the database) are
+    imported once when the database is first created, as the baseline
+    they record or as "legacy-json".
+    """
+
+    def __init__(self, path: Path = SNAPSHOT_DB, create: bool = False):
+        if not create and not path.exists() and any(path.parent.glob("*.snapshot.json")):
+            create = True   # fresh checkout: build the store from the committed text export
+        if create:
+            path.parent.mkdir(exist_ok=True)
+            self.conn = sqlite3.connect(str(path))
+        elif path.exists():
+            self.conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+        else:
+            raise FileNotFoundError(f"no snapshot store at {path}")
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        if create:
+            self.conn.executescript(_SCHEMA)
+            if self.conn.execute("SELECT COUNT(*) FROM baselines").fetchone()[0] == 0:
+                self._import_json(path.parent)
+
+    def __enter__(self) -> "SnapshotStore":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        # Writes are batched into one transaction per store session, so a
+        # parse error halfway through `snapshot` leaves no partial baseline.
+        if exc_type is None:
+            self.conn.commit()
+        else:
+            self.conn.rollback()
+        self.conn.close()
+
+    # -- writes --------------------------------------------------------------
+
+    def create_baseline(self, name: str | None = None) -> sqlite3.Row:
+        captured_at = datetime.now(timezone.utc).isoformat()
+        if name is None:
+            name = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        self.conn.execute("INSERT INTO baselines (name, captured_at) VALUES (?, ?)", (name, captured_at))
+        return self.resolve_baseline(name)
+
+    def put(self, baseline_id: int, source_rel: str, fingerprint: dict,
+            raw: dict | None, captured_at: str) -> None:
+        raw = raw or {}
+        cur = self.conn.execute(
+            "INSERT OR REPLACE INTO sources (baseline_id, source, kind, captured_at, raw_size,"
+            " raw_mtime_ns, raw_sha256, fingerprint_hash, fingerprint)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                baseline_id, source_rel, fingerprint.get("kind", "?"), captured_at,
+                raw.get("size"), raw.get("mtime_ns"), raw.get("sha256"),
+                _hash_dict(fingerprint),
+                json.dumps(fingerprint, sort_keys=True, separators=(",", ":")),
+            ),
+        )
+        self.conn.executemany(
+            "INSERT INTO steps (source_row_id, position, step_id, step_number, hash) VALUES (?, ?, ?, ?, ?)",
+            [
+                (cur.lastrowid, i, s["step_id"], s.get("step_number"), s["hash"])
+                for i, s in enumerate(fingerprint.get("steps", []))
+            ],
+        )
+
+    def _import_json(self, directory: Path) -> None:
+        exported = sorted(directory.glob("*.snapshot.json"))
+        if not exported:
+            return
+        records = []
+        for path in exported:
+            with path.open() as f:
+                records.append(json.load(f))
+        names = {r.get("baseline") for r in records}
+        name = names.pop() if len(names) == 1 and None not in names else "legacy-json"
+        captured = min(r.get("captured_at", "") for r in records) or datetime.now(timezone.utc).isoformat()
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO baselines (name, captured_at) VALUES (?, ?)", (name, captured)
+            )
+            for r in records:
+                self.put(cur.lastrowid, r["source"], r["fingerprint"], r.get("raw"), r.get("captured_at", captured))
+
+    def export_json(self, baseline: sqlite3.Row, directory: Path = SNAPSHOT_DIR) -> list[Path]:
+        """
+        Write a baseline as one <file>.snapshot.json per source, replacing
+        the previous export. Raw identity keeps size and sha256 only; mtimes
+        are local to one checkout.
+        """
+        written = []
+        for rel, record in sorted(self.load_baseline(baseline["id"]).items()):
+            raw = record["raw"] and {"size": record["raw"]["size"], "sha256": record["raw"]["sha256"]}
+            path = directory / (rel.replace("/", "__").replace("\\", "__") + ".snapshot.json")
+            path.write_text(json.dumps({**record, "raw": raw, "baseline": baseline["name"]},
+                                       indent=2, sort_keys=True) + "\n")
+            written.append(path)
+        for stale in set(directory.glob("*.snapshot.json")) - set(written):
+            stale.unlink()
+        return written
+
+    # -- reads ---------------------------------------------------------------
+
+    def resolve_baseline(self, name: str | None = None) -> sqlite3.Row | None:
+        """Look up a baseline by name, or the most recent one if name is None."""
+        if name is None:
+            return self.conn.execute(
+                "SELECT * FROM baselines ORDER BY captured_at DESC, id DESC LIMIT 1"
+            ).fetchone()
+        return self.conn.execute("SELECT * FROM baselines WHERE name = ?", (name,)).fetchone()
+
+    def list_baselines(self) -> list[sqlite3.Row]:
+        return self.conn.execute(
+            "SELECT b.*, COUNT(s.id) AS source_count FROM baselines b"
+            " LEFT JOIN sources s ON s.baseline_id = b.id"
+            " GROUP BY b.id ORDER BY b.captured_at, b.id"
+        ).fetchall()
+
+    def load_baseline(self, baseline_id: int) -> dict[str, dict]:
+        """Every source in a baseline in one query: {source_rel: snapshot record}."""
+        rows = self.conn.execute("SELECT * FROM sources WHERE baseline_id = ?", (baseline_id,))
+        return {row["source"]: _row_to_record(row) for row in rows}
+
+    def history(self, source_rel: str) -> list[sqlite3.Row]:
+        return self.conn.execute(
+            "SELECT b.name AS baseline, b.captured_at AS baseline_captured_at, s.*,"
+            " (SELECT COUNT(*) FROM steps WHERE source_row_id = s.id) AS step_count"
+            " FROM sources s JOIN baselines b ON b.id = s.baseline_id"
+            " WHERE s.source = ? ORDER BY b.captured_at, b.id",
+            (source_rel,),
+        ).fetchall()
+
+    def find_step(self, step_hash: str) -> list[sqlite3.Row]:
+        """Every baseline/source/step that recorded a step with this fingerprint hash."""
+        return self.conn.execute(
+            "SELECT b.name AS baseline, s.source, st.step_id, st.step_number"
+            " FROM steps st JOIN sources s ON s.id = st.source_row_id"
+            " JOIN baselines b ON b.id = s.baseline_id"
+            " WHERE st.hash = ? ORDER BY b.captured_at, b.id",
+            (step_hash,),
+        ).fetchall()
+
+
+def _row_to_record(row: sqlite3.Row) -> dict[str, Any]:
+    raw = None
+    if row["raw_sha256"]:
+        raw = {"size": row["raw_size"], "mtime_ns": row["raw_mtime_ns"], "sha256": row["raw_sha256"]}
+    return {
+        "source": row["source"],
+        "captured_at": row["captured_at"],
+        "raw": raw,
+        "fingerprint": json.loads(row["fingerprint"]),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Source loading
+# ---------------------------------------------------------------------------
 
 def load_config() -> dict:
     with CONFIG_PATH.open() as f:
@@ -187,17 +456,23 @@ def load_deps() -> dict:
         return yaml.safe_load(f)
 
 
-def parse_source(source_path: Path) -> dict[str, Any]:
-    """Dispatch to the right parser based on file location/extension."""
+def parse_source(source_path: Path, raw: bytes | None = None) -> dict[str, Any]:
+    """
+    Dispatch to the right parser based on file location/extension.
+
+    If `raw` is given (e.g. a blob read from git), those bytes are parsed
+    instead of the file at `source_path`.
+    """
     rel = str(source_path.relative_to(SCRIPT_DIR))
+    xml_input = io.BytesIO(raw) if raw is not None else str(source_path)
     if "tosca" in rel and rel.endswith(".xml"):
-        script = ToscaParser().parse(str(source_path))
+        script = ToscaParser().parse(xml_input)
         return fingerprint_tosca(script)
     elif "bpmn" in rel and rel.endswith(".xml"):
-        process = BpmnParser().parse(str(source_path))
+        process = BpmnParser().parse(xml_input)
         return fingerprint_bpmn(process)
     elif rel.endswith(".yaml") or rel.endswith(".yml"):
-        return fingerprint_overlay(source_path)
+        return fingerprint_overlay(source_path, raw)
     else:
         raise ValueError(f"Unknown source type: {rel}")
 
@@ -324,37 +599,208 @@ def diff_fingerprints(old: dict, new: dict) -> list[dict]:
 # Mapping changes to affected scenarios
 # ---------------------------------------------------------------------------
 
-def affected_scenarios(changed_source_rel: str, deps: dict) -> dict[str, list[str]]:
+_GLOB_CHARS = frozenset("*?[")
+
+
+class DependencyIndex:
+    """
+    Inverted view of scenario_deps.yaml: source path → scenarios/artifacts.
+
+    Built once per run, so mapping a changed source is a dict lookup instead
+    of a scan over every scenario and artifact. Three kinds of edge:
+
+      - exact paths     `data/tosca/goods_receipt.xml`
+      - glob patterns   `data/tosca/*.xml` (fnmatch; every pattern is checked
+                        even after an exact hit, since another scenario may
+                        match the same path by glob — results are memoized
+                        per path, so each source pays for this once per run)
+      - depends_on      a scenario or artifact may list other scenario ids /
+                        artifact keys it is built from; anything that makes
+                        the upstream stale makes it stale too (transitively,
+                        e.g. overlay → transaction artifact → scenario)
+    """
+
+    def __init__(self, deps: dict):
+        self._exact: dict[str, set[tuple[str, str]]] = {}
+        self._patterns: list[tuple[str, tuple[str, str]]] = []
+        self._dependents: dict[tuple[str, str], set[tuple[str, str]]] = {}
+        self._memo: dict[str, dict[str, list[str]]] = {}
+
+        scenarios_block = deps.get("scenarios", {}) or {}
+        artifacts_block = scenarios_block.get("generated_artifacts", {}) or {}
+        nodes = [
+            (("scenarios", k), spec or {}) for k, spec in scenarios_block.items() if k != "generated_artifacts"
+        ] + [(("artifacts", k), spec or {}) for k, spec in artifacts_block.items()]
+        names: dict[str, list[tuple[str, str]]] = {}
+        for node, _ in nodes:
+            names.setdefault(node[1], []).append(node)
+
+        for node, spec in nodes:
+            for kind in ("tosca", "bpmn", "overlay"):
+                for path in spec.get(kind, []) or []:
+                    if _GLOB_CHARS.intersection(path):
+                        self._patterns.append((path, node))
+                    else:
+                        self._exact.setdefault(path, set()).add(node)
+            for upstream in spec.get("depends_on", []) or []:
+                for up_node in names.get(upstream, []):
+                    self._dependents.setdefault(up_node, set()).add(node)
+
+    def _direct(self, source_rel: str) -> set[tuple[str, str]]:
+        hits = set(self._exact.get(source_rel, ()))
+        for pattern, node in self._patterns:
+            if fnmatch.fnmatchcase(source_rel, pattern):
+                hits.add(node)
+        return hits
+
+    def lookup(self, source_rel: str) -> dict[str, list[str]]:
+        cached = self._memo.get(source_rel)
+        if cached is None:
+            seen = self._direct(source_rel)
+            queue = list(seen)
+            while queue:
+                for dependent in self._dependents.get(queue.pop(), ()):
+                    if dependent not in seen:
+                        seen.add(dependent)
+                        queue.append(dependent)
+            cached = {
+                "scenarios": sorted(k for block, k in seen if block == "scenarios"),
+                "artifacts": sorted(k for block, k in seen if block == "artifacts"),
+            }
+            self._memo[source_rel] = cached
+        return {"scenarios": list(cached["scenarios"]), "artifacts": list(cached["artifacts"])}
+
+
+def affected_scenarios(changed_source_rel: str, deps: dict,
+                       index: DependencyIndex | None = None) -> dict[str, list[str]]:
     """
     Given a source file (relative path under poc/), return:
       {
         "scenarios": [scenario_id, ...],
         "artifacts": [artifact_key, ...],
       }
+
+    Pass a prebuilt `index` when mapping many sources; without one the
+    index is rebuilt from `deps` on every call.
     """
-    affected = {"scenarios": [], "artifacts": []}
-    scenarios_block = deps.get("scenarios", {}) or {}
+    if index is None:
+        index = DependencyIndex(deps)
+    return index.lookup(changed_source_rel)
 
-    for scenario_id, dep_spec in scenarios_block.items():
-        if scenario_id == "generated_artifacts":
-            continue
-        all_deps = []
-        for kind in ("tosca", "bpmn", "overlay"):
-            all_deps.extend(dep_spec.get(kind, []) or [])
-        if changed_source_rel in all_deps:
-            affected["scenarios"].append(scenario_id)
 
-    artifacts_block = scenarios_block.get("generated_artifacts", {}) or {}
-    for artifact_key, dep_spec in artifacts_block.items():
-        all_deps = []
-        for kind in ("tosca", "bpmn", "overlay"):
-            all_deps.extend(dep_spec.get(kind, []) or [])
-        if changed_source_rel in all_deps:
-            affected["artifacts"].append(artifact_key)
+# ---------------------------------------------------------------------------
+# Git revisions (check --from/--to)
+# ---------------------------------------------------------------------------
 
-    affected["scenarios"].sort()
-    affected["artifacts"].sort()
-    return affected
+class GitBlobReader:
+    """
+    Read files at arbitrary revisions straight from the object store.
+
+    One long-lived `git cat-file --batch` process serves every lookup, so
+    reading N sources at two revisions costs one spawn, not 2N — and neither
+    the working tree nor the snapshot store is touched.
+    """
+
+    def __init__(self, cwd: Path = SCRIPT_DIR):
+        self.cwd = cwd
+        self.prefix = subprocess.check_output(
+            ["git", "rev-parse", "--show-prefix"], cwd=cwd, text=True
+        ).strip()
+        self._proc = subprocess.Popen(
+            ["git", "cat-file", "--batch"], cwd=cwd,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        )
+
+    def __enter__(self) -> "GitBlobReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._proc.stdin.close()
+        self._proc.wait()
+
+    def resolve(self, rev: str) -> str:
+        """Full commit sha for `rev`; raises ValueError if it doesn't name a commit."""
+        try:
+            return subprocess.check_output(
+                ["git", "rev-parse", "--verify", "--quiet", f"{rev}^{{commit}}"],
+                cwd=self.cwd, text=True,
+            ).strip()
+        except subprocess.CalledProcessError:
+            raise ValueError(f"Not a git revision: {rev}")
+
+    def read(self, commit: str, rel: str) -> tuple[str, bytes] | None:
+        """(blob sha, content) of poc/<rel> at `commit`, or None if absent."""
+        self._proc.stdin.write(f"{commit}:{self.prefix}{rel}\n".encode())
+        self._proc.stdin.flush()
+        header = self._proc.stdout.readline().decode().split()
+        if len(header) != 3 or header[1] != "blob":
+            return None
+        sha, _, size = header
+        data = self._proc.stdout.read(int(size))
+        self._proc.stdout.read(1)  # trailing LF
+        return sha, data
+
+
+def _fingerprint_blob(job: tuple[str, bytes]) -> dict[str, Any]:
+    rel, data = job
+    return parse_source(SCRIPT_DIR / rel, data)
+
+
+def check_revisions(rev_from: str, rev_to: str, workers: int | None) -> int:
+    """Drift between two git revisions, read from git objects only."""
+    with GitBlobReader() as git:
+        try:
+            old_commit, new_commit = git.resolve(rev_from), git.resolve(rev_to)
+        except ValueError as e:
+            print(e)
+            return 2
+
+        # Sources and the dependency map are taken from the `--to` side.
+        config_blob = git.read(new_commit, CONFIG_PATH.name)
+        if config_blob is None:
+            print(f"No {CONFIG_PATH.name} at {rev_to}.")
+            return 2
+        config = yaml.safe_load(config_blob[1])
+        deps_blob = git.read(new_commit, str(DEPS_PATH.relative_to(SCRIPT_DIR)))
+        deps = (yaml.safe_load(deps_blob[1]) if deps_blob else None) or {"scenarios": {}}
+
+        sides = {}
+        for src in collect_sources(config):
+            rel = str(src.relative_to(SCRIPT_DIR))
+            sides[rel] = (git.read(old_commit, rel), git.read(new_commit, rel))
+
+    results: dict[str, dict] = {}
+    jobs: list[tuple[str, bytes]] = []
+    for rel, (old, new) in sides.items():
+        if new is None:
+            results[rel] = {"state": "source_missing", "diff": [{"type": "source_missing"}], "reparsed": False}
+        elif old is None:
+            results[rel] = {"state": "missing_baseline", "diff": [], "reparsed": False}
+        elif old[0] == new[0]:
+            # Same blob sha: bytes are identical, nothing to parse.
+            results[rel] = {"state": "unchanged", "diff": [], "reparsed": False}
+        else:
+            jobs += [(rel, old[1]), (rel, new[1])]
+
+    if jobs:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            fingerprints = list(pool.map(_fingerprint_blob, jobs))
+        for i in range(0, len(jobs), 2):
+            rel = jobs[i][0]
+            diffs = diff_fingerprints(fingerprints[i], fingerprints[i + 1])
+            results[rel] = {"state": "checked", "diff": diffs, "reparsed": True}
+
+    ordered = {rel: results[rel] for rel in sides}
+    label = f"{rev_from}..{rev_to}"
+    report = build_report(ordered, DependencyIndex(deps), label)
+    report["revisions"] = {"from": old_commit, "to": new_commit}
+    json_path, md_path = write_report(report)
+
+    print(f"\nDrift {label} ({old_commit[:12]}..{new_commit[:12]})")
+    print(f"Drift report written to {json_path.relative_to(SCRIPT_DIR)} and {md_path.relative_to(SCRIPT_DIR)}")
+    print(f"  Parsed {len(jobs) // 2} of {len(sides)} source(s); the rest have identical blobs at both revisions.")
+    _print_drift_summary(report)
+    return 1 if report["sources_with_changes"] > 0 else 0
 
 
 # ---------------------------------------------------------------------------
@@ -364,71 +810,73 @@ def affected_scenarios(changed_source_rel: str, deps: dict) -> dict[str, list[st
 def cmd_snapshot(args) -> int:
     config = load_config()
     sources = collect_sources(config)
-    SNAPSHOT_DIR.mkdir(exist_ok=True)
-
-    print(f"Capturing baseline snapshot of {len(sources)} source files...")
-    for src in sources:
-        if not src.exists():
-            print(f"  ✗ {src.relative_to(SCRIPT_DIR)} — file not found, skipping")
-            continue
-        fp = parse_source(src)
-        snap_path = _snapshot_path(src)
-        with snap_path.open("w") as f:
-            json.dump(
-                {
-                    "source": str(src.relative_to(SCRIPT_DIR)),
-                    "captured_at": datetime.now(timezone.utc).isoformat(),
-                    "fingerprint": fp,
-                },
-                f,
-                indent=2,
-                sort_keys=True,
-            )
-        print(f"  ✓ {src.relative_to(SCRIPT_DIR)} → {snap_path.relative_to(SCRIPT_DIR)}")
 
-    print(f"\nBaseline captured. Run `python detect_changes.py check` after source changes.")
+    with SnapshotStore(create=True) as store:
+        if args.name and store.resolve_baseline(args.name) is not None:
+            print(f"Baseline `{args.name}` already exists — pick a new name.")
+            return 2
+        baseline = store.create_baseline(args.name)
+        print(f"Capturing baseline `{baseline['name']}` of {len(sources)} source files...")
+        for src in sources:
+            rel = str(src.relative_to(SCRIPT_DIR))
+            if not src.exists():
+                print(f"  ✗ {rel} — file not found, skipping")
+                continue
+            store.put(baseline["id"], rel, parse_source(src), raw_identity(src),
+                      datetime.now(timezone.utc).isoformat())
+            print(f"  ✓ {rel}")
+        store.export_json(baseline)
+
+    print(f"\nBaseline captured in {SNAPSHOT_DB.relative_to(SCRIPT_DIR)} and exported to "
+          f"{SNAPSHOT_DIR.relative_to(SCRIPT_DIR)}/*.snapshot.json (commit those). "
+          f"Run `python detect_changes.py check` after source changes.")
     return 0
 
 
-def cmd_check(args) -> int:
-    config = load_config()
-    deps = load_deps()
-    sources = collect_sources(config)
+def check_source(src: Path, snap: dict | None) -> dict[str, Any]:
+    """
+    Compare one source against its baseline record.
 
-    OUTPUT_DIR.mkdir(exist_ok=True)
+    Returns {"state": ..., "diff": [...], "reparsed": bool} where state is
+    one of source_missing, missing_baseline, unchanged or checked.
+    """
+    if not src.exists():
+        return {"state": "source_missing", "diff": [{"type": "source_missing"}], "reparsed": False}
+    if snap is None:
+        return {"state": "missing_baseline", "diff": [], "reparsed": False}
+    if raw_unchanged(src, snap.get("raw")):
+        return {"state": "unchanged", "diff": [], "reparsed": False}
+    diffs = diff_fingerprints(snap["fingerprint"], parse_source(src))
+    return {"state": "checked", "diff": diffs, "reparsed": True}
+
+
+def build_report(results: dict[str, dict], deps_index: DependencyIndex,
+                 baseline_name: str | None) -> dict[str, Any]:
+    """Assemble the drift report from per-source `check_source` results."""
     report = {
         "generated_at": datetime.now(timezone.utc).isoformat(),
-        "sources_checked": len(sources),
+        "baseline": baseline_name,
+        "sources_checked": len(results),
         "sources_with_changes": 0,
+        "sources_reparsed": 0,
         "missing_baselines": [],
         "changes": [],
         "stale_scenarios": set(),
         "stale_artifacts": set(),
     }
 
-    for src in sources:
-        rel = str(src.relative_to(SCRIPT_DIR))
-        snap_path = _snapshot_path(src)
-
-        if not src.exists():
-            report["changes"].append({"source": rel, "diff": [{"type": "source_missing"}]})
-            continue
-
-        if not snap_path.exists():
+    for rel, result in results.items():
+        report["sources_reparsed"] += result["reparsed"]
+        if result["state"] == "source_missing":
+            report["changes"].append({"source": rel, "diff": result["diff"]})
+        elif result["state"] == "missing_baseline":
             report["missing_baselines"].append(rel)
-            continue
-
-        with snap_path.open() as f:
-            old = json.load(f)["fingerprint"]
-        new = parse_source(src)
-
-        diffs = diff_fingerprints(old, new)
-        if diffs:
+        elif result["diff"]:
             report["sources_with_changes"] += 1
-            affected = affected_scenarios(rel, deps)
+            affected = deps_index.lookup(rel)
             report["changes"].append({
                 "source": rel,
-                "diff": diffs,
+                "diff": result["diff"],
                 "affected_scenarios": affected["scenarios"],
                 "affected_artifacts": affected["artifacts"],
             })
@@ -437,44 +885,377 @@ def cmd_check(args) -> int:
 
     report["stale_scenarios"] = sorted(report["stale_scenarios"])
     report["stale_artifacts"] = sorted(report["stale_artifacts"])
+    return report
+
 
+def write_report(report: dict) -> tuple[Path, Path]:
+    OUTPUT_DIR.mkdir(exist_ok=True)
     json_path = OUTPUT_DIR / "drift_report.json"
     md_path = OUTPUT_DIR / "drift_report.md"
     with json_path.open("w") as f:
         json.dump(report, f, indent=2)
     with md_path.open("w") as f:
         f.write(_render_markdown(report))
+    return json_path, md_path
 
-    drift_found = report["sources_with_changes"] > 0
-    print(f"\nDrift report written to {json_path.relative_to(SCRIPT_DIR)} and {md_path.relative_to(SCRIPT_DIR)}")
+
+def _print_drift_summary(report: dict) -> None:
     if report["missing_baselines"]:
         print(f"  ⚠  No baseline for: {', '.join(report['missing_baselines'])} — run `snapshot` first")
-    if drift_found:
+    if report["sources_with_changes"] > 0:
         print(f"  ⚠  Drift detected in {report['sources_with_changes']} source(s).")
         print(f"     Stale scenarios: {', '.join(report['stale_scenarios']) or '(none)'}")
         print(f"     Stale artifacts: {', '.join(report['stale_artifacts']) or '(none)'}")
-        return 1
-    print("  ✓ No drift detected. All training assets in sync with sources.")
-    return 0
+    else:
+        print("  ✓ No drift detected. All training assets in sync with sources.")
+
+
+def _no_store() -> int:
+    print(f"No snapshot store at {SNAPSHOT_DB.relative_to(SCRIPT_DIR)}. "
+          f"Run `python detect_changes.py snapshot` first.")
+    return 2
+
+
+def _load_baseline_snapshots(name: str | None) -> tuple[sqlite3.Row | None, dict[str, dict]]:
+    with SnapshotStore() as store:
+        baseline = store.resolve_baseline(name)
+        snapshots = store.load_baseline(baseline["id"]) if baseline else {}
+    return baseline, snapshots
+
+
+def cmd_check(args) -> int:
+    if args.rev_from or args.rev_to:
+        if args.against:
+            print("--against cannot be combined with --from/--to.")
+            return 2
+        if not args.rev_from:
+            print("--to needs a --from revision.")
+            return 2
+        return check_revisions(args.rev_from, args.rev_to or "HEAD", args.workers)
+
+    config = load_config()
+    deps_index = DependencyIndex(load_deps())
+    sources = collect_sources(config)
+
+    try:
+        baseline, snapshots = _load_baseline_snapshots(args.against)
+    except FileNotFoundError:
+        return _no_store()
+    if args.against and baseline is None:
+        print(f"No baseline named `{args.against}`. Run `python detect_changes.py status` to list baselines.")
+        return 2
+
+    results = {}
+    for src in sources:
+        rel = str(src.relative_to(SCRIPT_DIR))
+        results[rel] = check_source(src, snapshots.get(rel))
+    report = build_report(results, deps_index, baseline["name"] if baseline else None)
+    json_path, md_path = write_report(report)
+
+    print(f"\nDrift report written to {json_path.relative_to(SCRIPT_DIR)} and {md_path.relative_to(SCRIPT_DIR)}")
+    states = [r["state"] for r in results.values()]
+    counts = [f"{states.count('unchanged')} byte-identical to baseline"]
+    if states.count("source_missing"):
+        counts.append(f"{states.count('source_missing')} missing")
+    if states.count("missing_baseline"):
+        counts.append(f"{states.count('missing_baseline')} without a baseline")
+    print(f"  Re-parsed {report['sources_reparsed']} of {len(sources)} source(s); {', '.join(counts)}.")
+    _print_drift_summary(report)
+    return 1 if report["sources_with_changes"] > 0 else 0
 
 
 def cmd_status(args) -> int:
     config = load_config()
     sources = collect_sources(config)
 
-    print("Drift detection — current baseline status")
+    try:
+        with SnapshotStore() as store:
+            baselines = store.list_baselines()
+            baseline = store.resolve_baseline(args.against)
+            snapshots = store.load_baseline(baseline["id"]) if baseline else {}
+    except FileNotFoundError:
+        return _no_store()
+
+    print("Drift detection — baseline status")
     print("-" * 60)
+    if not baselines:
+        print("  No baselines captured yet. Run `python detect_changes.py snapshot`.")
+        return 0
+    for b in baselines:
+        marker = "→" if baseline is not None and b["id"] == baseline["id"] else " "
+        print(f"  {marker} {b['name']:30s}  {b['source_count']:3d} source(s)  {b['captured_at']}")
+    print()
+    if baseline is None:
+        print(f"  No baseline named `{args.against}`.")
+        return 2
     for src in sources:
         rel = str(src.relative_to(SCRIPT_DIR))
-        snap_path = _snapshot_path(src)
-        if not snap_path.exists():
+        data = snapshots.get(rel)
+        if data is None:
             print(f"  ✗ {rel:50s}  no baseline")
             continue
-        with snap_path.open() as f:
-            data = json.load(f)
-        captured = data.get("captured_at", "?")
-        kind = data.get("fingerprint", {}).get("kind", "?")
-        print(f"  ✓ {rel:50s}  {kind:8s}  {captured}")
+        kind = data["fingerprint"].get("kind", "?")
+        print(f"  ✓ {rel:50s}  {kind:8s}  {data['captured_at']}")
+    return 0
+
+
+def cmd_history(args) -> int:
+    try:
+        store = SnapshotStore()
+    except FileNotFoundError:
+        return _no_store()
+    with store:
+        if args.step:
+            rows = store.find_step(args.step)
+            if not rows:
+                print(f"No baseline recorded a step with hash {args.step}.")
+                return 1
+            print(f"Step hash {args.step}")
+            print("-" * 60)
+            for r in rows:
+                print(f"  {r['baseline']:30s}  {r['source']:40s}  {r['step_id']} (#{r['step_number']})")
+            return 0
+        rows = store.history(args.source)
+
+    if not rows:
+        print(f"No baselines recorded for `{args.source}`.")
+        return 1
+    print(f"History — {args.source}")
+    print("-" * 60)
+    prev = None
+    for r in rows:
+        if prev is None:
+            note = "first capture"
+        elif r["fingerprint_hash"] == prev:
+            note = "unchanged"
+        else:
+            note = "changed"
+        sha = (r["raw_sha256"] or "")[:12] or "-"
+        print(f"  {r['baseline']:30s}  {r['kind']:8s}  fp {r['fingerprint_hash']}  raw {sha:12s}  "
+              f"{r['step_count']:3d} step(s)  {note}")
+        prev = r["fingerprint_hash"]
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Watch mode
+# ---------------------------------------------------------------------------
+
+DATA_DIR = SCRIPT_DIR / "data"
+SCENARIOS_DIR = SCRIPT_DIR / "generators" / "scenarios"
+
+
+class _InotifyWatcher:
+    """
+    Minimal inotify(7) binding via ctypes — Linux only, no extra dependency.
+
+    Watches every directory under the given roots (and directories created
+    later). State is one wd → path entry per watched directory, so memory
+    stays flat no matter how long the daemon runs.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, roots: list[Path]):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._libc = libc
+        self._fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: dict[int, Path] = {}
+        for root in roots:
+            self._add_tree(root)
+
+    def _add_tree(self, root: Path) -> None:
+        if not root.is_dir():
+            return
+        for d in [root, *(p for p in root.rglob("*") if p.is_dir())]:
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(d), self.MASK)
+            if wd >= 0:
+                self._dirs[wd] = d
+
+    def wait(self, timeout: float | None) -> set[Path]:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed: set[Path] = set()
+        while True:
+            try:
+                buf = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(buf):
+                wd, mask, _cookie, length = self._EVENT.unpack_from(buf, offset)
+                offset += self._EVENT.size
+                name = buf[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if mask & self.IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                parent = self._dirs.get(wd)
+                if parent is None or not name:
+                    continue
+                path = parent / os.fsdecode(name)
+                if mask & self.IN_ISDIR:
+                    if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                        self._add_tree(path)
+                    continue
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class _PollWatcher:
+    """Fallback for platforms without inotify: stat the tracked files every `interval` seconds."""
+
+    def __init__(self, paths: list[Path], interval: float):
+        self._paths = paths
+        self._interval = interval
+        self._seen = {p: self._stat(p) for p in paths}
+
+    @staticmethod
+    def _stat(path: Path) -> tuple[int, int] | None:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def wait(self, timeout: float | None) -> set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for p in self._paths:
+                current = self._stat(p)
+                if current != self._seen[p]:
+                    self._seen[p] = current
+                    changed.add(p)
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            pause = self._interval if deadline is None else min(self._interval, max(0.0, deadline - time.monotonic()))
+            time.sleep(pause)
+
+    def close(self) -> None:
+        pass
+
+
+def _make_watcher(sources: list[Path], force_poll: bool, interval: float):
+    tracked = [*sources, DEPS_PATH]
+    if not force_poll and sys.platform.startswith("linux"):
+        try:
+            roots = {DATA_DIR, *(p.parent for p in tracked)}
+            return _InotifyWatcher(sorted(roots)), "inotify"
+        except (OSError, AttributeError):
+            pass
+    return _PollWatcher(tracked, interval), "polling"
+
+
+def _regenerate(scenarios: set[str], artifacts: set[str], layers: list[str] | None) -> None:
+    """Re-run the generators for just the stale scenarios / artifact layers."""
+    commands = []
+    for sid in sorted(scenarios):
+        if (SCENARIOS_DIR / f"{sid}.py").exists():
+            commands.append([sys.executable, "generators/ui_trainer.py", f"scenarios.{sid}"])
+        else:
+            print(f"     (no scenario module for `{sid}` — skipping)")
+    if artifacts:
+        cmd = [sys.executable, "run.py"]
+        for layer in layers or []:
+            cmd += ["--layer", layer]
+        commands.append(cmd)
+    for cmd in commands:
+        print(f"     ↻ {' '.join(cmd[1:])}")
+        proc = subprocess.run(cmd, cwd=SCRIPT_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        if proc.returncode != 0:
+            tail = proc.stderr.strip().splitlines()[-1:] or ["(no output)"]
+            print(f"     ✗ exit {proc.returncode}: {tail[0]}")
+
+
+def cmd_watch(args) -> int:
+    config = load_config()
+    sources = collect_sources(config)
+    by_path = {src: str(src.relative_to(SCRIPT_DIR)) for src in sources}
+    deps_index = DependencyIndex(load_deps())
+
+    try:
+        baseline, snapshots = _load_baseline_snapshots(args.against)
+    except FileNotFoundError:
+        return _no_store()
+    if baseline is None:
+        print("No baseline to watch against. Run `python detect_changes.py snapshot` first.")
+        return 2
+    baseline_name = baseline["name"]
+
+    # One result per tracked source — the only state that lives for the
+    # daemon's lifetime besides the watcher, so memory is bounded by the
+    # number of sources, not by uptime or event count.
+    results = {rel: check_source(src, snapshots.get(rel)) for src, rel in by_path.items()}
+    report = build_report(results, deps_index, baseline_name)
+    write_report(report)
+
+    watcher, mode = _make_watcher(sources, args.poll, args.interval)
+    print(f"Watching {len(sources)} source(s) against baseline `{baseline_name}` ({mode}, "
+          f"debounce {args.debounce:g}s). Ctrl-C to stop.")
+    _print_drift_summary(report)
+
+    pending: set[Path] = set()
+    last_event = 0.0
+    try:
+        while True:
+            changed = watcher.wait(args.debounce if pending else None)
+            relevant = {p for p in changed if p in by_path or p == DEPS_PATH}
+            if relevant:
+                pending |= relevant
+                last_event = time.monotonic()
+                continue
+            if not pending or time.monotonic() - last_event < args.debounce:
+                continue
+
+            batch, pending = pending, set()
+            if DEPS_PATH in batch:
+                deps_index = DependencyIndex(load_deps())
+            touched = sorted(by_path[p] for p in batch if p in by_path)
+            for rel in touched:
+                results[rel] = check_source(SCRIPT_DIR / rel, snapshots.get(rel))
+
+            report = build_report(results, deps_index, baseline_name)
+            write_report(report)
+            stamp = datetime.now().strftime("%H:%M:%S")
+            print(f"\n[{stamp}] {len(touched)} source(s) changed: {', '.join(touched) or '(dependency map only)'}")
+            _print_drift_summary(report)
+
+            if args.regenerate:
+                new_scenarios = set(report["stale_scenarios"])
+                new_artifacts = set(report["stale_artifacts"])
+                if DEPS_PATH not in batch:
+                    # Only rebuild what this batch touched; anything already
+                    # stale before it was handled (or reported) last time.
+                    hit = [deps_index.lookup(rel) for rel in touched if results[rel]["diff"]]
+                    new_scenarios &= {s for h in hit for s in h["scenarios"]}
+                    new_artifacts &= {a for h in hit for a in h["artifacts"]}
+                if new_scenarios or new_artifacts:
+                    _regenerate(new_scenarios, new_artifacts, args.layer)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    finally:
+        watcher.close()
     return 0
 
 
@@ -498,6 +1279,8 @@ def _render_markdown(report: dict) -> str:
     lines.append("# Training Drift Report")
     lines.append("")
     lines.append(f"**Generated:** {_format_timestamp(report['generated_at'])}")
+    if report.get("baseline"):
+        lines.append(f"**Baseline:** `{report['baseline']}`")
     lines.append(f"**Sources checked:** {report['sources_checked']}")
     lines.append(f"**Sources with changes:** {report['sources_with_changes']}")
     lines.append("")
@@ -610,9 +1393,28 @@ def main() -> int:
     )
     sub = parser.add_subparsers(dest="command", required=True)
 
-    sub.add_parser("snapshot", help="Capture current source state as baseline.")
-    sub.add_parser("check", help="Diff current sources against baseline; emit drift report. Exit 1 on drift.")
-    sub.add_parser("status", help="Show current baseline status per source.")
+    p_snap = sub.add_parser("snapshot", help="Capture current source state as a new baseline.")
+    p_snap.add_argument("--name", help="Baseline name (default: UTC timestamp).")
+    p_check = sub.add_parser("check", help="Diff current sources against baseline; emit drift report. Exit 1 on drift.")
+    p_check.add_argument("--against", metavar="BASELINE", help="Baseline to diff against (default: most recent).")
+    p_check.add_argument("--from", dest="rev_from", metavar="REV",
+                         help="Diff two git revisions instead of working tree vs baseline (reads git objects only).")
+    p_check.add_argument("--to", dest="rev_to", metavar="REV", help="Target revision for --from (default: HEAD).")
+    p_check.add_argument("--workers", type=int, help="Parallel fingerprint workers for --from/--to (default: CPU count).")
+    p_status = sub.add_parser("status", help="List baselines and show per-source status.")
+    p_status.add_argument("--against", metavar="BASELINE", help="Baseline to show (default: most recent).")
+    p_watch = sub.add_parser("watch", help="Re-check sources continuously as files under data/ change.")
+    p_watch.add_argument("--against", metavar="BASELINE", help="Baseline to diff against (default: most recent).")
+    p_watch.add_argument("--debounce", type=float, default=0.5, help="Seconds of quiet before a batch is processed (default: 0.5).")
+    p_watch.add_argument("--poll", action="store_true", help="Force stat polling instead of inotify.")
+    p_watch.add_argument("--interval", type=float, default=1.0, help="Polling interval in seconds (default: 1.0).")
+    p_watch.add_argument("--regenerate", action="store_true",
+                         help="Rebuild newly stale ui_trainer scenarios and run.py layers after each batch.")
+    p_watch.add_argument("--layer", action="append", choices=["walkthrough", "video_script", "job_aid", "walkme"],
+                         help="With --regenerate, limit run.py to these layer(s). Can be repeated.")
+    p_hist = sub.add_parser("history", help="Show how a source's fingerprint moved across baselines.")
+    p_hist.add_argument("source", nargs="?", help="Source path relative to poc/, e.g. data/tosca/goods_receipt.xml")
+    p_hist.add_argument("--step", metavar="HASH", help="Instead, list every baseline containing this step hash.")
 
     args = parser.parse_args()
     if args.command == "snapshot":
@@ -621,6 +1423,12 @@ def main() -> int:
         return cmd_check(args)
     if args.command == "status":
         return cmd_status(args)
+    if args.command == "watch":
+        return cmd_watch(args)
+    if args.command == "history":
+        if not args.source and not args.step:
+            parser.error("history needs a source path or --step HASH")
+        return cmd_history(args)
     return 2
 
 
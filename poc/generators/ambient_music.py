@@ -0,0 +1,136 @@
+"""
+ambient_music.py — Streaming, cached background music for the slide renderers.
+
+video_render_v2 and video_render_bigfoot each synthesized their chord loop
+by building a float64 time axis and audio buffer for the whole video,
+tens of MB for a few-minute render, and redid it on every run. Here:
+
+  • each chord is synthesized once, as one exact period of its waveform
+    (float32); the period is the smallest sample count after which every
+    partial lines up again, so tiling it is sample-for-sample the same
+    signal as evaluating sin() on the global time axis
+  • the WAV is written in fixed-size blocks gathered from those tables,
+    with the fades applied per block, so memory stays flat
+  • the finished file is cached under output/.cache/music/ by
+    (duration, chords, partial gains, peak), so repeat renders of
+    the same length just copy it
+
+Usage:
+    from ambient_music import AMBIENT_CHORDS, render_ambient
+    render_ambient(95.0, "music.wav", chords=AMBIENT_CHORDS, gains=(0.06, 0.02), peak=0.18)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import shutil
+import tempfile
+import wave
+from fractions import Fraction
+from pathlib import Path
+
+import numpy as np
+
+MUSIC_CACHE = Path(__file__).parent.parent / "output" / ".cache" / "music"
+SAMPLE_RATE = 44100
+BLOCK       = 1 << 16        # samples per write
+MAX_PERIOD  = 30 * SAMPLE_RATE
+
+# Am  F  C  G chord loop
+AMBIENT_CHORDS = (
+    (110.0, 130.8, 164.8),   # Am (lower octave — warmer)
+    (87.3,  110.0, 130.8),   # F
+    (130.8, 164.8, 196.0),   # C
+    (98.0,  123.5, 146.8),   # G
+)
+
+
+def _period(freqs, sr):
+    """Smallest n such that f * n / sr is an integer for every partial."""
+    n = 1
+    for f in freqs:
+        for mult in (1, 2):
+            step = (Fraction(str(f)) * mult / sr).denominator
+            n = n * step // math.gcd(n, step)
+    return n
+
+
+def _chord_table(freqs, gains, sr, length):
+    """`length` samples of the chord (fundamental + octave) from t=0, float32."""
+    t = np.arange(length, dtype=np.float64) / sr
+    out = np.zeros(length, dtype=np.float64)
+    for f in freqs:
+        out += np.sin(2 * math.pi * f * t) * gains[0]
+        out += np.sin(2 * math.pi * f * 2 * t) * gains[1]
+    return out.astype(np.float32)
+
+
+def _synthesize(duration_s, chords, gains, peak, sr, fade_s, out_wav):
+    n = int(sr * duration_s)
+    cd = duration_s / len(chords)
+    bounds = [int(i * cd * sr) for i in range(len(chords))] + [n]
+    tables = []
+    for i, freqs in enumerate(chords):
+        period = _period(freqs, sr)
+        if period > MAX_PERIOD:
+            # Incommensurate partials: no short exact period, so tabulate
+            # from t=0 up to the end of this chord's segment instead.
+            period = bounds[i + 1]
+        tables.append(_chord_table(freqs, gains, sr, period))
+
+    # Fades only scale toward zero, so the loudest sample sits in a chord body.
+    top = 1e-9
+    for i, table in enumerate(tables):
+        a, b = bounds[i], bounds[i + 1]
+        if b - a >= len(table):
+            top = max(top, float(np.abs(table).max()))
+        elif a < b:
+            top = max(top, float(np.abs(np.take(table, np.arange(a, b), mode="wrap")).max()))
+    scale = np.float32(peak / top * 32767)
+
+    fade = int(fade_s * sr)
+    with wave.open(out_wav, "w") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sr)
+        wf.setnframes(n)
+        for start in range(0, n, BLOCK):
+            stop = min(start + BLOCK, n)
+            block = np.empty(stop - start, dtype=np.float32)
+            for i, table in enumerate(tables):
+                a, b = max(start, bounds[i]), min(stop, bounds[i + 1])
+                if a < b:
+                    block[a - start:b - start] = np.take(table, np.arange(a, b), mode="wrap")
+            idx = np.arange(start, stop)
+            if fade > 1:
+                if start < fade:
+                    m = idx < fade
+                    block[m] *= idx[m] / np.float32(fade - 1)
+                if stop > n - fade:
+                    m = idx >= n - fade
+                    block[m] *= 1 - (idx[m] - (n - fade)) / np.float32(fade - 1)
+            wf.writeframes((block * scale).astype(np.int16).tobytes())
+
+
+def render_ambient(duration_s, out_wav, *, chords=AMBIENT_CHORDS, gains=(0.06, 0.02),
+                   peak=0.18, sr=SAMPLE_RATE, fade_s=3.0, cache_dir=MUSIC_CACHE):
+    """
+    Write a mono 16-bit chord loop of `duration_s` to out_wav: chords share
+    the duration equally, with fade_s attack/release, normalized to `peak`.
+    """
+    key = hashlib.sha256(repr((float(duration_s), sr, fade_s, tuple(map(tuple, chords)),
+                               tuple(gains), peak)).encode()).hexdigest()[:32]
+    cached = Path(cache_dir) / f"{key}.wav"
+    if not cached.exists():
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=cached.parent, suffix=".wav")
+        os.close(fd)
+        try:
+            _synthesize(duration_s, chords, gains, peak, sr, fade_s, tmp)
+            os.replace(tmp, cached)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+    shutil.copyfile(cached, out_wav)
@@ -0,0 +1,79 @@
+"""
+bench_screens.py — Time scenario screen generation with and without the
+font registry / text-layout caches (text_layout.py) and the widget sprite
+cache (scenarios/base.py).
+
+Renders every SCREEN_GENERATORS entry of each scenario pack, highlighted
+and neutral, in memory (nothing is saved), first with caching disabled
+(every fnt() call loads the font from disk and every widget is drawn from
+scratch, as before) and then with caching enabled.
+
+Usage:
+    python3 poc/generators/bench_screens.py                      # all scenario packs
+    python3 poc/generators/bench_screens.py scenarios.hazmat -n 5
+"""
+
+import argparse
+import importlib
+import pkgutil
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import text_layout
+
+
+def scenario_modules():
+    import scenarios
+    names = []
+    for info in pkgutil.iter_modules(scenarios.__path__):
+        mod = importlib.import_module(f"scenarios.{info.name}")
+        if hasattr(mod, "SCREEN_GENERATORS"):
+            names.append(mod.__name__)
+    return names
+
+
+def render_all(modules):
+    n = 0
+    for mod in modules:
+        for fn in mod.SCREEN_GENERATORS.values():
+            fn(hl=True)
+            fn(hl=False)
+            n += 2
+    return n
+
+
+def bench(modules, rounds):
+    """Best-of-`rounds` wall time in seconds, plus screens per round."""
+    best, n = float("inf"), 0
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        n = render_all(modules)
+        best = min(best, time.perf_counter() - t0)
+    return best, n
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark scenario screen generation.")
+    ap.add_argument("modules", nargs="*", help="scenario modules (default: all packs)")
+    ap.add_argument("-n", "--rounds", type=int, default=3, help="rounds per mode, best kept")
+    args = ap.parse_args()
+
+    modules = [importlib.import_module(m) for m in (args.modules or scenario_modules())]
+    print(f"Scenario packs: {', '.join(m.__name__.split('.')[-1] for m in modules)}")
+
+    with text_layout.caching(False):
+        cold, n = bench(modules, args.rounds)
+    text_layout.clear()
+    render_all(modules)                      # warm the registry once
+    warm, _ = bench(modules, args.rounds)
+
+    print(f"  Screens per round : {n}")
+    print(f"  Uncached          : {cold:.3f}s  ({cold / n * 1000:.1f} ms/screen)")
+    print(f"  Cached            : {warm:.3f}s  ({warm / n * 1000:.1f} ms/screen)")
+    print(f"  Speedup           : {cold / warm:.2f}×")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+check_screens.py — Sanity checks for incremental screen builds (trainer_screens.py).
+
+Builds the drone_anatomy pack into a scratch directory from a scratch copy
+of its source photos, then checks that:
+
+  • a second build with nothing changed redraws no screens
+  • rotating one source photo redraws exactly the screens drawn from it
+
+The real docs/ photos and output/ui_trainer are never touched.
+
+Usage:
+    python3 poc/generators/check_screens.py
+"""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from PIL import Image
+
+import trainer_screens
+from ui_trainer import load_scenario
+
+MODULE = "scenarios.drone_anatomy"
+
+
+def stale(mod, base_out):
+    trainer_screens.clear_digests()
+    _, todo, _ = trainer_screens.plan_screens(mod, base_out)
+    return sorted(fname for fname, _ in todo)
+
+
+def main():
+    mod = load_scenario(MODULE)
+    failures = 0
+    with tempfile.TemporaryDirectory(prefix="ztt_check_screens_") as tmp:
+        photos = Path(tmp) / "photos"
+        shutil.copytree(mod._PHOTO_DIR, photos)
+        mod._PHOTO_DIR = photos
+        base_out = Path(tmp) / "out"
+
+        trainer_screens.build_screens(mod, base_out, log=lambda msg: None)
+        manifest = trainer_screens.load_manifest(base_out)["screens"]
+
+        def check(label, ok, detail=""):
+            nonlocal failures
+            print(f"  {'✓' if ok else '✗'} {label}{detail}")
+            failures += not ok
+
+        check("unchanged rebuild redraws nothing", stale(mod, base_out) == [])
+
+        used = {fname: entry.get("inputs", {}) for fname, entry in manifest.items()}
+        photo = next(iter(next(inputs for inputs in used.values() if inputs)))
+        photo_path = trainer_screens.GENERATORS_DIR / photo
+        with Image.open(photo_path) as img:
+            img.transpose(Image.Transpose.ROTATE_180).save(photo_path)
+        expected = sorted(fname for fname, inputs in used.items() if photo in inputs)
+        got = stale(mod, base_out)
+        check(f"rotating {photo_path.name} redraws {len(expected)} screen(s)",
+              got == expected, "" if got == expected else f" — got {got}")
+
+    print("All checks passed." if not failures else f"{failures} check(s) failed.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
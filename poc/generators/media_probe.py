@@ -0,0 +1,232 @@
+"""
+media_probe.py — In-process media duration probing.
+
+Replaces the copies of probe_duration() in video_render_v2,
+video_render_bigfoot and video_render_veo3. Each of those spawned one
+ffprobe per file. Durations are now read straight from the container:
+
+  WAV   fmt/data chunk sizes (wave module)
+  MP3   MPEG audio frame headers, summed (exact for CBR and VBR)
+  MP4   moov/mvhd timescale + duration
+
+Only files none of the readers understand fall back to ffprobe. Such files
+are probed concurrently when several are passed to durations() at once.
+Results are cached in-process by file content hash. A file that is
+re-probed after a copy or a re-download costs one sha256 and nothing else.
+
+Usage:
+    from media_probe import duration, durations
+    d = duration("narr_00.mp3", default=4.0)
+    total = sum(durations(scene_mp4s, default=8.0))
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import struct
+import subprocess
+import threading
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+_lock = threading.Lock()
+_by_hash = {}    # sha256 -> seconds
+_by_stat = {}    # (path, size, mtime_ns) -> sha256
+
+
+# ── Hashing ──────────────────────────────────────────────────────────────────
+def _digest(path):
+    st = os.stat(path)
+    stat_key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    with _lock:
+        digest = _by_stat.get(stat_key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        with _lock:
+            _by_stat[stat_key] = digest
+    return digest
+
+
+# ── Container readers ────────────────────────────────────────────────────────
+def _wav_duration(path):
+    with wave.open(path, "rb") as w:
+        return w.getnframes() / w.getframerate()
+
+
+# bitrate (kbps) by [version is MPEG-1][layer index], MPEG-2/2.5 share a row
+_MP3_BITRATES = {
+    (True, 1):  (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2):  (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3):  (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+def _mp3_duration(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    pos = 0
+    if data[:3] == b"ID3" and len(data) >= 10:
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        pos = 10 + size + (10 if data[5] & 0x10 else 0)
+
+    seconds, frames = 0.0, 0
+    end = len(data) - 4
+    while pos <= end:
+        b1, b2 = data[pos + 1], data[pos + 2]
+        if data[pos] != 0xFF or (b1 & 0xE0) != 0xE0:
+            if frames:
+                break            # trailing tag (ID3v1 / APE) after the last frame
+            pos += 1             # resync before the first frame
+            continue
+        version = (b1 >> 3) & 3  # 3 = MPEG-1, 2 = MPEG-2, 0 = MPEG-2.5
+        layer = 4 - ((b1 >> 1) & 3)
+        br_idx, sr_idx = b2 >> 4, (b2 >> 2) & 3
+        if version == 1 or layer == 4 or br_idx in (0, 15) or sr_idx == 3:
+            if frames:
+                break
+            pos += 1
+            continue
+        mpeg1 = version == 3
+        bitrate = _MP3_BITRATES[(mpeg1, layer)][br_idx] * 1000
+        rate = _MP3_RATES[version][sr_idx]
+        padding = (b2 >> 1) & 1
+        if layer == 1:
+            samples, size = 384, (12 * bitrate // rate + padding) * 4
+        else:
+            samples = 1152 if (layer == 2 or mpeg1) else 576
+            size = samples // 8 * bitrate // rate + padding
+        frame = data[pos:pos + size]
+        if frames or not any(tag in frame for tag in (b"Xing", b"Info", b"VBRI")):
+            seconds += samples / rate   # the leading Xing/Info frame carries no audio
+        frames += 1
+        pos += size
+    if not frames:
+        raise ValueError("no MPEG audio frames")
+    return seconds
+
+
+def _mp4_boxes(f, start, end):
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        size, kind = struct.unpack(">I4s", f.read(8))
+        header = 8
+        if size == 1:
+            size = struct.unpack(">Q", f.read(8))[0]
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header:
+            raise ValueError("corrupt MP4 box")
+        yield kind, pos + header, pos + size
+        pos += size
+
+
+def _mp4_duration(path):
+    with open(path, "rb") as f:
+        end = os.fstat(f.fileno()).st_size
+        for kind, body, box_end in _mp4_boxes(f, 0, end):
+            if kind != b"moov":
+                continue
+            for sub, sbody, _ in _mp4_boxes(f, body, box_end):
+                if sub != b"mvhd":
+                    continue
+                f.seek(sbody)
+                version = f.read(4)[0]
+                if version == 1:
+                    _, _, timescale, dur = struct.unpack(">QQIQ", f.read(28))
+                else:
+                    _, _, timescale, dur = struct.unpack(">IIII", f.read(16))
+                return dur / timescale
+    raise ValueError("no moov/mvhd box")
+
+
+_READERS = {
+    ".wav": _wav_duration,
+    ".mp3": _mp3_duration,
+    ".mp4": _mp4_duration, ".m4a": _mp4_duration, ".mov": _mp4_duration,
+}
+
+
+def _ffprobe(path):
+    try:
+        r = subprocess.run(
+            ["ffprobe", "-v", "quiet", "-show_entries", "format=duration", path],
+            capture_output=True, text=True,
+        )
+    except OSError:
+        return None
+    for line in r.stdout.splitlines():
+        if line.startswith("duration="):
+            try:
+                return float(line.split("=")[1])
+            except ValueError:
+                break
+    return None
+
+
+def _read_in_process(path):
+    reader = _READERS.get(os.path.splitext(path)[1].lower())
+    if reader is None:
+        return None
+    try:
+        return reader(path)
+    except (OSError, EOFError, ValueError, KeyError, IndexError, struct.error, wave.Error):
+        return None
+
+
+# ── Public API ───────────────────────────────────────────────────────────────
+def durations(paths, default=None):
+    """
+    Durations in seconds for `paths`, in order. Files that cannot be probed
+    get `default` (with a warning), or raise RuntimeError if default is None.
+    """
+    paths = [str(p) for p in paths]
+    result = [None] * len(paths)
+    pending = []   # (index, digest) for files needing ffprobe
+    for i, path in enumerate(paths):
+        try:
+            digest = _digest(path)
+        except OSError:
+            continue
+        with _lock:
+            cached = _by_hash.get(digest)
+        if cached is None:
+            cached = _read_in_process(path)
+            if cached is None:
+                pending.append((i, digest))
+                continue
+            with _lock:
+                _by_hash[digest] = cached
+        result[i] = cached
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=min(len(pending), os.cpu_count() or 4)) as pool:
+            probed = list(pool.map(lambda job: _ffprobe(paths[job[0]]), pending))
+        for (i, digest), secs in zip(pending, probed):
+            if secs is not None:
+                with _lock:
+                    _by_hash[digest] = secs
+                result[i] = secs
+
+    for i, secs in enumerate(result):
+        if secs is None:
+            if default is None:
+                raise RuntimeError(f"could not probe duration of {paths[i]}")
+            print(f"  ⚠  could not probe {os.path.basename(paths[i])} — assuming {default}s")
+            result[i] = float(default)
+    return result
+
+
+def duration(path, default=None):
+    """Duration of a single file in seconds (see durations())."""
+    return durations([path], default=default)[0]
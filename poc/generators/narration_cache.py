@@ -0,0 +1,141 @@
+"""
+narration_cache.py — Shared on-disk cache for synthesized narration.
+
+Every renderer re-synthesized every line on every run, including paid
+OpenAI TTS calls. Lines are now cached by
+
+    sha256(engine, voice, model, normalized text)
+
+so re-rendering after a copy tweak on one slide only synthesizes that one
+line. Each entry stores the audio file and its probed duration, so a hit
+costs neither a synth call nor a probe. A line whose duration could not be
+probed is returned with the caller's default but never cached, so the
+fallback is not replayed on later hits.
+
+Entries live in output/.cache/narration/ with an index.json alongside.
+When the cache grows past max_bytes, the least recently used entries are
+evicted first.
+
+Usage:
+    from narration_cache import NARRATION_CACHE
+    dur = NARRATION_CACHE.fetch("openai", "nova", "tts-1-hd", text, out_mp3,
+                                synth=lambda p: call_api(text, p),
+                                probe=media_probe.duration, default=4.0)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+CACHE_DIR         = Path(__file__).parent.parent / "output" / ".cache" / "narration"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def normalize_text(text):
+    """Whitespace-insensitive form of a narration line (what the key hashes)."""
+    return " ".join(text.split())
+
+
+class NarrationCache:
+    def __init__(self, root=CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index = None   # loaded lazily: key -> {file, bytes, duration, last_used}
+
+    # ── Index ────────────────────────────────────────────────────────────────
+    def _load(self):
+        if self._index is None:
+            path = self.root / "index.json"
+            try:
+                self._index = json.loads(path.read_text())
+            except (FileNotFoundError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _save(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self._index, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.root / "index.json")
+
+    def _evict(self):
+        index = self._index
+        total = sum(e["bytes"] for e in index.values())
+        for key in sorted(index, key=lambda k: index[k]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            entry = index.pop(key)
+            total -= entry["bytes"]
+            try:
+                (self.root / entry["file"]).unlink()
+            except FileNotFoundError:
+                pass
+
+    # ── Public API ───────────────────────────────────────────────────────────
+    @staticmethod
+    def key(engine, voice, model, text):
+        raw = "\0".join([engine, voice, model, normalize_text(text)])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def fetch(self, engine, voice, model, text, out_path, synth, probe, default=None):
+        """
+        Write the narration for `text` to out_path and return its duration.
+
+        On a miss, synth(path) must write audio to `path` (same extension as
+        out_path) and probe(path) must return its duration in seconds, or
+        raise RuntimeError if it cannot. An unprobeable line is not cached;
+        its duration is `default`, or the RuntimeError propagates if that is
+        None.
+        """
+        key = self.key(engine, voice, model, text)
+        ext = Path(out_path).suffix
+        with self._lock:
+            entry = self._load().get(key)
+            if entry is not None and (self.root / entry["file"]).exists():
+                entry["last_used"] = time.time()
+                self._save()
+                shutil.copyfile(self.root / entry["file"], out_path)
+                return entry["duration"]
+
+        # Synthesize outside the lock so parallel misses don't serialize.
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=ext)
+        os.close(fd)
+        try:
+            synth(tmp)
+            try:
+                duration = probe(tmp)
+            except RuntimeError:
+                if default is None:
+                    raise
+                print(f"  ⚠  could not probe narration — assuming {default}s, not caching it")
+                shutil.copyfile(tmp, out_path)
+                return float(default)
+            fname = f"{key}{ext}"
+            with self._lock:
+                os.replace(tmp, self.root / fname)
+                shutil.copyfile(self.root / fname, out_path)
+                self._load()[key] = {
+                    "file": fname,
+                    "bytes": (self.root / fname).stat().st_size,
+                    "duration": duration,
+                    "last_used": time.time(),
+                }
+                self._evict()
+                self._save()
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        return duration
+
+
+NARRATION_CACHE = NarrationCache()
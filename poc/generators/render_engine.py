@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""
+render_engine.py — One render engine for every social-video style.
+
+The per-style scripts (video_render, video_render_v2, video_render_bigfoot,
+video_render_veo3, video_render_veo3_poc) keep their style-specific drawing,
+synthesis and ffmpeg helpers; their main() is a thin wrapper that runs the
+matching backend here, so orchestration lives in one place. A style is a
+backend that only *plans* its work as a DAG of stages; the engine runs every stage as soon as its inputs are
+ready, on a thread pool (I/O, subprocesses), a process pool (Pillow) or a
+bounded API pool (paid providers), and reports per-stage timings.
+
+The shared building blocks already live in their own modules, so any
+optimization there applies to every style:
+
+  narration_cache   TTS audio + duration, content-addressed
+  media_probe       in-process durations
+  ambient_music     streamed, cached music bed
+  video_segments    cached per-slide segments, stream-copied join
+  veo_jobs          concurrent, resumable Veo generations
+  AssetCache        (below) any other expensive file: slide PNGs, DALL-E stills
+
+Backends:
+  reel        Pillow slides, no narration          (video_render.py)
+  slides      Pillow slides + flite narration      (video_render_v2.py)
+  ai-stills   DALL-E stills + OpenAI TTS           (video_render_bigfoot.py)
+  ai-video    Veo 3 clips with native audio        (video_render_veo3[_poc].py)
+
+Usage:
+  python3 generators/render_engine.py --style slides
+  python3 generators/render_engine.py --style ai-stills --api-workers 3
+  python3 generators/render_engine.py --style ai-video --cast human --concurrency 3
+  python3 generators/render_engine.py --style ai-video --poc --workdir /tmp/ztt_poc
+  python3 generators/render_engine.py --style reel --pipe
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+OUTPUT_DIR  = Path(__file__).parent.parent / "output"
+ASSET_CACHE = OUTPUT_DIR / ".cache" / "assets"
+
+
+# ── Shared asset cache ───────────────────────────────────────────────────────
+class AssetCache:
+    """
+    Content-addressed file cache for stage outputs that have no dedicated
+    cache of their own. Entries live at <root>/<kind>/<sha256(parts)><ext>
+    and are published atomically, so parallel stages can share it.
+    """
+
+    def __init__(self, root=ASSET_CACHE, enabled=True):
+        self.root = Path(root)
+        self.enabled = enabled
+
+    @staticmethod
+    def key(*parts):
+        raw = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+    def file(self, kind, parts, out_path, build):
+        """
+        Materialize out_path from the cache, or run build(tmp_path) and cache
+        the result. Returns True on a hit.
+        """
+        ext = Path(out_path).suffix
+        path = self.root / kind / f"{self.key(*parts)}{ext}"
+        if self.enabled and path.exists():
+            shutil.copyfile(path, out_path)
+            return True
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=ext)
+        os.close(fd)
+        try:
+            build(tmp)
+            shutil.copyfile(tmp, out_path)
+            if self.enabled:
+                os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        return False
+
+
+def source_digest(module):
+    """Hash of a renderer's source, so style edits invalidate its cached assets."""
+    return hashlib.sha256(Path(module.__file__).read_bytes()).hexdigest()[:16]
+
+
+# ── Stage DAG ────────────────────────────────────────────────────────────────
+@dataclass
+class Stage:
+    """
+    One unit of work. fn is called with the results of `deps`, in order.
+    pool: "thread" (I/O, subprocess waits), "process" (CPU-bound Python —
+    fn and its arguments must pickle) or "api" (paid/rate-limited calls).
+    """
+    name: str
+    fn: Callable[..., Any]
+    deps: tuple = ()
+    pool: str = "thread"
+
+
+@dataclass
+class RenderContext:
+    workdir: Path
+    workers: int
+    api_workers: int
+    cache: AssetCache
+    timings: dict = field(default_factory=dict)   # stage -> (start, end), perf_counter
+
+    def path(self, name):
+        return str(self.workdir / name)
+
+
+def run_stages(stages, ctx):
+    """Run a stage DAG to completion; returns {stage name: result}."""
+    by_name = {s.name: s for s in stages}
+    if len(by_name) != len(stages):
+        raise ValueError("duplicate stage names")
+    for s in stages:
+        missing = [d for d in s.deps if d not in by_name]
+        if missing:
+            raise ValueError(f"stage {s.name} depends on unknown {missing}")
+
+    results, started, running = {}, set(), {}
+    pools = {"thread": ThreadPoolExecutor(max_workers=ctx.workers),
+             "api": ThreadPoolExecutor(max_workers=ctx.api_workers)}
+    if any(s.pool == "process" for s in stages):
+        pools["process"] = ProcessPoolExecutor(max_workers=ctx.workers)
+    try:
+        while len(results) < len(stages):
+            for s in stages:
+                if s.name in started or any(d not in results for d in s.deps):
+                    continue
+                started.add(s.name)
+                fut = pools[s.pool].submit(s.fn, *[results[d] for d in s.deps])
+                running[fut] = (s, time.perf_counter())
+            if not running:
+                raise ValueError("stage graph has a cycle: "
+                                 + ", ".join(s.name for s in stages if s.name not in started))
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                s, t0 = running.pop(fut)
+                try:
+                    results[s.name] = fut.result()
+                except Exception as e:
+                    for other in running:
+                        other.cancel()
+                    raise RuntimeError(f"stage {s.name} failed: {e}") from e
+                ctx.timings[s.name] = (t0, time.perf_counter())
+    finally:
+        for pool in pools.values():
+            pool.shutdown(wait=True, cancel_futures=True)
+    return results
+
+
+def print_timings(timings):
+    """Wall-clock span per stage group (`slide:03` → `slide`)."""
+    groups = {}
+    for name, (t0, t1) in timings.items():
+        g = groups.setdefault(name.split(":")[0], [t0, t1, 0])
+        g[0], g[1], g[2] = min(g[0], t0), max(g[1], t1), g[2] + 1
+    print("   Stage timings (wall clock):")
+    for name, (t0, t1, n) in sorted(groups.items(), key=lambda kv: kv[1][0]):
+        count = f"×{n}" if n > 1 else ""
+        print(f"     {name:10s} {t1 - t0:7.2f}s  {count}")
+
+
+# ── Stage helpers (module level so process-pool stages pickle) ───────────────
+def _slide_png(cache, digest, slide, idx, total, png):
+    import video_render_v2 as v2
+    cache.file("slides-v2", (digest, slide, idx, total), png,
+               lambda tmp: v2.render_slide_png(slide, idx, total, tmp))
+    return png
+
+
+def _overlay_png(slide, idx, total, out_png, raw_png):
+    import video_render_bigfoot as bf
+    bf.render_overlay(slide, raw_png, out_png, idx, total)
+    return out_png
+
+
+# ── Backends ─────────────────────────────────────────────────────────────────
+class RenderBackend:
+    """A video style: declares its CLI options and plans its stage DAG."""
+
+    # Subclasses set these
+    NAME: str = ""
+    DESCRIPTION: str = ""
+
+    def __init__(self, args):
+        self.args = args
+
+    @classmethod
+    def add_arguments(cls, ap):
+        pass
+
+    def output_path(self) -> str:
+        raise NotImplementedError
+
+    def plan(self, ctx: RenderContext) -> list[Stage]:
+        """Return the stage DAG; the stage named "output" produces the final video."""
+        raise NotImplementedError
+
+
+class ReelBackend(RenderBackend):
+    NAME = "reel"
+    DESCRIPTION = "Pillow slides, no narration (video_render.py)"
+
+    @classmethod
+    def add_arguments(cls, ap):
+        ap.add_argument("--pipe", action="store_true",
+                        help="reel: stream raw frames to ffmpeg (animated progress bar)")
+        ap.add_argument("--fps", type=int, default=12, help="reel --pipe frame rate")
+
+    def output_path(self):
+        return str(OUTPUT_DIR / "training_video_se-dc_buyer.mp4")
+
+    def plan(self, ctx):
+        import video_render as vr
+        out = self.output_path()
+
+        def render():
+            slides = vr.build_slides()
+            if self.args.pipe:
+                return vr.render_piped(slides, out, fps=self.args.fps, workers=ctx.workers)
+            return vr.render(slides, out)
+        return [Stage("output", render)]
+
+
+class _StillsBackend(RenderBackend):
+    """Shared plan for slide-based styles: stills + narration → segments + music."""
+
+    MIN_SLIDE = 3.0
+    NARR_EXT = ".wav"
+
+    def slides(self):
+        raise NotImplementedError
+
+    def module(self):
+        raise NotImplementedError
+
+    def still_stages(self, ctx, i, slide, png) -> list[Stage]:
+        raise NotImplementedError
+
+    def narration_stage(self, ctx, i, slide, path) -> Stage:
+        raise NotImplementedError
+
+    def plan(self, ctx):
+        mod, slides = self.module(), self.slides()
+        n = len(slides)
+        pngs = [ctx.path(f"slide_{i:02d}.png") for i in range(n)]
+        narr = [ctx.path(f"narr_{i:02d}{self.NARR_EXT}") for i in range(n)]
+        stages = []
+        for i, slide in enumerate(slides):
+            stages += self.still_stages(ctx, i, slide, pngs[i])
+            stages.append(self.narration_stage(ctx, i, slide, narr[i]))
+
+        def timeline(*durs):
+            durations = [max(d + mod.PAD, self.MIN_SLIDE) for d in durs]
+            for i, d in enumerate(durations):
+                print(f"  [{i+1}/{n}] {slides[i]['type']:10s} {d:.1f}s")
+            total = sum(durations) - (n - 1) * mod.TRANS
+            print(f"  Total video duration: {total:.1f}s")
+            return durations, total
+
+        def music(tl):
+            path = ctx.path("music.wav")
+            mod.gen_music(tl[1] + 4, path)
+            return path
+
+        def assemble(tl, music_wav, *slide_pngs):
+            mod.build_video(list(slide_pngs), narr, tl[0], music_wav, self.output_path(),
+                            workers=ctx.workers)
+            return self.output_path()
+
+        stages.append(Stage("timeline", timeline, tuple(f"narr:{i:02d}" for i in range(n))))
+        stages.append(Stage("music", music, ("timeline",)))
+        stages.append(Stage("output", assemble,
+                            ("timeline", "music") + tuple(f"slide:{i:02d}" for i in range(n))))
+        return stages
+
+
+class SlidesBackend(_StillsBackend):
+    NAME = "slides"
+    DESCRIPTION = "Pillow slides + flite narration (video_render_v2.py)"
+
+    def module(self):
+        import video_render_v2
+        return video_render_v2
+
+    def slides(self):
+        return self.module().SLIDES
+
+    def output_path(self):
+        return str(OUTPUT_DIR / "training_video_v2_se-dc.mp4")
+
+    def still_stages(self, ctx, i, slide, png):
+        digest = source_digest(self.module())
+        return [Stage(f"slide:{i:02d}",
+                      partial(_slide_png, ctx.cache, digest, slide, i, len(self.slides()), png),
+                      pool="process")]
+
+    def narration_stage(self, ctx, i, slide, wav):
+        return Stage(f"narr:{i:02d}", partial(self.module().gen_narration, slide["narration"], wav))
+
+
+class AIStillsBackend(_StillsBackend):
+    NAME = "ai-stills"
+    DESCRIPTION = "DALL-E 3 stills + OpenAI TTS (video_render_bigfoot.py)"
+    NARR_EXT = ".mp3"
+    MIN_SLIDE = 3.5
+
+    def __init__(self, args):
+        super().__init__(args)
+        self.api_key = None
+
+    def module(self):
+        import video_render_bigfoot
+        return video_render_bigfoot
+
+    def slides(self):
+        return self.module().SLIDES
+
+    def output_path(self):
+        return str(OUTPUT_DIR / "bigfoot_goods_receipt_se-dc.mp4")
+
+    def plan(self, ctx):
+        self.api_key = self.module().load_api_key()
+        if not self.api_key:
+            print("ERROR: OPENAI_API_KEY not set. Add it to poc/.env as OPENAI_API_KEY=sk-...")
+            sys.exit(1)
+        return super().plan(ctx)
+
+    def still_stages(self, ctx, i, slide, png):
+        bf, key = self.module(), self.api_key
+        raw = ctx.path(f"raw_{i:02d}.png")
+
+        def image():
+            # DALL-E output is cached by prompt: re-renders reuse the paid-for still.
+            hit = ctx.cache.file("dalle", (bf.IMG_MODEL, bf.IMG_SIZE, slide["image_prompt"]), raw,
+                                 lambda tmp: bf.gen_dalle(slide["image_prompt"], tmp, key))
+            print(f"  [{i+1:02d}] DALL-E {'(cached)' if hit else '✓'}")
+            return raw
+
+        return [
+            Stage(f"image:{i:02d}", image, pool="api"),
+            Stage(f"slide:{i:02d}", partial(_overlay_png, slide, i, len(self.slides()), png),
+                  (f"image:{i:02d}",), pool="process"),
+        ]
+
+    def narration_stage(self, ctx, i, slide, mp3):
+        return Stage(f"narr:{i:02d}",
+                     partial(self.module().gen_tts, slide["narration"], mp3, self.api_key),
+                     pool="api")
+
+
+class AIVideoBackend(RenderBackend):
+    NAME = "ai-video"
+    DESCRIPTION = "Veo 3 clips with native audio (video_render_veo3.py / _poc)"
+
+    @classmethod
+    def add_arguments(cls, ap):
+        from video_casts import CASTS
+        ap.add_argument("--cast", default="bigfoot", choices=sorted(CASTS),
+                        help="ai-video: character cast (default: bigfoot)")
+        ap.add_argument("--poc", action="store_true",
+                        help="ai-video: 3-scene POC cut (intro + 101 lesson + outro)")
+        ap.add_argument("--concurrency", type=int, default=3,
+                        help="ai-video: Veo operations in flight (default: 3)")
+        ap.add_argument("--stub", action="store_true",
+                        help="ai-video: offline Veo stub (ffmpeg test clips, no cost)")
+
+    def output_path(self):
+        name = "goods_receipt_poc" if self.args.poc else "goods_receipt_veo3"
+        return str(OUTPUT_DIR / f"{name}_{self.args.cast}.mp4")
+
+    def plan(self, ctx):
+        import video_render_veo3 as veo3
+        from video_casts import get_cast, build_scenes, build_poc_scenes
+        from veo_jobs import GenaiVeo, StubVeo, run_veo_jobs
+
+        cast = get_cast(self.args.cast)
+        scenes = (build_poc_scenes if self.args.poc else build_scenes)(cast)
+        if self.args.stub:
+            backend = StubVeo(secs=veo3.VEO_SECS)
+        else:
+            key = veo3.load_keys()["GOOGLE_API_KEY"]
+            if not key:
+                print("ERROR: GOOGLE_API_KEY not set. Add it to poc/.env")
+                sys.exit(1)
+            backend = GenaiVeo(key, model=veo3.VEO_MODEL, aspect=veo3.ASPECT, secs=veo3.VEO_SECS)
+        scene_mp4s = [ctx.path(f"scene_{i:02d}.mp4") for i in range(len(scenes))]
+        cost = len(scenes) * veo3.VEO_SECS * (0.15 if "fast" in veo3.VEO_MODEL else 0.40)
+        print(f"  {cast.label}: {len(scenes)} scenes, {veo3.VEO_MODEL} "
+              f"({self.args.concurrency} concurrent), est. ~${cost:.2f}")
+        if not self.args.workdir:
+            print(f"  Resume a failed run with --workdir {ctx.workdir}")
+
+        def clips():
+            # Compose each clip as it lands, while the rest are still generating.
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                composing = []
+                run_veo_jobs(
+                    backend, [(s["id"], s["video_prompt"]) for s in scenes], ctx.workdir,
+                    max_concurrent=self.args.concurrency,
+                    poll_secs=1 if self.args.stub else veo3.POLL_SECS, max_polls=veo3.MAX_POLLS,
+                    on_clip=lambda i, veo_mp4: composing.append(
+                        pool.submit(veo3.compose_scene, veo_mp4, scene_mp4s[i])),
+                )
+                for fut in composing:
+                    fut.result()
+            return scene_mp4s
+
+        def assemble(mp4s):
+            veo3.concat_scenes(mp4s, self.output_path())
+            return self.output_path()
+
+        return [Stage("clips", clips, pool="api"), Stage("output", assemble, ("clips",))]
+
+
+BACKENDS = {b.NAME: b for b in (ReelBackend, SlidesBackend, AIStillsBackend, AIVideoBackend)}
+
+
+# ── CLI ──────────────────────────────────────────────────────────────────────
+def main(argv=None):
+    """CLI entry point; the per-style scripts call this with their --style."""
+    ap = argparse.ArgumentParser(
+        description="Render a social training video in any style.",
+        epilog="Styles: " + "; ".join(f"{n} — {b.DESCRIPTION}" for n, b in BACKENDS.items()),
+    )
+    ap.add_argument("--style", required=True, choices=sorted(BACKENDS))
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 4,
+                    help="thread/process pool size for local stages (default: CPU count)")
+    ap.add_argument("--api-workers", type=int, default=4,
+                    help="concurrent paid API stages (default: 4)")
+    ap.add_argument("--workdir", default=None,
+                    help="workspace to use and keep (needed to resume ai-video runs)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="bypass the shared asset cache (slide PNGs, DALL-E stills)")
+    for backend in BACKENDS.values():
+        backend.add_arguments(ap)
+    args = ap.parse_args(argv)
+
+    backend = BACKENDS[args.style](args)
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix=f"ztt_{backend.NAME}_"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    ctx = RenderContext(workdir=workdir, workers=max(1, args.workers),
+                        api_workers=max(1, args.api_workers),
+                        cache=AssetCache(enabled=not args.no_cache))
+
+    print(f"Style     : {backend.NAME} — {backend.DESCRIPTION}")
+    print(f"Workspace : {workdir}")
+    t0 = time.perf_counter()
+    stages = backend.plan(ctx)
+    print(f"Stages    : {len(stages)}  ({ctx.workers} workers, {ctx.api_workers} API)\n")
+    out = run_stages(stages, ctx)["output"]
+
+    if out and os.path.exists(out):
+        print(f"\n✅  Output: {out}")
+        print(f"   {os.path.getsize(out) / 1e6:.1f} MB  |  {time.perf_counter() - t0:.1f}s total")
+    print_timings(ctx.timings)
+
+    if not args.workdir:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
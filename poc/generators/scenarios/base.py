@@ -3,10 +3,18 @@ scenarios/base.py — Shared Pillow drawing helpers for UI trainer scenario pack
 
 All scenario packs import from here so the SAP Fiori chrome stays consistent
 while the content (fields, values, highlights) varies per scenario.
+
+Widgets (shell bar, fields, dropdowns, buttons, checkboxes, banners) are
+rasterized once per (arguments, background colour) into a sprite and pasted
+into every later screen that uses them, see _blit(). Pass the Image that
+`draw` draws on as img= to use the sprites; without it the widget is
+drawn in place.
 """
 
-import os
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
+
+import text_layout
+from text_layout import font, text_bbox
 
 # ── Canvas ────────────────────────────────────────────────────────────────────
 W, H = 1280, 720
@@ -42,46 +50,101 @@ SAP_BRANDING = {
 }
 
 
+FONT_BOLD = (
+    "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
+    "/Library/Fonts/Arial Bold.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+)
+FONT_REGULAR = (
+    "/System/Library/Fonts/Supplemental/Arial.ttf",
+    "/Library/Fonts/Arial.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+)
+
+
 def fnt(size=14, bold=False):
-    candidates = [
-        "/System/Library/Fonts/Supplemental/Arial Bold.ttf" if bold else
-        "/System/Library/Fonts/Supplemental/Arial.ttf",
-        "/Library/Fonts/Arial Bold.ttf" if bold else "/Library/Fonts/Arial.ttf",
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf" if bold else
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-    ]
-    for p in candidates:
-        if os.path.exists(p):
-            try:
-                return ImageFont.truetype(p, size)
-            except Exception:
-                pass
-    return ImageFont.load_default()
+    """Shared font instance from the process-wide registry (see text_layout.py)."""
+    return font(FONT_BOLD if bold else FONT_REGULAR, size)
 
 
 def new_screen(title="SAP Fiori Launchpad"):
     """Create a blank screen with shell bar. Returns (img, draw)."""
     img = Image.new("RGB", (W, H), SAP_GREY_BG)
     d = ImageDraw.Draw(img)
-    draw_shell_bar(d, title)
+    draw_shell_bar(d, title, img=img)
     return img, d
 
 
-def placeholder_note(draw):
-    draw.text((20, H - 28),
-              "[ PLACEHOLDER — replace with real screenshot ]",
-              font=fnt(11), fill=(160, 160, 160))
+# ── Component sprites ─────────────────────────────────────────────────────────
+# Text rasterization dominates screen generation, and the same widgets recur
+# across screens and scenarios. Each widget is painted once onto a sprite and
+# pasted afterwards. Sprites are only used where the widget's box is a single
+# flat colour, so a pasted widget is pixel-identical to one drawn in place.
+_sprites = text_layout.LRUCache(2048)   # (widget, args..., mode, background) -> Image
+
+
+def _text_box(x, y, text, f):
+    x0, y0, x1, y1 = text_bbox(text, f)
+    return (x + x0, y + y0, x + x1, y + y1)
+
+
+def _box(*rects):
+    """Union of inclusive (x0, y0, x1, y1) rects as a crop box, or None if unaligned."""
+    if not all(isinstance(v, int) for r in rects for v in r):
+        return None
+    return (min(r[0] for r in rects), min(r[1] for r in rects),
+            max(r[2] for r in rects) + 1, max(r[3] for r in rects) + 1)
+
 
+def _blit(img, draw, box, key, paint):
+    """
+    paint(draw, dx, dy) draws a widget shifted by (dx, dy). Paste it into
+    img (the Image draw draws on) from the sprite cache when `box` lies on
+    one flat colour; otherwise, or without img, draw it in place.
+    """
+    if img is None or box is None or not text_layout.enabled() \
+            or box[0] < 0 or box[1] < 0 or box[2] > img.width or box[3] > img.height:
+        paint(draw, 0, 0)
+        return
+    colors = img.crop(box).getcolors(1)
+    if colors is None:
+        paint(draw, 0, 0)
+        return
+    key = key + (img.mode, colors[0][1])
+    sprite = _sprites.get(key)
+    if sprite is None:
+        sprite = Image.new(img.mode, (box[2] - box[0], box[3] - box[1]), colors[0][1])
+        paint(ImageDraw.Draw(sprite), -box[0], -box[1])
+        sprite = _sprites.setdefault(key, sprite)
+    img.paste(sprite, box[:2])
 
-def draw_shell_bar(draw, title="SAP Fiori Launchpad", initials="USR"):
-    draw.rectangle([0, 0, W, 48], fill=SAP_SHELL)
-    draw.text((20, 14), "≡", font=fnt(20, bold=True), fill=SAP_WHITE)
-    draw.text((56, 14), title, font=fnt(16, bold=True), fill=SAP_WHITE)
-    draw.ellipse([W - 50, 10, W - 10, 38], fill=SAP_BLUE)
-    draw.text((W - 44, 16), initials[:3], font=fnt(11, bold=True), fill=SAP_WHITE)
 
+def clear_sprites():
+    _sprites.clear()
 
-def draw_field(draw, x, y, w, h, label, value="", highlight=False, decoy=False):
+
+# ── Widgets ───────────────────────────────────────────────────────────────────
+def placeholder_note(draw, *, img=None):
+    text, f = "[ PLACEHOLDER — replace with real screenshot ]", fnt(11)
+    _blit(img, draw, _box(_text_box(20, H - 28, text, f)), ("placeholder_note",),
+          lambda d, dx, dy: d.text((20 + dx, H - 28 + dy), text, font=f, fill=(160, 160, 160)))
+
+
+def _paint_shell_bar(draw, dx, dy, title, initials):
+    draw.rectangle([dx, dy, W + dx, 48 + dy], fill=SAP_SHELL)
+    draw.text((20 + dx, 14 + dy), "≡", font=fnt(20, bold=True), fill=SAP_WHITE)
+    draw.text((56 + dx, 14 + dy), title, font=fnt(16, bold=True), fill=SAP_WHITE)
+    draw.ellipse([W - 50 + dx, 10 + dy, W - 10 + dx, 38 + dy], fill=SAP_BLUE)
+    draw.text((W - 44 + dx, 16 + dy), initials[:3], font=fnt(11, bold=True), fill=SAP_WHITE)
+
+
+def draw_shell_bar(draw, title="SAP Fiori Launchpad", initials="USR", *, img=None):
+    box = _box((0, 0, W - 1, 48), _text_box(56, 14, title, fnt(16, bold=True)))
+    _blit(img, draw, box, ("shell_bar", title, initials),
+          lambda d, dx, dy: _paint_shell_bar(d, dx, dy, title, initials))
+
+
+def _paint_field(draw, x, y, w, h, label, value, highlight, decoy):
     draw.text((x, y - 18), label, font=fnt(11), fill=SAP_LABEL)
     if highlight:
         border_col, lw, bg = SAP_AMBER, 2, SAP_WHITE
@@ -99,15 +162,34 @@ def draw_field(draw, x, y, w, h, label, value="", highlight=False, decoy=False):
         draw.line([(x + 8, y + 6), (x + 8, y + h - 6)], fill=SAP_BLUE, width=1)
 
 
-def draw_dropdown(draw, x, y, w, h, label, value, highlight=False, decoy=False):
-    draw_field(draw, x, y, w, h, label, value, highlight, decoy=decoy)
+def _field_box(x, y, w, h, label, value):
+    rects = [(x, y, x + w, y + h), _text_box(x, y - 18, label, fnt(11))]
+    if value:
+        rects.append(_text_box(x + 8, y + 8, value, fnt(13)))
+    return _box(*rects)
+
+
+def draw_field(draw, x, y, w, h, label, value="", highlight=False, decoy=False, *, img=None):
+    _blit(img, draw, _field_box(x, y, w, h, label, value),
+          ("field", w, h, label, value, highlight, decoy),
+          lambda d, dx, dy: _paint_field(d, x + dx, y + dy, w, h, label, value, highlight, decoy))
+
+
+def _paint_dropdown(draw, x, y, w, h, label, value, highlight, decoy):
+    _paint_field(draw, x, y, w, h, label, value, highlight, decoy)
     arr_x = x + w - 24
     arrow_col = SAP_AMBER if highlight else SAP_BLUE
     draw.polygon([(arr_x, y + 12), (arr_x + 12, y + 12), (arr_x + 6, y + 22)],
                  fill=arrow_col)
 
 
-def draw_button(draw, x, y, w, h, label, primary=True, highlight=False, decoy=False):
+def draw_dropdown(draw, x, y, w, h, label, value, highlight=False, decoy=False, *, img=None):
+    _blit(img, draw, _field_box(x, y, w, h, label, value),
+          ("dropdown", w, h, label, value, highlight, decoy),
+          lambda d, dx, dy: _paint_dropdown(d, x + dx, y + dy, w, h, label, value, highlight, decoy))
+
+
+def _paint_button(draw, x, y, w, h, label, primary, highlight, decoy):
     if highlight:
         col, border = SAP_AMBER, SAP_AMBER
     elif decoy:
@@ -125,7 +207,14 @@ def draw_button(draw, x, y, w, h, label, primary=True, highlight=False, decoy=Fa
               font=fnt(13, bold=True), fill=txt_col)
 
 
-def draw_table_header(draw, x, y, columns):
+def draw_button(draw, x, y, w, h, label, primary=True, highlight=False, decoy=False, *, img=None):
+    box = _box((x, y, x + w, y + h),
+               _text_box(x + w // 2 - 20, y + h // 2 - 8, label, fnt(13, bold=True)))
+    _blit(img, draw, box, ("button", w, h, label, primary, highlight, decoy),
+          lambda d, dx, dy: _paint_button(d, x + dx, y + dy, w, h, label, primary, highlight, decoy))
+
+
+def _paint_table_header(draw, x, y, columns):
     draw.rectangle([x, y, W - 40, y + 32], fill=(230, 235, 240))
     cx = x
     for col_label, col_w in columns:
@@ -135,6 +224,17 @@ def draw_table_header(draw, x, y, columns):
     draw.line([(x, y + 32), (W - 40, y + 32)], fill=SAP_BORDER, width=1)
 
 
+def draw_table_header(draw, x, y, columns, *, img=None):
+    columns = tuple(tuple(c) for c in columns)
+    rects, cx = [(x, y, W - 40, y + 32)], x
+    for col_label, col_w in columns:
+        rects.append(_text_box(cx + 6, y + 8, col_label, fnt(11, bold=True)))
+        rects.append((cx + col_w, y, cx + col_w, y + 32))
+        cx += col_w
+    _blit(img, draw, _box(*rects), ("table_header", x, columns),
+          lambda d, dx, dy: _paint_table_header(d, x + dx, y + dy, columns))
+
+
 def draw_table_row(draw, x, y, columns, values, highlight_col=None, decoy_cols=None):
     cx = x
     decoy_cols = decoy_cols or []
@@ -155,7 +255,7 @@ def draw_table_row(draw, x, y, columns, values, highlight_col=None, decoy_cols=N
         cx += col_w
 
 
-def draw_checkbox(draw, x, y, label, checked=False, highlight=False, decoy=False):
+def _paint_checkbox(draw, x, y, label, checked, highlight, decoy):
     if highlight:
         border, lw = SAP_AMBER, 2
     elif decoy:
@@ -176,9 +276,21 @@ def draw_checkbox(draw, x, y, label, checked=False, highlight=False, decoy=False
                        outline=SAP_BLUE, width=1)
 
 
-def draw_subheader(draw, text):
-    draw.rectangle([0, 48, W, 80], fill=SAP_WHITE)
-    draw.text((20, 58), text, font=fnt(12), fill=SAP_LABEL)
+def draw_checkbox(draw, x, y, label, checked=False, highlight=False, decoy=False, *, img=None):
+    box = _box((x - 4, y - 4, x + 22, y + 22), _text_box(x + 26, y + 1, label, fnt(13)))
+    _blit(img, draw, box, ("checkbox", label, checked, highlight, decoy),
+          lambda d, dx, dy: _paint_checkbox(d, x + dx, y + dy, label, checked, highlight, decoy))
+
+
+def _paint_subheader(draw, dx, dy, text):
+    draw.rectangle([dx, 48 + dy, W + dx, 80 + dy], fill=SAP_WHITE)
+    draw.text((20 + dx, 58 + dy), text, font=fnt(12), fill=SAP_LABEL)
+
+
+def draw_subheader(draw, text, *, img=None):
+    box = _box((0, 48, W - 1, 80), _text_box(20, 58, text, fnt(12)))
+    _blit(img, draw, box, ("subheader", text),
+          lambda d, dx, dy: _paint_subheader(d, dx, dy, text))
 
 
 def draw_card(draw, x, y, x2, y2, title=None):
@@ -189,11 +301,19 @@ def draw_card(draw, x, y, x2, y2, title=None):
         draw.line([(x + 16, y + 30), (x2 - 16, y + 30)], fill=SAP_BORDER, width=1)
 
 
-def draw_status_banner(draw, text, ok=True):
+def _paint_status_banner(draw, dx, dy, text, ok):
     col = (235, 250, 240) if ok else (255, 240, 240)
     border = SAP_GREEN if ok else SAP_RED
     icon = "✓" if ok else "✗"
-    draw.rounded_rectangle([20, H - 100, W - 20, H - 50],
+    draw.rounded_rectangle([20 + dx, H - 100 + dy, W - 20 + dx, H - 50 + dy],
                             radius=4, fill=col, outline=border, width=1)
-    draw.text((44, H - 84), f"{icon}  {text}",
+    draw.text((44 + dx, H - 84 + dy), f"{icon}  {text}",
               font=fnt(13, bold=True), fill=border)
+
+
+def draw_status_banner(draw, text, ok=True, *, img=None):
+    icon = "✓" if ok else "✗"
+    box = _box((20, H - 100, W - 20, H - 50),
+               _text_box(44, H - 84, f"{icon}  {text}", fnt(13, bold=True)))
+    _blit(img, draw, box, ("status_banner", text, ok),
+          lambda d, dx, dy: _paint_status_banner(d, dx, dy, text, ok))
@@ -50,6 +50,29 @@ HARDWARE_BRANDING = {
 # IMAGE LOADING
 # ═════════════════════════════════════════════════════════════════════════════
 
+_image_inputs = set()   # source images read since the last take_image_inputs()
+
+
+def source_image(path):
+    """Record a photo/diagram a screen is drawn from and return it as a Path.
+
+    trainer_screens.py stores a content hash of every recorded file with the
+    rendered screen, so editing, adding or removing the photo redraws the
+    screens built from it. Scenario packs that open images themselves
+    should pass the path through here first.
+    """
+    path = Path(path)
+    _image_inputs.add(str(path.resolve()))
+    return path
+
+
+def take_image_inputs():
+    """Sorted paths recorded by source_image() since the last call; resets them."""
+    paths = sorted(_image_inputs)
+    _image_inputs.clear()
+    return paths
+
+
 def load_base_image(path=None):
     """Load a photograph/diagram and resize to canvas, or return a placeholder.
 
@@ -61,7 +84,7 @@ def load_base_image(path=None):
     Returns:
         PIL.Image.Image sized to (W, H) = (1280, 720).
     """
-    if path and Path(path).exists():
+    if path and source_image(path).exists():
         img = Image.open(path).convert("RGB")
         img = img.resize((W, H), Image.LANCZOS)
         return img
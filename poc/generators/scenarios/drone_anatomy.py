@@ -45,7 +45,7 @@ from scenarios.base_hardware import (
     HW_STEEL, HW_ORANGE, HW_GREEN, HW_BLUE, HW_RED,
     HW_WHITE, HW_BG, HW_LABEL, HW_BORDER,
     annotate_region, draw_callout,
-    hardware_status_banner,
+    hardware_status_banner, source_image,
 )
 
 
@@ -100,7 +100,7 @@ def _load_letterboxed(filename, title):
     rest is HW_BG padding). Useful for callers that want to verify hotspot
     placement, but most callers just use img+draw.
     """
-    src_path = _resolve_photo(filename)
+    src_path = source_image(_resolve_photo(filename))
     if src_path.exists():
         src = Image.open(src_path).convert("RGB")
         sw, sh = src.size
@@ -194,7 +194,7 @@ def _hw_step_gimbal(hl=True):
 def _sw_step_app_open(hl=True):
     """Step 2 — DJI Fly-style app home screen, connection status visible."""
     img, d = new_screen("Drone Control App")
-    draw_shell_bar(d, title="Drone Fly", initials="OP")
+    draw_shell_bar(d, title="Drone Fly", initials="OP", img=img)
 
     # Aircraft connection card
     draw_card(d, 60, 110, 1220, 240, title="Aircraft Connection")
@@ -204,7 +204,7 @@ def _sw_step_app_open(hl=True):
     d.text((90, 225), "✓ Compatible", fill=HW_GREEN, font=fnt(13))
 
     # The action button — the hotspot
-    draw_button(d, 880, 160, 300, 70, "OPEN FLIGHT", primary=True, highlight=hl)
+    draw_button(d, 880, 160, 300, 70, "OPEN FLIGHT", primary=True, highlight=hl, img=img)
 
     # Below: signal indicators
     draw_card(d, 60, 270, 1220, 480, title="Pre-Flight Status")
@@ -213,14 +213,14 @@ def _sw_step_app_open(hl=True):
     d.text((90, 370), "Storage:   23.4 GB free", fill=HW_LABEL, font=fnt(13))
     d.text((90, 400), "Battery:   ▓▓▓░ 75%   (~22 min flight time)", fill=HW_LABEL, font=fnt(13))
 
-    draw_status_banner(d, "Tap OPEN FLIGHT to enter pre-flight checklist", ok=True)
+    draw_status_banner(d, "Tap OPEN FLIGHT to enter pre-flight checklist", ok=True, img=img)
     return img
 
 
 def _sw_step_gps_lock(hl=True):
     """Step 4 — GPS satellite lock screen, count and accuracy."""
     img, d = new_screen("Drone Control App")
-    draw_shell_bar(d, title="Drone Fly · Pre-Flight", initials="OP")
+    draw_shell_bar(d, title="Drone Fly · Pre-Flight", initials="OP", img=img)
 
     draw_card(d, 60, 110, 1220, 380, title="Position Lock")
     d.text((90, 160), "GPS Satellites:", fill=HW_LABEL, font=fnt(14, bold=True))
@@ -246,7 +246,7 @@ def _sw_step_gps_lock(hl=True):
     d.text((90, 510), "Max altitude: 400 ft AGL (Part 107)", fill=HW_LABEL, font=fnt(13))
     d.text((90, 540), "TFR check:   No active TFRs", fill=HW_GREEN, font=fnt(13))
 
-    draw_status_banner(d, "Confirm satellite count is ≥ 12 before takeoff", ok=True)
+    draw_status_banner(d, "Confirm satellite count is ≥ 12 before takeoff", ok=True, img=img)
 
     if hl:
         _hotspot_overlay(d, {"x": 90, "y": 195, "w": 300, "h": 60})
@@ -256,13 +256,13 @@ def _sw_step_gps_lock(hl=True):
 def _sw_step_rth_altitude(hl=True):
     """Step 6 — Return-to-home altitude configuration before arming."""
     img, d = new_screen("Drone Control App")
-    draw_shell_bar(d, title="Drone Fly · Flight Settings", initials="OP")
+    draw_shell_bar(d, title="Drone Fly · Flight Settings", initials="OP", img=img)
 
     draw_card(d, 60, 110, 1220, 380, title="Return-to-Home (RTH) Configuration")
     d.text((90, 160), "RTH Altitude:", fill=HW_LABEL, font=fnt(14, bold=True))
 
     # The numeric input field — this is the hotspot
-    draw_field(d, 90, 195, 300, 50, "", "120 m", highlight=hl)
+    draw_field(d, 90, 195, 300, 50, "", "120 m", highlight=hl, img=img)
     d.text((420, 215), "Default: 30 m  ·  Recommended for this site: 120 m", fill=HW_LABEL, font=fnt(13))
 
     # Reasoning
@@ -277,9 +277,9 @@ def _sw_step_rth_altitude(hl=True):
     d.text((90, 480), "Normal: balanced response, full obstacle sensing active.", fill=HW_LABEL, font=fnt(13))
 
     # CTA at the bottom
-    draw_button(d, 880, 510, 300, 60, "READY TO ARM", primary=True)
+    draw_button(d, 880, 510, 300, 60, "READY TO ARM", primary=True, img=img)
 
-    draw_status_banner(d, "Set RTH altitude above local obstacles before arming", ok=True)
+    draw_status_banner(d, "Set RTH altitude above local obstacles before arming", ok=True, img=img)
     return img
 
 
@@ -29,7 +29,7 @@ from scenarios.base_hardware import (
     HW_WHITE, HW_BG, HW_LABEL, HW_BORDER,
     load_base_image, annotate_region, draw_callout,
     draw_component_label, new_hardware_screen,
-    hardware_status_banner, placeholder_note,
+    hardware_status_banner, placeholder_note, source_image,
 )
 
 # ── Source page images ───────────────────────────────────────────────────────
@@ -240,7 +240,7 @@ def _page_screen(page_num, title, crop_box=None):
     Returns:
         (img, draw)
     """
-    page_path = _PAGE_DIR / f"page_{page_num}.png"
+    page_path = source_image(_PAGE_DIR / f"page_{page_num}.png")
 
     if page_path.exists():
         img = Image.open(page_path).convert("RGB")
@@ -197,16 +197,17 @@ SCENARIO = {
 
 def _header_row(d, action="Goods Receipt", reference="Purchase Order",
                 po="", hl_action=False, hl_ref=False, hl_po=False,
-                decoy_action=False, decoy_ref=False, decoy_po=False, decoy_exec=False):
+                decoy_action=False, decoy_ref=False, decoy_po=False, decoy_exec=False,
+                img=None):
     """Reusable MIGO transaction header strip (y=90–200)."""
     draw_card(d, 20, 90, W - 20, 200, title="Transaction Header")
-    draw_dropdown(d, 36,  148, 220, 36, "Action",             action,    highlight=hl_action, decoy=decoy_action)
-    draw_dropdown(d, 280, 148, 220, 36, "Reference Document", reference, highlight=hl_ref,    decoy=decoy_ref)
-    draw_field(   d, 524, 148, 200, 36, "Purchase Order No.", po,        highlight=hl_po,     decoy=decoy_po)
-    draw_button(  d, 744, 148,  80, 36, "Execute",            decoy=decoy_exec)
+    draw_dropdown(d, 36,  148, 220, 36, "Action",             action,    highlight=hl_action, decoy=decoy_action, img=img)
+    draw_dropdown(d, 280, 148, 220, 36, "Reference Document", reference, highlight=hl_ref,    decoy=decoy_ref, img=img)
+    draw_field(   d, 524, 148, 200, 36, "Purchase Order No.", po,        highlight=hl_po,     decoy=decoy_po, img=img)
+    draw_button(  d, 744, 148,  80, 36, "Execute",            decoy=decoy_exec, img=img)
 
 
-def _items_table(d, highlight_col=None, blank_col=None, decoy_cols=None):
+def _items_table(d, highlight_col=None, blank_col=None, decoy_cols=None, img=None):
     """Reusable MIGO hazmat line items table (y=210+) with UN numbers.
     blank_col: if set, blanks the values in that column (for L2/L3 challenge).
     decoy_cols: list of column indices to style as decoys (subtle blue tint).
@@ -219,7 +220,7 @@ def _items_table(d, highlight_col=None, blank_col=None, decoy_cols=None):
     if blank_col is not None:
         row1[blank_col] = ""
         row2[blank_col] = ""
-    draw_table_header(d, 36, 240, cols)
+    draw_table_header(d, 36, 240, cols, img=img)
     draw_table_row(d, 36, 272, cols, row1, highlight_col=highlight_col, decoy_cols=decoy_cols)
     draw_table_row(d, 36, 306, cols, row2, highlight_col=None, decoy_cols=decoy_cols)
 
@@ -273,101 +274,101 @@ def screen_fiori_home(hl=True):
                    font=fnt(13, bold=highlight), fill=SAP_TEXT)
         if highlight:
             d.text((x + 6, y + 6), "★", font=fnt(12), fill=SAP_AMBER)
-    placeholder_note(d)
+    placeholder_note(d, img=img)
     return img
 
 
 def screen_migo_action(hl=True):
     img, d = new_screen("Goods Movement (MIGO)")
-    draw_subheader(d, "Goods Movement > MIGO")
+    draw_subheader(d, "Goods Movement > MIGO", img=img)
     # Neutral: blank target + decoy the Reference Doc dropdown and Execute button
     action_val = "Goods Receipt" if hl else ""
     _header_row(d, action=action_val, hl_action=hl,
-                decoy_ref=not hl, decoy_exec=not hl)
-    placeholder_note(d)
+                decoy_ref=not hl, decoy_exec=not hl, img=img)
+    placeholder_note(d, img=img)
     return img
 
 
 def screen_migo_reference(hl=True):
     img, d = new_screen("Goods Movement (MIGO)")
-    draw_subheader(d, "Goods Movement > MIGO")
+    draw_subheader(d, "Goods Movement > MIGO", img=img)
     # Neutral: blank target + decoy the Action dropdown and PO field
     ref_val = "Purchase Order" if hl else ""
     _header_row(d, reference=ref_val, hl_ref=hl,
-                decoy_action=not hl, decoy_po=not hl)
-    placeholder_note(d)
+                decoy_action=not hl, decoy_po=not hl, img=img)
+    placeholder_note(d, img=img)
     return img
 
 
 def screen_migo_po(hl=True):
     img, d = new_screen("Goods Movement (MIGO)")
-    draw_subheader(d, "Goods Movement > MIGO")
+    draw_subheader(d, "Goods Movement > MIGO", img=img)
     # Neutral: blank target + decoy the Reference Doc dropdown and Execute button
     po_val = "4500033900" if hl else ""
     _header_row(d, po=po_val, hl_po=hl,
-                decoy_ref=not hl, decoy_exec=not hl)
-    placeholder_note(d)
+                decoy_ref=not hl, decoy_exec=not hl, img=img)
+    placeholder_note(d, img=img)
     return img
 
 
 def screen_migo_items(hl=True):
     img, d = new_screen("Goods Movement (MIGO) — PO 4500033900")
-    draw_subheader(d, "Goods Movement > MIGO")
-    _header_row(d, po="4500033900")
+    draw_subheader(d, "Goods Movement > MIGO", img=img)
+    _header_row(d, po="4500033900", img=img)
     # Neutral: blank Qty (col 3) + decoy UN No. (5) and Haz.Class (6) columns
     _items_table(d, highlight_col=3 if hl else None,
                  blank_col=3 if not hl else None,
-                 decoy_cols=[5, 6] if not hl else None)
-    placeholder_note(d)
+                 decoy_cols=[5, 6] if not hl else None, img=img)
+    placeholder_note(d, img=img)
     return img
 
 
 def screen_migo_un(hl=True):
     img, d = new_screen("Goods Movement (MIGO) — Item Detail")
-    draw_subheader(d, "Goods Movement > MIGO")
+    draw_subheader(d, "Goods Movement > MIGO", img=img)
     draw_card(d, 20, 90, W - 20, 560,
               title="Item Detail — Line 0001: CH-1101 Acetone 55-gal drums")
     _draw_item_detail_tabs(d, active_idx=2)
     d.text((36, 170), "Material Tab — Hazmat Classification",
            font=fnt(13, bold=True), fill=SAP_LABEL)
-    draw_field(d, 36,  210, 200, 34, "Material Number",      "CH-1101")
+    draw_field(d, 36,  210, 200, 34, "Material Number",      "CH-1101", img=img)
     # Neutral: blank UN number + decoy Hazmat Class dropdown and SDS checkbox
     un_val = "UN1090" if hl else ""
-    draw_field(d, 260, 210, 180, 34, "UN Number", un_val, highlight=hl)
-    draw_dropdown(d, 460, 210, 180, 34, "Hazmat Class", "Class 3 Flammable", decoy=not hl)
-    draw_checkbox(d, 36, 278, "SDS Verified", checked=True, decoy=not hl)
-    draw_status_banner(d, "⚠ Hazmat item — UN number mandatory before posting", ok=False)
-    placeholder_note(d)
+    draw_field(d, 260, 210, 180, 34, "UN Number", un_val, highlight=hl, img=img)
+    draw_dropdown(d, 460, 210, 180, 34, "Hazmat Class", "Class 3 Flammable", decoy=not hl, img=img)
+    draw_checkbox(d, 36, 278, "SDS Verified", checked=True, decoy=not hl, img=img)
+    draw_status_banner(d, "⚠ Hazmat item — UN number mandatory before posting", ok=False, img=img)
+    placeholder_note(d, img=img)
     return img
 
 
 def screen_migo_storage_class(hl=True):
     img, d = new_screen("Goods Movement (MIGO) — Item Detail")
-    draw_subheader(d, "Goods Movement > MIGO")
+    draw_subheader(d, "Goods Movement > MIGO", img=img)
     draw_card(d, 20, 90, W - 20, 560,
               title="Item Detail — Line 0001: CH-1101 Acetone 55-gal drums")
     _draw_item_detail_tabs(d, active_idx=0)
     d.text((36, 170), "Where Tab — Storage & Hazmat Assignment", font=fnt(13, bold=True), fill=SAP_LABEL)
     # Neutral: blank storage loc + decoy Plant and Movement Type
-    draw_field(   d, 36,  210, 200, 34, "Plant",            "HC01",                         decoy=not hl)
+    draw_field(   d, 36,  210, 200, 34, "Plant",            "HC01",                         decoy=not hl, img=img)
     sloc_val = "HAZ-A (Flammable)" if hl else ""
-    draw_dropdown(d, 260, 210, 220, 34, "Storage Location", sloc_val,                       highlight=hl)
-    draw_field(   d, 504, 210, 200, 34, "Movement Type",    "101",                          decoy=not hl)
-    draw_field(   d, 36,  278, 200, 34, "Vendor",           "NovoChem Supply")
-    draw_field(   d, 260, 278, 220, 34, "Delivery Note",    "DN-20240215")
-    placeholder_note(d)
+    draw_dropdown(d, 260, 210, 220, 34, "Storage Location", sloc_val,                       highlight=hl, img=img)
+    draw_field(   d, 504, 210, 200, 34, "Movement Type",    "101",                          decoy=not hl, img=img)
+    draw_field(   d, 36,  278, 200, 34, "Vendor",           "NovoChem Supply", img=img)
+    draw_field(   d, 260, 278, 220, 34, "Delivery Note",    "DN-20240215", img=img)
+    placeholder_note(d, img=img)
     return img
 
 
 def screen_migo_post(hl=True):
     img, d = new_screen("Goods Movement (MIGO) — Ready to Post")
-    draw_subheader(d, "Goods Movement > MIGO")
+    draw_subheader(d, "Goods Movement > MIGO", img=img)
     d.rectangle([0, 80, W, 116], fill=(248, 250, 252))
     d.line([(0, 116), (W, 116)], fill=SAP_BORDER, width=1)
     # Neutral: decoy Check and Cancel buttons
-    draw_button(d, 20,  88, 80, 32, "Post",   primary=True,  highlight=hl)
-    draw_button(d, 112, 88, 80, 32, "Check",  primary=False, decoy=not hl)
-    draw_button(d, 204, 88, 80, 32, "Cancel", primary=False, decoy=not hl)
+    draw_button(d, 20,  88, 80, 32, "Post",   primary=True,  highlight=hl, img=img)
+    draw_button(d, 112, 88, 80, 32, "Check",  primary=False, decoy=not hl, img=img)
+    draw_button(d, 204, 88, 80, 32, "Cancel", primary=False, decoy=not hl, img=img)
     # Summary card
     draw_card(d, 20, 126, W - 20, 420, title="Ready to Post — Hazmat Summary")
     summary = [
@@ -384,8 +385,8 @@ def screen_migo_post(hl=True):
         d.text((36, sy),  label + ":",  font=fnt(12, bold=True), fill=SAP_LABEL)
         d.text((220, sy), value,        font=fnt(12),             fill=SAP_TEXT)
         sy += 24
-    draw_status_banner(d, "✓ All hazmat validations passed. UN numbers, classes, and emergency contact confirmed.")
-    placeholder_note(d)
+    draw_status_banner(d, "✓ All hazmat validations passed. UN numbers, classes, and emergency contact confirmed.", img=img)
+    placeholder_note(d, img=img)
     return img
 
 
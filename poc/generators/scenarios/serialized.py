@@ -195,16 +195,17 @@ SCENARIO = {
 
 def _header_row(d, action="Goods Receipt", reference="Purchase Order",
                 po="", hl_action=False, hl_ref=False, hl_po=False,
-                decoy_action=False, decoy_ref=False, decoy_po=False, decoy_exec=False):
+                decoy_action=False, decoy_ref=False, decoy_po=False, decoy_exec=False,
+                img=None):
     """Reusable MIGO transaction header strip (y=90–200)."""
     draw_card(d, 20, 90, W - 20, 200, title="Transaction Header")
-    draw_dropdown(d, 36,  148, 220, 36, "Action",             action,    highlight=hl_action, decoy=decoy_action)
-    draw_dropdown(d, 280, 148, 220, 36, "Reference Document", reference, highlight=hl_ref,    decoy=decoy_ref)
-    draw_field(   d, 524, 148, 200, 36, "Purchase Order No.", po,        highlight=hl_po,     decoy=decoy_po)
-    draw_button(  d, 744, 148,  80, 36, "Execute",            decoy=decoy_exec)
+    draw_dropdown(d, 36,  148, 220, 36, "Action",             action,    highlight=hl_action, decoy=decoy_action, img=img)
+    draw_dropdown(d, 280, 148, 220, 36, "Reference Document", reference, highlight=hl_ref,    decoy=decoy_ref, img=img)
+    draw_field(   d, 524, 148, 200, 36, "Purchase Order No.", po,        highlight=hl_po,     decoy=decoy_po, img=img)
+    draw_button(  d, 744, 148,  80, 36, "Execute",            decoy=decoy_exec, img=img)
 
 
-def _items_table(d, highlight_col=None, blank_col=None, decoy_cols=None):
+def _items_table(d, highlight_col=None, blank_col=None, decoy_cols=None, img=None):
     """Reusable MIGO line items table for serialized high-value goods (y=210+).
     blank_col: if set, blanks the values in that column (for L2/L3 challenge).
     decoy_cols: list of column indices to style as decoys (subtle blue tint).
@@ -217,7 +218,7 @@ def _items_table(d, highlight_col=None, blank_col=None, decoy_cols=None):
     if blank_col is not None:
         row1[blank_col] = ""
         row2[blank_col] = ""
-    draw_table_header(d, 36, 240, cols)
+    draw_table_header(d, 36, 240, cols, img=img)
     draw_table_row(d, 36, 272, cols, row1, highlight_col=highlight_col, decoy_cols=decoy_cols)
     draw_table_row(d, 36, 306, cols, row2, highlight_col=None, decoy_cols=decoy_cols)
 
@@ -256,63 +257,63 @@ def screen_fiori_home(hl=True):
                    font=fnt(13, bold=highlight), fill=SAP_TEXT)
         if highlight:
             d.text((x + 6, y + 6), "★", font=fnt(12), fill=SAP_AMBER)
-    placeholder_note(d)
+    placeholder_note(d, img=img)
     return img
 
 
 def screen_migo_action(hl=True):
     """MIGO with Action field highlighted."""
     img, d = new_screen("Goods Movement (MIGO)")
-    draw_subheader(d, "Goods Movement > MIGO")
+    draw_subheader(d, "Goods Movement > MIGO", img=img)
     # Neutral: blank action + decoy ref and exec
     action_val = "Goods Receipt" if hl else ""
     _header_row(d, action=action_val, hl_action=hl,
-                decoy_ref=not hl, decoy_exec=not hl)
-    placeholder_note(d)
+                decoy_ref=not hl, decoy_exec=not hl, img=img)
+    placeholder_note(d, img=img)
     return img
 
 
 def screen_migo_reference(hl=True):
     """MIGO with Reference Document field highlighted."""
     img, d = new_screen("Goods Movement (MIGO)")
-    draw_subheader(d, "Goods Movement > MIGO")
+    draw_subheader(d, "Goods Movement > MIGO", img=img)
     # Neutral: blank ref + decoy action and PO
     ref_val = "Purchase Order" if hl else ""
     _header_row(d, reference=ref_val, hl_ref=hl,
-                decoy_action=not hl, decoy_po=not hl)
-    placeholder_note(d)
+                decoy_action=not hl, decoy_po=not hl, img=img)
+    placeholder_note(d, img=img)
     return img
 
 
 def screen_migo_po(hl=True):
     """MIGO with PO number field highlighted."""
     img, d = new_screen("Goods Movement (MIGO)")
-    draw_subheader(d, "Goods Movement > MIGO")
+    draw_subheader(d, "Goods Movement > MIGO", img=img)
     # Neutral: blank PO + decoy ref and exec
     po_val = "4500077400" if hl else ""
     _header_row(d, po=po_val, hl_po=hl,
-                decoy_ref=not hl, decoy_exec=not hl)
-    placeholder_note(d)
+                decoy_ref=not hl, decoy_exec=not hl, img=img)
+    placeholder_note(d, img=img)
     return img
 
 
 def screen_migo_items(hl=True):
     """MIGO items table with Qty column highlighted."""
     img, d = new_screen("Goods Movement (MIGO) — PO 4500077400")
-    draw_subheader(d, "Goods Movement > MIGO")
-    _header_row(d, po="4500077400")
+    draw_subheader(d, "Goods Movement > MIGO", img=img)
+    _header_row(d, po="4500077400", img=img)
     # Neutral: blank Qty + decoy S.Loc (5) and Serial No. (6) columns
     _items_table(d, highlight_col=3 if hl else None,
                  blank_col=3 if not hl else None,
-                 decoy_cols=[5, 6] if not hl else None)
-    placeholder_note(d)
+                 decoy_cols=[5, 6] if not hl else None, img=img)
+    placeholder_note(d, img=img)
     return img
 
 
 def screen_migo_serial(hl=True):
     """Serial number entry panel for high-value item (EL-5501 ProBook 15 Laptop)."""
     img, d = new_screen("Goods Movement (MIGO) — Serial Number Entry")
-    draw_subheader(d, "Goods Movement > MIGO > Serial Capture")
+    draw_subheader(d, "Goods Movement > MIGO > Serial Capture", img=img)
 
     # Card header: "Serial Number Entry"
     draw_card(d, 20, 90, W - 20, 580,
@@ -339,18 +340,18 @@ def screen_migo_serial(hl=True):
         label_text = f"Unit {idx}"
         if idx == 6:
             # Highlight this field when hl=True; blank it when hl=False
-            draw_field(d, 36, sy, 300, 34, label_text, sn if hl else "", highlight=hl)
+            draw_field(d, 36, sy, 300, 34, label_text, sn if hl else "", highlight=hl, img=img)
         elif idx in (2, 4):
             # Decoys: Unit 2 and 4 get decoy styling when hl=False
-            draw_field(d, 36, sy, 300, 34, label_text, sn, decoy=not hl)
+            draw_field(d, 36, sy, 300, 34, label_text, sn, decoy=not hl, img=img)
         else:
             # Normal display
-            draw_field(d, 36, sy, 300, 34, label_text, sn)
+            draw_field(d, 36, sy, 300, 34, label_text, sn, img=img)
         sy += 50
 
     # Status banner
-    draw_status_banner(d, "Serial capture active. Unit 6 of 10. Press Enter to advance.", ok=True)
-    placeholder_note(d)
+    draw_status_banner(d, "Serial capture active. Unit 6 of 10. Press Enter to advance.", ok=True, img=img)
+    placeholder_note(d, img=img)
     return img
 
 
@@ -373,7 +374,7 @@ def _draw_item_detail_tabs(d, active_idx):
 def screen_migo_secure(hl=True):
     """Item Detail with Storage Location dropdown set to CAGE-01 and security banner."""
     img, d = new_screen("Goods Movement (MIGO) — Item Detail")
-    draw_subheader(d, "Goods Movement > MIGO")
+    draw_subheader(d, "Goods Movement > MIGO", img=img)
     draw_card(d, 20, 90, W - 20, 560,
               title="Item Detail — Line 0001: EL-5501 ProBook 15 Laptop")
 
@@ -383,11 +384,11 @@ def screen_migo_secure(hl=True):
     d.text((36, 170), "Where Tab — Secure Storage Assignment", font=fnt(13, bold=True), fill=SAP_LABEL)
     # Neutral: blank storage loc + decoy Plant and Movement Type
     sloc_val = "CAGE-01 (Secure)" if hl else ""
-    draw_field(   d, 36,  210, 200, 34, "Plant",            "TechVault-01", decoy=not hl)
-    draw_dropdown(d, 260, 210, 220, 34, "Storage Location", sloc_val, highlight=hl)
-    draw_field(   d, 504, 210, 200, 34, "Movement Type",    "101", decoy=not hl)
-    draw_field(   d, 36,  278, 200, 34, "Vendor",           "TechSupply Corp")
-    draw_field(   d, 260, 278, 220, 34, "Delivery Note",    "DN-TechSupply-001")
+    draw_field(   d, 36,  210, 200, 34, "Plant",            "TechVault-01", decoy=not hl, img=img)
+    draw_dropdown(d, 260, 210, 220, 34, "Storage Location", sloc_val, highlight=hl, img=img)
+    draw_field(   d, 504, 210, 200, 34, "Movement Type",    "101", decoy=not hl, img=img)
+    draw_field(   d, 36,  278, 200, 34, "Vendor",           "TechSupply Corp", img=img)
+    draw_field(   d, 260, 278, 220, 34, "Delivery Note",    "DN-TechSupply-001", img=img)
 
     # Security status banner (red, for emphasis)
     d.rounded_rectangle([20, 380, W - 20, 430],
@@ -397,22 +398,22 @@ def screen_migo_secure(hl=True):
     d.text((44, 414), "Secure cage lock required. No exceptions.",
            font=fnt(11), fill=SAP_RED)
 
-    placeholder_note(d)
+    placeholder_note(d, img=img)
     return img
 
 
 def screen_migo_post(hl=True):
     """Post screen with serialized high-value GR summary."""
     img, d = new_screen("Goods Movement (MIGO) — Ready to Post")
-    draw_subheader(d, "Goods Movement > MIGO")
+    draw_subheader(d, "Goods Movement > MIGO", img=img)
 
     # Toolbar with Post highlighted or not
     d.rectangle([0, 80, W, 116], fill=(248, 250, 252))
     d.line([(0, 116), (W, 116)], fill=SAP_BORDER, width=1)
     # Neutral: decoy Check and Cancel buttons
-    draw_button(d, 20,  88, 80, 32, "Post",   primary=True,  highlight=hl)
-    draw_button(d, 112, 88, 80, 32, "Check",  primary=False, decoy=not hl)
-    draw_button(d, 204, 88, 80, 32, "Cancel", primary=False, decoy=not hl)
+    draw_button(d, 20,  88, 80, 32, "Post",   primary=True,  highlight=hl, img=img)
+    draw_button(d, 112, 88, 80, 32, "Check",  primary=False, decoy=not hl, img=img)
+    draw_button(d, 204, 88, 80, 32, "Cancel", primary=False, decoy=not hl, img=img)
 
     # Summary card
     draw_card(d, 20, 126, W - 20, 380, title="Ready to Post — High-Value Serialized GR Summary")
@@ -431,8 +432,8 @@ def screen_migo_post(hl=True):
         d.text((220, sy), value,       font=fnt(12),             fill=SAP_TEXT)
         sy += 24
 
-    draw_status_banner(d, "All validations passed. Serials captured. Secure storage confirmed. Ready for manager approval.")
-    placeholder_note(d)
+    draw_status_banner(d, "All validations passed. Serials captured. Secure storage confirmed. Ready for manager approval.", img=img)
+    placeholder_note(d, img=img)
     return img
 
 
@@ -160,16 +160,17 @@ SCENARIO = {
 
 def _header_row(d, action="Goods Receipt", reference="Purchase Order",
                 po="", hl_action=False, hl_ref=False, hl_po=False,
-                decoy_action=False, decoy_ref=False, decoy_po=False, decoy_exec=False):
+                decoy_action=False, decoy_ref=False, decoy_po=False, decoy_exec=False,
+                img=None):
     """Reusable MIGO transaction header strip (y=90–200)."""
     draw_card(d, 20, 90, W - 20, 200, title="Transaction Header")
-    draw_dropdown(d, 36,  148, 220, 36, "Action",             action,    highlight=hl_action, decoy=decoy_action)
-    draw_dropdown(d, 280, 148, 220, 36, "Reference Document", reference, highlight=hl_ref,    decoy=decoy_ref)
-    draw_field(   d, 524, 148, 200, 36, "Purchase Order No.", po,        highlight=hl_po,     decoy=decoy_po)
-    draw_button(  d, 744, 148,  80, 36, "Execute",            decoy=decoy_exec)
+    draw_dropdown(d, 36,  148, 220, 36, "Action",             action,    highlight=hl_action, decoy=decoy_action, img=img)
+    draw_dropdown(d, 280, 148, 220, 36, "Reference Document", reference, highlight=hl_ref,    decoy=decoy_ref, img=img)
+    draw_field(   d, 524, 148, 200, 36, "Purchase Order No.", po,        highlight=hl_po,     decoy=decoy_po, img=img)
+    draw_button(  d, 744, 148,  80, 36, "Execute",            decoy=decoy_exec, img=img)
 
 
-def _items_table(d, highlight_col=None, blank_col=None, decoy_cols=None):
+def _items_table(d, highlight_col=None, blank_col=None, decoy_cols=None, img=None):
     """Reusable MIGO line items table (y=210+) — no Batch column for standard_dry."""
     d.text((36, 216), "Line Items", font=fnt(14, bold=True), fill=SAP_TEXT)
     cols = [("Item", 60), ("Material", 120), ("Description", 200),
@@ -179,7 +180,7 @@ def _items_table(d, highlight_col=None, blank_col=None, decoy_cols=None):
     if blank_col is not None:
         row1[blank_col] = ""
         row2[blank_col] = ""
-    draw_table_header(d, 36, 240, cols)
+    draw_table_header(d, 36, 240, cols, img=img)
     draw_table_row(d, 36, 272, cols, row1, highlight_col=highlight_col, decoy_cols=decoy_cols)
     draw_table_row(d, 36, 306, cols, row2, highlight_col=None, decoy_cols=decoy_cols)
 
@@ -217,65 +218,65 @@ def screen_fiori_home(hl=True):
                    font=fnt(13, bold=highlight), fill=SAP_TEXT)
         if highlight:
             d.text((x + 6, y + 6), "★", font=fnt(12), fill=SAP_AMBER)
-    placeholder_note(d)
+    placeholder_note(d, img=img)
     return img
 
 
 def screen_migo_action(hl=True):
     img, d = new_screen("Goods Movement (MIGO)")
-    draw_subheader(d, "Goods Movement > MIGO")
+    draw_subheader(d, "Goods Movement > MIGO", img=img)
     # Neutral: blank target + decoy the Reference Doc dropdown and Execute button
     action_val = "Goods Receipt" if hl else ""
     _header_row(d, action=action_val, hl_action=hl,
-                decoy_ref=not hl, decoy_exec=not hl)
-    placeholder_note(d)
+                decoy_ref=not hl, decoy_exec=not hl, img=img)
+    placeholder_note(d, img=img)
     return img
 
 
 def screen_migo_reference(hl=True):
     img, d = new_screen("Goods Movement (MIGO)")
-    draw_subheader(d, "Goods Movement > MIGO")
+    draw_subheader(d, "Goods Movement > MIGO", img=img)
     # Neutral: blank target + decoy the Action dropdown and PO field
     ref_val = "Purchase Order" if hl else ""
     _header_row(d, reference=ref_val, hl_ref=hl,
-                decoy_action=not hl, decoy_po=not hl)
-    placeholder_note(d)
+                decoy_action=not hl, decoy_po=not hl, img=img)
+    placeholder_note(d, img=img)
     return img
 
 
 def screen_migo_po(hl=True):
     img, d = new_screen("Goods Movement (MIGO)")
-    draw_subheader(d, "Goods Movement > MIGO")
+    draw_subheader(d, "Goods Movement > MIGO", img=img)
     # Neutral: blank target + decoy the Reference Doc dropdown and Execute button
     po_val = "4500098712" if hl else ""
     _header_row(d, po=po_val, hl_po=hl,
-                decoy_ref=not hl, decoy_exec=not hl)
-    placeholder_note(d)
+                decoy_ref=not hl, decoy_exec=not hl, img=img)
+    placeholder_note(d, img=img)
     return img
 
 
 def screen_migo_items(hl=True):
     img, d = new_screen("Goods Movement (MIGO) — PO 4500098712")
-    draw_subheader(d, "Goods Movement > MIGO")
-    _header_row(d, po="4500098712")
+    draw_subheader(d, "Goods Movement > MIGO", img=img)
+    _header_row(d, po="4500098712", img=img)
     # Neutral: blank Qty + decoy S.Loc (col 5)
     _items_table(d, highlight_col=3 if hl else None,
                  blank_col=3 if not hl else None,
-                 decoy_cols=[5] if not hl else None)
-    placeholder_note(d)
+                 decoy_cols=[5] if not hl else None, img=img)
+    placeholder_note(d, img=img)
     return img
 
 
 def screen_migo_post(hl=True):
     img, d = new_screen("Goods Movement (MIGO) — Ready to Post")
-    draw_subheader(d, "Goods Movement > MIGO")
+    draw_subheader(d, "Goods Movement > MIGO", img=img)
     # Toolbar with Post highlighted
     d.rectangle([0, 80, W, 116], fill=(248, 250, 252))
     d.line([(0, 116), (W, 116)], fill=SAP_BORDER, width=1)
     # Neutral: decoy Check and Cancel buttons
-    draw_button(d, 20,  88, 80, 32, "Post",   primary=True,  highlight=hl)
-    draw_button(d, 112, 88, 80, 32, "Check",  primary=False, decoy=not hl)
-    draw_button(d, 204, 88, 80, 32, "Cancel", primary=False, decoy=not hl)
+    draw_button(d, 20,  88, 80, 32, "Post",   primary=True,  highlight=hl, img=img)
+    draw_button(d, 112, 88, 80, 32, "Check",  primary=False, decoy=not hl, img=img)
+    draw_button(d, 204, 88, 80, 32, "Cancel", primary=False, decoy=not hl, img=img)
     # Summary card
     draw_card(d, 20, 126, W - 20, 340, title="Ready to Post — Summary")
     summary = [
@@ -291,8 +292,8 @@ def screen_migo_post(hl=True):
         d.text((36, sy),  label + ":", font=fnt(12, bold=True), fill=SAP_LABEL)
         d.text((220, sy), value,       font=fnt(12),             fill=SAP_TEXT)
         sy += 24
-    draw_status_banner(d, "All validations passed. Click Post to complete the Goods Receipt.")
-    placeholder_note(d)
+    draw_status_banner(d, "All validations passed. Click Post to complete the Goods Receipt.", img=img)
+    placeholder_note(d, img=img)
     return img
 
 
@@ -0,0 +1,181 @@
+"""
+text_layout.py — Process-wide font registry and text-layout cache for Pillow renderers.
+
+Every fnt()/ft() helper (scenarios/base.py, video_render, video_render_v2,
+video_render_bigfoot) stat'ed its candidate paths and called
+ImageFont.truetype() on every call. Scenario screen generators call it
+hundreds of times per pack. Fonts are immutable once loaded, so they
+are now resolved once per (candidates, size) and shared.
+
+Greedy word wrapping re-measured every growing prefix of every line on
+every render. Line breaks and text extents are cached per (font, text,
+width), and the same slide or screen text is laid out once per process.
+
+Usage:
+    from text_layout import font, wrap_text, draw_wrapped, text_size
+    f = font(["/Library/Fonts/Arial.ttf", "/usr/share/fonts/.../DejaVuSans.ttf"], 14)
+    y = draw_wrapped(draw, "Post the goods receipt in MIGO", f, cx, y, max_w, fill)
+
+Every cache is an LRUCache with a size cap, so a long-running process
+(trainer_server.py) keeps them warm without growing without bound.
+
+caching(False) turns the caches off temporarily, e.g. in bench_screens.py.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from PIL import ImageFont
+
+
+class LRUCache:
+    """Thread-safe mapping of at most `maxsize` entries; the least recently used go first."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        # Lock-free hot path: each OrderedDict call is atomic, and a key
+        # evicted between the two calls just isn't refreshed.
+        value = self._data.get(key)
+        if value is not None:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                pass
+        return value
+
+    def setdefault(self, key, value):
+        """Store value unless key is present; returns the cached value either way."""
+        with self._lock:
+            value = self._data.setdefault(key, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_enabled = True
+_fonts   = LRUCache(256)      # (candidates, size) -> font
+_boxes   = LRUCache(50_000)   # (font key, text) -> ink box at (0, 0)
+_lines   = LRUCache(20_000)   # (font key, text, max_w) -> tuple of lines
+
+
+def _load(candidates, size):
+    for path in candidates:
+        if path and os.path.exists(path):
+            try:
+                return ImageFont.truetype(path, size)
+            except Exception:
+                pass
+    return ImageFont.load_default()
+
+
+def font(candidates, size):
+    """First loadable font in `candidates` at `size` (Pillow default if none)."""
+    if isinstance(candidates, (str, os.PathLike)):
+        candidates = (candidates,)
+    key = (tuple(str(c) for c in candidates if c), size)
+    if not _enabled:
+        return _load(*key)
+    f = _fonts.get(key)
+    if f is None:
+        f = _fonts.setdefault(key, _load(*key))
+    return f
+
+
+def _font_key(f):
+    # Registry fonts are singletons, but callers may pass fonts of their own.
+    return (getattr(f, "path", None), getattr(f, "size", None), getattr(f, "index", None)) \
+        if getattr(f, "path", None) else id(f)
+
+
+def text_bbox(text, f):
+    """(x0, y0, x1, y1) ink box of the text — same as ImageDraw.textbbox from (0, 0)."""
+    key = (_font_key(f), text)
+    box = _boxes.get(key) if _enabled else None
+    if box is None:
+        box = f.getbbox(text)
+        if _enabled:
+            _boxes.setdefault(key, box)
+    return box
+
+
+def text_size(text, f):
+    """(width, height) of the text's ink box."""
+    x0, y0, x1, y1 = text_bbox(text, f)
+    return (x1 - x0, y1 - y0)
+
+
+def wrap_text(text, f, max_w):
+    """Greedy word wrap: a line breaks before the word that would exceed max_w."""
+    key = (_font_key(f), text, max_w)
+    lines = _lines.get(key) if _enabled else None
+    if lines is None:
+        out, cur = [], []
+        for w in text.split():
+            test = " ".join(cur + [w])
+            if text_size(test, f)[0] > max_w and cur:
+                out.append(" ".join(cur))
+                cur = [w]
+            else:
+                cur.append(w)
+        if cur:
+            out.append(" ".join(cur))
+        lines = tuple(out)
+        if _enabled:
+            _lines.setdefault(key, lines)
+    return lines
+
+
+def draw_wrapped(draw, text, f, x, y, max_w, fill, align="center", line_gap=8):
+    """
+    Draw wrapped text; x is the centre, left or right edge per `align`.
+    Returns the y below the last line.
+    """
+    for line in wrap_text(text, f, max_w):
+        tw, th = text_size(line, f)
+        if align == "center":
+            lx = x - tw // 2
+        elif align == "left":
+            lx = x
+        else:
+            lx = x - tw
+        draw.text((lx, y), line, font=f, fill=fill)
+        y += th + line_gap
+    return y
+
+
+def clear():
+    _fonts.clear()
+    _boxes.clear()
+    _lines.clear()
+
+
+def enabled():
+    """Whether caching is on; renderers with caches of their own honour it too."""
+    return _enabled
+
+
+@contextmanager
+def caching(enabled):
+    """Temporarily enable/disable the registry and layout caches."""
+    global _enabled
+    prev, _enabled = _enabled, enabled
+    try:
+        yield
+    finally:
+        _enabled = prev
@@ -21,6 +21,14 @@ const { useState, useReducer, useRef, useEffect, useCallback } = React;
 const SCENARIO        = window.__SCENARIO__;
 const SCREENS         = window.__SCREENS__;          // highlighted (L0, L1)
 const SCREENS_NEUTRAL = window.__SCREENS_NEUTRAL__;  // neutral    (L2, L3)
+// Screen map entries are a path, or { src, webp, width, height, tiles } when the
+// build emitted WebP + downscaled variants (src is then the PNG fallback, webp a
+// srcset) or highlight overlays. Highlighted entries share the neutral base image
+// and list tiles [{ src, x, y, w, h }] (source pixels) to draw over it.
+// placeholder is the smallest WebP, shown while the full image loads.
+const srcOf = (entry) => (entry && typeof entry === "object" ? entry.src : entry);
+// Per tutorial step: { screen, highlighted, neutral, placeholder } in bytes
+const STEP_ASSETS = window.__STEP_ASSETS__ || [];
 const steps   = SCENARIO.tutorial;
 const mission = SCENARIO.mission;
 
@@ -28,7 +36,10 @@ const mission = SCENARIO.mission;
 const IS_HARDWARE = SCENARIO.training_domain === "hardware";
 
 // ── Branding (injected from scenario, with SAP defaults as fallback) ────────
-const B = SCENARIO.branding || {};
+// Scenarios using a shared preset ship { extends: "sap", ...overrides }; the
+// presets load once for every scenario from _runtime/branding.<hash>.js.
+const { extends: BRAND_PRESET, ...BRAND_OVERRIDES } = SCENARIO.branding || {};
+const B = { ...(BRAND_PRESET && (window.__BRANDING__ || {})[BRAND_PRESET]), ...BRAND_OVERRIDES };
 const SHELL_COLOR  = B.shell_color  || "#033D80";
 const ACCENT       = B.accent_color || "#E87600";
 const LEVEL_COLORS = B.level_colors || ["#107E3E", "#0070F2", "#E87600", "#BB000B"];
@@ -418,6 +429,93 @@ function LevelSelect({ dispatch }) {
 // ═══════════════════════════════════════════════════════════════════════════════
 // SCREEN VIEW — image + overlay canvas + click layer
 // ═══════════════════════════════════════════════════════════════════════════════
+// ── Screen prefetch ─────────────────────────────────────────────────────────
+// Upcoming steps' screens are fetched and decoded (img.decode(), off the main
+// thread) while the learner works on the current one. Prefetching stops after
+// PREFETCH_STEPS steps or PREFETCH_BYTES, whichever comes first, and drops to
+// one step when the browser asks to save data.
+const PREFETCH_STEPS = 3;
+const PREFETCH_BYTES = 2 * 1024 * 1024;
+const SCREEN_SIZES   = "(max-width: 1280px) 100vw, 1280px";
+const SUPPORTS_WEBP  = (() => {
+  try { return document.createElement("canvas").toDataURL("image/webp").startsWith("data:image/webp"); }
+  catch (e) { return false; }
+})();
+const prefetched = new Map(); // src or srcset → Image (kept so the decoded copy stays cached)
+
+function prefetchImage(src, webp) {
+  const key = webp && SUPPORTS_WEBP ? webp : src;
+  if (prefetched.has(key)) return;
+  const img = new Image();
+  if (key === webp) { img.sizes = SCREEN_SIZES; img.srcset = webp; }
+  img.src = src;
+  prefetched.set(key, img);
+  // A failed decode just means the step loads normally when shown
+  if (img.decode) img.decode().catch(() => {});
+}
+
+function prefetchScreen(entry) {
+  if (!entry) return;
+  const obj = typeof entry === "object" ? entry : { src: entry };
+  prefetchImage(obj.src, obj.webp);
+  (obj.tiles || []).forEach((t) => prefetchImage(t.src));
+}
+
+function usePrefetchSteps(idx, screenMap, ready) {
+  useEffect(() => {
+    if (!ready) return;  // don't compete with the screen on display
+    const conn = navigator.connection;
+    const ahead = conn && conn.saveData ? 1 : PREFETCH_STEPS;
+    const highlighted = screenMap === SCREENS;
+    let budget = PREFETCH_BYTES;
+    for (let i = idx + 1; i <= idx + ahead && i < steps.length; i++) {
+      const assets = STEP_ASSETS[i];
+      const bytes = assets ? (highlighted ? assets.highlighted : assets.neutral) : 0;
+      if (bytes > budget && i > idx + 1) break;
+      budget -= bytes;
+      prefetchScreen(screenMap[steps[i].screen]);
+    }
+  }, [idx, screenMap, ready]);
+}
+
+// <img> for a screen map entry, preferring WebP at the size the layout needs.
+// With `overlays`, highlight tiles are laid over it (the parent must be
+// position: relative and sized to the image). With `placeholder`, the low-res
+// WebP fills the image box until the full image arrives, unless prefetched.
+function ScreenPicture({ entry, imgRef, overlays = false, placeholder = false, sizes = SCREEN_SIZES, style, ...img }) {
+  const obj = entry && typeof entry === "object" ? entry : {};
+  const tiles = overlays && obj.tiles ? obj.tiles : [];
+  const lowRes = placeholder && SUPPORTS_WEBP && obj.placeholder && !prefetched.has(obj.webp);
+  return (
+    <>
+      <picture style={{ display: "contents" }}>
+        {obj.webp && <source type="image/webp" srcSet={obj.webp} sizes={sizes} />}
+        <img
+          ref={imgRef}
+          src={srcOf(entry)}
+          width={obj.width}
+          height={obj.height}
+          style={lowRes ? { ...style, background: `url("${obj.placeholder}") center / 100% 100% no-repeat` } : style}
+          {...img}
+        />
+      </picture>
+      {tiles.map((t) => (
+        <img
+          key={t.src}
+          src={t.src}
+          alt=""
+          draggable={false}
+          style={{
+            position: "absolute", pointerEvents: "none", userSelect: "none",
+            left: `${(t.x / obj.width) * 100}%`, top: `${(t.y / obj.height) * 100}%`,
+            width: `${(t.w / obj.width) * 100}%`, height: "auto",
+          }}
+        />
+      ))}
+    </>
+  );
+}
+
 function ScreenView({ state, dispatch }) {
   const canvasRef = useRef(null);
   const imgRef = useRef(null);
@@ -428,11 +526,15 @@ function ScreenView({ state, dispatch }) {
   const currentStep = level === 0 ? steps[exploreIdx] : steps[stepIdx];
   // L0/L1 use highlighted screens; L2/L3 use neutral (no visual hints baked in)
   const screenMap = (level <= 1) ? SCREENS : SCREENS_NEUTRAL;
-  const screenSrc = screenMap[currentStep.screen];
+  const screenEntry = screenMap[currentStep.screen];
+  const screenSrc = srcOf(screenEntry);
 
   // Reset imgLoaded when screen changes so overlay redraws on new image
   useEffect(() => { setImgLoaded(false); setTooltip(null); }, [screenSrc]);
 
+  // Fetch the next steps' screens in the background once this one is up
+  usePrefetchSteps(level === 0 ? exploreIdx : stepIdx, screenMap, imgLoaded);
+
   // Get scale factor from rendered image vs 1280px source
   const getScale = useCallback(() => {
     if (!imgRef.current) return 1;
@@ -605,9 +707,11 @@ function ScreenView({ state, dispatch }) {
   return (
     <>
       <div style={{ position: "relative", marginTop: 52, width: "100%", maxWidth: 1280, cursor: "crosshair" }}>
-        <img
-          ref={imgRef}
-          src={screenSrc}
+        <ScreenPicture
+          entry={screenEntry}
+          imgRef={imgRef}
+          overlays
+          placeholder
           alt="Application screen"
           draggable={false}
           onLoad={() => setImgLoaded(true)}
@@ -914,6 +1018,7 @@ function BriefingScreen({ state, dispatch }) {
 
   // Check if scenario provides an exploded view (hardware scenarios)
   const explodedView = SCENARIO.exploded_view || null;
+  const preview = SCREENS[steps[0].screen];
   const objectives = (mission.learning_objectives && mission.learning_objectives[level])
     ? mission.learning_objectives[level]
     : null;
@@ -1254,12 +1359,29 @@ function BriefingScreen({ state, dispatch }) {
           <div style={{
             width: "100%", height: "100%", display: "flex",
             alignItems: "center", justifyContent: "center", padding: 32,
+            containerType: "size",
           }}>
-            <img
-              src={SCREENS[steps[0].screen]}
-              alt="Procedure preview"
-              style={{ maxWidth: "100%", maxHeight: "100%", borderRadius: 8, boxShadow: "0 4px 24px rgba(0,0,0,0.3)" }}
-            />
+            {preview && preview.width ? (
+              /* Box sized to the image (contain-fit) so highlight tiles line up */
+              <div style={{
+                position: "relative", aspectRatio: `${preview.width} / ${preview.height}`,
+                width: `min(100cqw, 100cqh * ${preview.width / preview.height})`,
+                borderRadius: 8, overflow: "hidden", boxShadow: "0 4px 24px rgba(0,0,0,0.3)",
+              }}>
+                <ScreenPicture
+                  entry={preview}
+                  overlays
+                  alt="Procedure preview"
+                  style={{ display: "block", width: "100%", height: "100%" }}
+                />
+              </div>
+            ) : (
+              <ScreenPicture
+                entry={preview}
+                alt="Procedure preview"
+                style={{ maxWidth: "100%", maxHeight: "100%", borderRadius: 8, boxShadow: "0 4px 24px rgba(0,0,0,0.3)" }}
+              />
+            )}
           </div>
         )}
       </div>
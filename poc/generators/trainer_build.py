@@ -0,0 +1,307 @@
+"""
+trainer_build.py — Ahead-of-time compilation of the trainer engine.
+
+Every index.html used to inline all of trainer_app.jsx as
+<script type="text/babel"> and pull babel-standalone (~3 MB) from a CDN,
+so each learner's browser downloaded Babel and transpiled the whole app
+on every page load. The engine is now compiled and minified once, with
+esbuild, into
+
+    output/ui_trainer/_runtime/trainer_app.<hash>.js
+
+which every scenario's index.html references. <hash> is the compiled
+bundle's content hash, so the filename changes whenever the engine does
+and browsers can cache it indefinitely.
+
+Compiled bundles are cached in output/.cache/trainer_js/, keyed on the JSX
+source and compiler flags. Once a bundle has been built (or copied into
+that cache), it is reused without needing esbuild at all. When neither a
+cached bundle nor esbuild is available, ui_trainer.py stops with an error;
+pass --allow-babel to fall back to in-browser Babel instead.
+
+esbuild is pinned in poc/package.json. Setup, once per checkout:
+
+    npm install --prefix poc
+
+esbuild is then found via $ESBUILD, then PATH, then poc/node_modules/.bin.
+
+Runtime libraries (React, ReactDOM, Babel, three.js) load from cdnjs by
+default. With bundle="offline" the pinned builds in RUNTIME_LIBS are
+fetched once into output/.cache/runtime/ (or copied there by hand on
+air-gapped machines) and vendored into _runtime/ as <name>.<hash>.js,
+shared by every scenario, so first paint needs no external network.
+
+Each runtime file is pinned by its SRI hash in runtime_pins.json. Downloads
+and cached copies are checked against the pin before they are vendored, and
+cdnjs <script> tags carry it as their integrity attribute. To pin (or, after
+bumping a version in RUNTIME_LIBS, re-pin) on a networked machine, run
+
+    python3 poc/generators/trainer_build.py --pin-runtime
+
+and commit runtime_pins.json.
+
+Data shared by every scenario (branding presets) is written the same way,
+as _runtime/<name>.<hash>.js setting a window global, so each index.html
+carries only what is specific to its scenario.
+
+Usage:
+    from trainer_build import compile_engine, runtime_srcs, shared_script
+    src  = compile_engine(output_root)   # "_runtime/trainer_app.1a2b3c4d5e6f.js" or None
+    libs = runtime_srcs(["react", "react-dom", "three"], output_root, "offline")
+    brand = shared_script("__BRANDING__", presets, output_root)  # "_runtime/branding.<hash>.js"
+    sri   = cdn_integrity()             # cdnjs URL -> "sha384-..." for pinned libraries
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import urllib.request
+from pathlib import Path
+
+ENGINE_SRC    = Path(__file__).parent / "trainer_app.jsx"
+ENGINE_CACHE  = Path(__file__).parent.parent / "output" / ".cache" / "trainer_js"
+RUNTIME_CACHE = Path(__file__).parent.parent / "output" / ".cache" / "runtime"
+RUNTIME_DIR   = "_runtime"
+RUNTIME_PINS  = Path(__file__).parent / "runtime_pins.json"
+
+BUNDLES  = ("cdn", "offline")
+CDN_BASE = "https://cdnjs.cloudflare.com/ajax/libs/"
+
+# Pinned, minified runtime builds (paths relative to CDN_BASE and RUNTIME_CACHE)
+RUNTIME_LIBS = {
+    "react":     "react/18.2.0/umd/react.production.min.js",
+    "react-dom": "react-dom/18.2.0/umd/react-dom.production.min.js",
+    "babel":     "babel-standalone/7.23.9/babel.min.js",
+    "three":     "three.js/r128/three.min.js",
+}
+
+# Appended to the engine source: mounts <App /> once the globals are set.
+MOUNT = '\n// ── Mount ──\nReactDOM.createRoot(document.getElementById("root")).render(<App />);\n'
+
+ESBUILD_FLAGS = (
+    "--loader=jsx", "--jsx=transform", "--target=es2018",
+    "--charset=utf8", "--legal-comments=none", "--minify",
+)
+
+
+def find_esbuild():
+    """Path to an esbuild binary, or None."""
+    candidates = [
+        os.environ.get("ESBUILD"),
+        shutil.which("esbuild"),
+        str(Path(__file__).parent.parent / "node_modules" / ".bin" / "esbuild"),
+    ]
+    for path in candidates:
+        if path and os.path.isfile(path) and os.access(path, os.X_OK):
+            return path
+    return None
+
+
+def engine_source():
+    return ENGINE_SRC.read_text(encoding="utf-8") + MOUNT
+
+
+def write_atomic(path, data):
+    """Write bytes via a temp file renamed into place, so readers never see a partial file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=path.suffix)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)   # mkstemp creates 0600; these are served
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _hashed_name(filename, data):
+    stem, ext = os.path.splitext(filename)
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+
+
+def write_hashed(directory, filename, data):
+    """Write data to <directory>/<stem>.<hash><ext> (once) and return that filename."""
+    name = _hashed_name(filename, data)
+    out = Path(directory) / name
+    if not out.exists():
+        write_atomic(out, data)
+    return name
+
+
+def _compile(source, esbuild):
+    r = subprocess.run([esbuild, *ESBUILD_FLAGS], input=source.encode("utf-8"),
+                       capture_output=True)
+    if r.returncode != 0:
+        raise RuntimeError(f"esbuild failed:\n{r.stderr.decode(errors='replace')[-2000:]}")
+    return r.stdout
+
+
+def compiled_engine(cache_dir=ENGINE_CACHE):
+    """
+    Compiled engine bytes for the current trainer_app.jsx, compiling on a
+    cache miss. Returns None if it isn't cached and esbuild isn't available.
+    """
+    source = engine_source()
+    key = hashlib.sha256(repr((source, ESBUILD_FLAGS)).encode()).hexdigest()[:32]
+    cached = Path(cache_dir) / f"{key}.js"
+    if cached.exists():
+        return cached.read_bytes()
+    esbuild = find_esbuild()
+    if esbuild is None:
+        return None
+    js = _compile(source, esbuild)
+    write_atomic(cached, js)
+    return js
+
+
+def compile_engine(output_root, cache_dir=ENGINE_CACHE):
+    """
+    Write the compiled engine to <output_root>/_runtime/trainer_app.<hash>.js
+    (once per engine version) and return its path relative to output_root,
+    or None when the engine can't be compiled here.
+    """
+    js = compiled_engine(cache_dir)
+    if js is None:
+        return None
+    name = write_hashed(Path(output_root) / RUNTIME_DIR, "trainer_app.js", js)
+    return f"{RUNTIME_DIR}/{name}"
+
+
+def compact_json(value):
+    """Minified JSON that is safe to embed in an inline <script>."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).replace("</", "<\\/")
+
+
+def shared_script(var, value, output_root):
+    """
+    Write `window.<var>=<value>;` to <output_root>/_runtime/<name>.<hash>.js
+    (name is var without underscores, lowercased) and return its relative path.
+    """
+    data = f"window.{var}={compact_json(value)};\n".encode("utf-8")
+    name = write_hashed(Path(output_root) / RUNTIME_DIR, f"{var.strip('_').lower()}.js", data)
+    return f"{RUNTIME_DIR}/{name}"
+
+
+# ── Runtime libraries ────────────────────────────────────────────────────────
+def sri_hash(data, algorithm="sha384"):
+    """Subresource Integrity hash of data: "<algorithm>-<base64 digest>"."""
+    digest = hashlib.new(algorithm, data).digest()
+    return f"{algorithm}-{base64.b64encode(digest).decode('ascii')}"
+
+
+def runtime_pins():
+    """Library name -> pinned SRI hash (None if not pinned yet)."""
+    try:
+        pins = json.loads(RUNTIME_PINS.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        pins = {}
+    return {lib: pins.get(lib) for lib in RUNTIME_LIBS}
+
+
+def _verify_runtime(lib, data, pin, source):
+    if sri_hash(data, pin.split("-", 1)[0]) != pin:
+        raise RuntimeError(f"{source} does not match the {lib} hash pinned in "
+                           f"{RUNTIME_PINS.name} ({pin})")
+
+
+def _download(url):
+    print(f"  Fetching {url}")
+    with urllib.request.urlopen(url, timeout=60) as r:
+        return r.read()
+
+
+def fetch_runtime(lib, cache_dir=RUNTIME_CACHE):
+    """
+    Bytes of a pinned runtime library, downloaded once into cache_dir.
+    The download, and the cached copy on every later call, must match the
+    hash pinned in runtime_pins.json; nothing unverified is cached or vendored.
+    """
+    rel = RUNTIME_LIBS[lib]
+    pin = runtime_pins()[lib]
+    if not pin:
+        raise RuntimeError(f"no hash pinned for {lib} in {RUNTIME_PINS.name}; run "
+                           f"`python3 poc/generators/trainer_build.py --pin-runtime`")
+    cached = Path(cache_dir) / rel
+    if cached.exists():
+        data = cached.read_bytes()
+        _verify_runtime(lib, data, pin, f"cached {cached} (delete it to re-download)")
+        return data
+    url = CDN_BASE + rel
+    try:
+        data = _download(url)
+    except OSError as e:
+        raise RuntimeError(f"could not download {url} ({e}); "
+                           f"place the file at {cached} to build offline") from e
+    _verify_runtime(lib, data, pin, f"download of {url}")
+    write_atomic(cached, data)
+    return data
+
+
+def pin_runtime(cache_dir=RUNTIME_CACHE):
+    """Download every library in RUNTIME_LIBS and record its SRI hash in runtime_pins.json."""
+    pins = {}
+    for lib, rel in RUNTIME_LIBS.items():
+        data = _download(CDN_BASE + rel)
+        pins[lib] = sri_hash(data)
+        write_atomic(Path(cache_dir) / rel, data)
+        print(f"  ✓ {lib:<10} {pins[lib]}")
+    write_atomic(RUNTIME_PINS, (json.dumps(pins, indent=2) + "\n").encode("utf-8"))
+    return pins
+
+
+def cdn_integrity():
+    """cdnjs URL -> SRI hash for every pinned library, for <script integrity>."""
+    return {CDN_BASE + RUNTIME_LIBS[lib]: pin for lib, pin in runtime_pins().items() if pin}
+
+
+def vendor_runtime(lib, output_root, cache_dir=RUNTIME_CACHE):
+    """Copy a runtime library into <output_root>/_runtime/ and return its relative path."""
+    data = fetch_runtime(lib, cache_dir)
+    name = write_hashed(Path(output_root) / RUNTIME_DIR, os.path.basename(RUNTIME_LIBS[lib]), data)
+    return f"{RUNTIME_DIR}/{name}"
+
+
+def runtime_srcs(libs, output_root, bundle="cdn"):
+    """
+    Script URLs for `libs`: cdnjs URLs, or with bundle="offline", paths of
+    the vendored copies relative to output_root.
+    """
+    if bundle not in BUNDLES:
+        raise ValueError(f"unknown bundle {bundle!r} (expected one of {', '.join(BUNDLES)})")
+    if bundle == "cdn":
+        return [CDN_BASE + RUNTIME_LIBS[lib] for lib in libs]
+    return [vendor_runtime(lib, output_root) for lib in libs]
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+def main():
+    ap = argparse.ArgumentParser(description="Trainer engine and runtime library tools.")
+    ap.add_argument("--pin-runtime", action="store_true",
+                    help="download RUNTIME_LIBS from cdnjs and record their hashes "
+                         "in runtime_pins.json")
+    args = ap.parse_args()
+    if not args.pin_runtime:
+        ap.print_help()
+        return 0
+    print(f"Pinning {len(RUNTIME_LIBS)} runtime libraries")
+    try:
+        pin_runtime()
+    except OSError as e:
+        print(f"\n  ERROR: {e}")
+        return 1
+    print(f"\n✅  Wrote {RUNTIME_PINS} — review and commit it")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,373 @@
+"""
+trainer_screens.py — Incremental, atomic screen generation for ui_trainer.
+
+Every build redrew every PNG in screens/ and screens_neutral/, even when
+nothing about the scenario had changed. Each screen now gets a key hashed
+from everything that can change its pixels:
+
+  • the scenario module's source, scenarios/base*.py and text_layout.py
+  • the tutorial steps that reference the screen (hotspot, values, …)
+  • the font files scenarios/base.py resolves, and the Pillow version
+
+Keys are recorded in <scenario>/.screens_manifest.json, together with the
+content hash of every source photo the screen was drawn from (recorded
+while it renders, see scenarios/base_hardware.source_image). A screen is
+only redrawn when its key or one of those photos changes, or one of its
+files is missing. Files are
+written to a temp file and renamed into place, so a trainer being served
+while a build runs never sees a half-written image.
+
+With optimize=True (the default) each variant is also compressed for slow
+links:
+
+  • flat UI chrome (≤ FLAT_MAX_COLORS colours) is saved as a 256-colour
+    palette PNG and lossless WebP; photographic screens as optimized PNG
+    and lossy WebP
+  • lossy, downscaled WebPs (<name>@<w>w.webp) at RESPONSIVE_WIDTHS for
+    tablets and handheld scanners
+
+With overlay=True (the default) the highlighted variant is not stored as
+a second full image. Only the neutral screen is written as the shared base.
+The pixels where the highlighted render differs are cropped into a small
+tile, screens/<name>.tile.png. Screens whose highlight differs over more
+than OVERLAY_MAX_AREA of the image keep a full highlighted copy.
+
+screen_maps() turns each map entry into {src, webp, placeholder, width,
+height, tiles}. src is the PNG fallback, webp is a srcset, placeholder is
+the smallest WebP, and tiles are [{src, x, y, w, h}] drawn over the base.
+trainer_app.jsx serves these from a <picture> element. step_assets() lists
+each tutorial step's download size so the engine can budget its prefetching.
+
+Usage:
+    from trainer_screens import build_screens, screen_maps
+    names = build_screens(mod, base_out)            # serial, incremental
+    screens_hl, screens_neutral = screen_maps(base_out, names)
+
+    names, todo, manifest = plan_screens(mod, base_out)
+    # render each (fname, key) in todo elsewhere, record its entry in
+    # manifest["screens"][fname], then:
+    save_manifest(base_out, manifest)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+import PIL
+from PIL import Image, ImageChops
+
+GENERATORS_DIR = Path(__file__).parent
+MANIFEST       = ".screens_manifest.json"
+
+RESPONSIVE_WIDTHS = (640, 960)
+FLAT_MAX_COLORS   = 4096
+WEBP_QUALITY      = 82
+OPTIMIZE_SETTINGS = (RESPONSIVE_WIDTHS, FLAT_MAX_COLORS, WEBP_QUALITY)
+OVERLAY_MAX_AREA  = 0.5     # larger highlight diffs keep a full highlighted image
+KEY_VERSION       = 2       # bump when entries need inputs they did not record before
+
+
+# ── Input digests ─────────────────────────────────────────────────────────────
+@lru_cache(maxsize=None)
+def _file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _shared_digest():
+    """Shared drawing code, fonts and Pillow version — common to every scenario."""
+    from scenarios import base
+    h = hashlib.sha256(PIL.__version__.encode())
+    for path in sorted((GENERATORS_DIR / "scenarios").glob("base*.py")):
+        h.update(_file_digest(str(path)).encode())
+    h.update(_file_digest(str(GENERATORS_DIR / "text_layout.py")).encode())
+    for candidates in (base.FONT_BOLD, base.FONT_REGULAR):
+        font_path = next((p for p in candidates if os.path.exists(p)), None)
+        h.update((_file_digest(font_path) if font_path else "default").encode())
+    return h.hexdigest()
+
+
+def clear_digests():
+    """Forget cached file digests, so a long-running process sees edited sources."""
+    _file_digest.cache_clear()
+    _shared_digest.cache_clear()
+
+
+def _input_digest(path):
+    return _file_digest(path) if os.path.isfile(path) else None
+
+
+def screen_key(mod, fname, optimize=True, overlay=True):
+    steps = [step for step in mod.SCENARIO.get("tutorial", []) if step.get("screen") == fname]
+    payload = json.dumps([KEY_VERSION, _shared_digest(), _file_digest(inspect.getfile(mod)),
+                          fname, steps, optimize and OPTIMIZE_SETTINGS,
+                          overlay and OVERLAY_MAX_AREA],
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+# ── Manifest ──────────────────────────────────────────────────────────────────
+def _write_atomic(path, write):
+    """Call write(tmp_path) then rename tmp_path over path."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=path.suffix)
+    os.close(fd)
+    try:
+        write(tmp)
+        os.chmod(tmp, 0o644)   # mkstemp creates 0600; these are served
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def load_manifest(base_out):
+    try:
+        return json.loads((Path(base_out) / MANIFEST).read_text())
+    except (FileNotFoundError, ValueError):
+        return {"screens": {}}
+
+
+def save_manifest(base_out, manifest):
+    def write(tmp):
+        with open(tmp, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+    _write_atomic(Path(base_out) / MANIFEST, write)
+
+
+# ── Optimization ──────────────────────────────────────────────────────────────
+def _webp_name(rel, width=None):
+    stem = os.path.splitext(rel)[0]
+    return f"{stem}@{width}w.webp" if width else f"{stem}.webp"
+
+
+def _tile_name(rel):
+    return f"{os.path.splitext(rel)[0]}.tile.png"
+
+
+def _remove(base_out, names):
+    for name in names:
+        if (base_out / name).exists():
+            os.remove(base_out / name)
+
+
+def _is_flat(img):
+    return img.getcolors(FLAT_MAX_COLORS) is not None
+
+
+def _save_png(img, path, optimize):
+    if not optimize:
+        _write_atomic(path, lambda tmp: img.save(tmp, "PNG"))
+        return
+    if img.mode == "RGB" and _is_flat(img):
+        img = img.quantize(256, method=Image.Quantize.MEDIANCUT, dither=Image.Dither.NONE)
+    _write_atomic(path, lambda tmp: img.save(tmp, "PNG", optimize=True))
+
+
+def save_screen(img, base_out, rel, optimize=True):
+    """
+    Write a rendered screen to base_out/rel (plus WebP variants when
+    optimizing) and return its image entry.
+    """
+    base_out = Path(base_out)
+    stale = [_webp_name(rel)] + [_webp_name(rel, w) for w in RESPONSIVE_WIDTHS]
+    img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+    _save_png(img, base_out / rel, optimize)
+    entry = {"src": rel, "width": img.width, "height": img.height, "webp": []}
+    if not optimize:
+        _remove(base_out, stale)
+        return entry
+
+    # Downscaled copies are resampled, so no longer flat: always lossy.
+    flat = _is_flat(img)
+    for width in (img.width, *sorted(RESPONSIVE_WIDTHS, reverse=True)):
+        if width > img.width or (width == img.width and entry["webp"]):
+            continue
+        full = width == img.width
+        name = _webp_name(rel, None if full else width)
+        scaled = img if full else \
+            img.resize((width, round(img.height * width / img.width)), Image.Resampling.LANCZOS)
+        opts = {"lossless": True} if flat and full else {"quality": WEBP_QUALITY}
+        _write_atomic(base_out / name, lambda tmp: scaled.save(tmp, "WEBP", method=4, **opts))
+        entry["webp"].append([name, width])
+    _remove(base_out, [n for n in stale if n not in {n for n, _ in entry["webp"]}])
+    return entry
+
+
+def save_highlight(hl_img, neutral_img, base_out, rel, optimize=True, overlay=True):
+    """
+    Write the highlighted variant of a screen whose neutral variant is the
+    base. Returns {"tiles": [...]} (drawn over the neutral base) or, for
+    large diffs or overlay=False, a full image entry.
+    """
+    base_out = Path(base_out)
+    full_files = [rel, _webp_name(rel)] + [_webp_name(rel, w) for w in RESPONSIVE_WIDTHS]
+    tile_rel = _tile_name(rel)
+    if overlay and hl_img.size == neutral_img.size:
+        hl_img = hl_img.convert("RGB")
+        bbox = ImageChops.difference(hl_img, neutral_img.convert("RGB")).getbbox()
+        area = 0 if bbox is None else (bbox[2] - bbox[0]) * (bbox[3] - bbox[1])
+        if area <= OVERLAY_MAX_AREA * hl_img.width * hl_img.height:
+            _remove(base_out, full_files)
+            if bbox is None:
+                _remove(base_out, [tile_rel])
+                return {"tiles": []}
+            _save_png(hl_img.crop(bbox), base_out / tile_rel, optimize)
+            x0, y0, x1, y1 = bbox
+            return {"tiles": [{"src": tile_rel, "x": x0, "y": y0, "w": x1 - x0, "h": y1 - y0}]}
+    _remove(base_out, [tile_rel])
+    return save_screen(hl_img, base_out, rel, optimize)
+
+
+def _files(entry):
+    if "tiles" in entry:
+        return [t["src"] for t in entry["tiles"]]
+    return [entry["src"]] + [name for name, _ in entry["webp"]]
+
+
+def _map_entry(entry, tiles=None):
+    """A screen map value: the PNG path, or {src, webp, placeholder, width, height, tiles}."""
+    if not entry["webp"] and not tiles:
+        return entry["src"]
+    out = {"src": entry["src"], "width": entry["width"], "height": entry["height"]}
+    if entry["webp"]:
+        out["webp"] = ", ".join(f"{name} {w}w" for name, w in entry["webp"])
+        name, width = min(entry["webp"], key=lambda item: item[1])
+        if width < entry["width"]:
+            out["placeholder"] = name
+    if tiles:
+        out["tiles"] = tiles
+    return out
+
+
+def screen_maps(base_out, names, manifest=None):
+    """
+    (highlighted, neutral) screen maps for index.html. Screens missing
+    from the manifest (packs without SCREEN_GENERATORS) map to plain paths.
+    """
+    manifest = manifest or load_manifest(base_out)
+    screens_hl, screens_neutral = {}, {}
+    for fname in names:
+        entry = manifest["screens"].get(fname)
+        if not isinstance(entry, dict) or "neutral" not in entry:
+            screens_hl[fname] = f"screens/{fname}"
+            screens_neutral[fname] = f"screens_neutral/{fname}"
+            continue
+        neutral, hl = entry["neutral"], entry["highlight"]
+        screens_neutral[fname] = _map_entry(neutral)
+        screens_hl[fname] = _map_entry(neutral, hl["tiles"]) if "tiles" in hl else _map_entry(hl)
+    return screens_hl, screens_neutral
+
+
+def _size(base_out, name):
+    try:
+        return os.path.getsize(Path(base_out) / name)
+    except OSError:
+        return 0
+
+
+def _entry_bytes(base_out, value):
+    """Approximate download size of a screen map value (full-size WebP, else PNG)."""
+    if not isinstance(value, dict):
+        return _size(base_out, value)
+    full = value["webp"].split(",")[0].split()[0] if value.get("webp") else value["src"]
+    return _size(base_out, full) + sum(_size(base_out, t["src"]) for t in value.get("tiles", []))
+
+
+def step_assets(base_out, steps, screens_hl, screens_neutral):
+    """
+    Per tutorial step: {screen, highlighted, neutral, placeholder}, the
+    bytes a learner downloads to see that step's screen (0 if missing).
+    """
+    assets = []
+    for step in steps:
+        fname = step.get("screen")
+        hl, neutral = screens_hl.get(fname), screens_neutral.get(fname)
+        placeholder = neutral.get("placeholder") if isinstance(neutral, dict) else None
+        assets.append({
+            "screen":      fname,
+            "highlighted": _entry_bytes(base_out, hl) if hl else 0,
+            "neutral":     _entry_bytes(base_out, neutral) if neutral else 0,
+            "placeholder": _size(base_out, placeholder) if placeholder else 0,
+        })
+    return assets
+
+
+# ── Build ─────────────────────────────────────────────────────────────────────
+def _is_current(base_out, entry, key):
+    if not isinstance(entry, dict) or entry.get("key") != key or "neutral" not in entry:
+        return False
+    files = _files(entry["neutral"]) + _files(entry["highlight"])
+    if not all((base_out / name).exists() for name in files):
+        return False
+    return all(_input_digest(os.path.join(GENERATORS_DIR, rel)) == digest
+               for rel, digest in entry.get("inputs", {}).items())
+
+
+def plan_screens(mod, base_out, force=False, optimize=True, overlay=True):
+    """
+    (screen filenames, stale screens, manifest) for a scenario pack.
+    Stale screens are (fname, key); once one is rendered, store
+    {"key": key, **render_screen(...)} in manifest["screens"][fname].
+    """
+    base_out = Path(base_out)
+    manifest = load_manifest(base_out)
+    names = list(mod.SCREEN_GENERATORS)
+    manifest["screens"] = {fname: entry for fname, entry in manifest["screens"].items()
+                           if fname in names}
+    todo = []
+    for fname in names:
+        key = screen_key(mod, fname, optimize, overlay)
+        if force or not _is_current(base_out, manifest["screens"].get(fname), key):
+            todo.append((fname, key))
+    return names, todo, manifest
+
+
+def render_screen(mod, fname, base_out, optimize=True, overlay=True):
+    """
+    Render both variants of a screen into base_out; returns its manifest
+    entry (without the key).
+    """
+    hardware = sys.modules.get("scenarios.base_hardware")
+    if hardware:
+        hardware.take_image_inputs()   # forget reads from outside this screen
+    generate = mod.SCREEN_GENERATORS[fname]
+    neutral_img = generate(hl=False)
+    neutral = save_screen(neutral_img, base_out, f"screens_neutral/{fname}", optimize)
+    highlight = save_highlight(generate(hl=True), neutral_img, base_out, f"screens/{fname}",
+                               optimize, overlay)
+    entry = {"neutral": neutral, "highlight": highlight}
+    hardware = sys.modules.get("scenarios.base_hardware")
+    inputs = hardware.take_image_inputs() if hardware else []
+    if inputs:
+        entry["inputs"] = {os.path.relpath(p, GENERATORS_DIR): _input_digest(p) for p in inputs}
+    return entry
+
+
+def build_screens(mod, base_out, force=False, optimize=True, overlay=True, log=print):
+    """
+    Regenerate the stale screens of a scenario pack in base_out and return
+    the screen filenames. Packs without SCREEN_GENERATORS fall back to
+    their own generate_screens() (always a full, unoptimized rebuild).
+    """
+    base_out = Path(base_out)
+    if not hasattr(mod, "SCREEN_GENERATORS"):
+        return list(mod.generate_screens(base_out / "screens"))
+    names, todo, manifest = plan_screens(mod, base_out, force, optimize, overlay)
+    for fname, key in todo:
+        entry = render_screen(mod, fname, base_out, optimize, overlay)
+        manifest["screens"][fname] = {"key": key, **entry}
+        log(f"  ✓  {fname}" + ("  (highlight overlay)" if "tiles" in entry["highlight"] else ""))
+    save_manifest(base_out, manifest)
+    log(f"  {len(todo)} of {len(names)} screens regenerated"
+        + ("" if todo else " (all up to date)"))
+    return names
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+trainer_server.py — Local build service for UI trainers.
+
+Running ui_trainer.py for every request pays Python/Pillow start-up and
+scenario imports each time. This server keeps that warm in one process:
+scenario modules stay imported and the compiled engine is resolved once at
+start-up. The font registry, text layout and widget sprite caches
+(text_layout.py, scenarios/base.py) stay warm between builds; they are
+size-capped LRU caches, so memory stays bounded however long the server
+runs. Only the source-file digests are dropped before each build, so
+edited files are seen.
+
+  POST /build/<scenario>            build (incrementally) and return JSON
+  POST /build/<scenario>?force=1    redraw every screen
+  GET  /trainer/<scenario>/         the built trainer (and its screens)
+  GET  /trainer/_runtime/<file>     shared engine / runtime / branding files
+  GET  /trainer/                    the scenario selector (if built)
+
+<scenario> is a scenario module name (hazmat) or scenario id (hazmat_gr).
+Concurrent POSTs for a scenario that is already building (with the same
+force flag) wait for that build instead of starting another. Builds run
+one at a time, since they share the caches above. A scenario module (or
+scenarios/base*.py) edited on disk is re-imported before its next build;
+changes to the engine helpers themselves need a restart.
+
+Files are served with strong ETags (304 on If-None-Match). Content-hashed
+files (<name>.<hash>.js, scenario.<hash>.json) are marked immutable, and
+everything else must be revalidated.
+
+Usage:
+    python3 generators/trainer_server.py                    # http://127.0.0.1:8765
+    python3 generators/trainer_server.py --port 9000 --bundle offline --data external
+    curl -X POST http://127.0.0.1:8765/build/hazmat
+"""
+
+import argparse
+import hashlib
+import importlib
+import inspect
+import json
+import mimetypes
+import os
+import re
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import Future
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+sys.path.insert(0, str(Path(__file__).parent))
+import trainer_screens
+from trainer_build import BUNDLES
+from ui_trainer import (DATA_MODES, OUTPUT_ROOT, discover_scenarios, load_scenario,
+                        prepare_runtime, write_trainer)
+
+SCENARIOS_DIR = Path(__file__).parent / "scenarios"
+HASHED_FILE   = re.compile(r"\.[0-9a-f]{12}\.(js|json)$")
+CONTENT_TYPES = {".js": "text/javascript", ".json": "application/json", ".webp": "image/webp"}
+
+
+# ── Builds ────────────────────────────────────────────────────────────────────
+class Builder:
+    """Warm, coalescing scenario builds into output_root."""
+
+    def __init__(self, output_root=OUTPUT_ROOT, bundle="cdn", data="inline",
+                 optimize=True, overlay=True, allow_babel=False):
+        self.output_root = Path(output_root)
+        self.bundle, self.data = bundle, data
+        self.optimize, self.overlay = optimize, overlay
+        self._lock = threading.Lock()        # guards _inflight
+        self._build_lock = threading.Lock()  # one build at a time
+        self._inflight = {}                  # (module name, force) -> Future
+        self._stamps = {}                    # module name -> source mtime at import
+        self.modules = {}                    # module name, short name and id -> module name
+        for module_name in discover_scenarios():
+            mod = load_scenario(module_name)
+            self._stamps[module_name] = self._stamp(mod)
+            self.modules[module_name] = module_name
+            self.modules[module_name.split(".")[-1]] = module_name
+            self.modules[mod.SCENARIO["id"]] = module_name
+        self.runtime = prepare_runtime(self.output_root, bundle, data, allow_babel)
+
+    def resolve(self, name):
+        return self.modules.get(name)
+
+    @staticmethod
+    def _stamp(mod):
+        paths = [inspect.getfile(mod), *SCENARIOS_DIR.glob("base*.py")]
+        return max(os.stat(p).st_mtime_ns for p in paths)
+
+    def _load(self, module_name):
+        """The scenario module, re-imported if it or scenarios/base*.py changed."""
+        mod = load_scenario(module_name)
+        stamp = self._stamp(mod)
+        if stamp != self._stamps.get(module_name):
+            for base_name in ("scenarios.base", "scenarios.base_hardware"):
+                if base_name in sys.modules:
+                    importlib.reload(sys.modules[base_name])
+            mod = importlib.reload(mod)
+            self._stamps[module_name] = stamp
+        return mod
+
+    def _build(self, module_name, force):
+        t0 = time.perf_counter()
+        trainer_screens.clear_digests()
+        mod = self._load(module_name)
+        base_out = self.output_root / mod.SCENARIO["id"]
+        base_out.mkdir(parents=True, exist_ok=True)
+        manifest = None
+        if hasattr(mod, "SCREEN_GENERATORS"):
+            generated, todo, manifest = trainer_screens.plan_screens(
+                mod, base_out, force, self.optimize, self.overlay)
+            for fname, key in todo:
+                entry = trainer_screens.render_screen(mod, fname, base_out,
+                                                      self.optimize, self.overlay)
+                manifest["screens"][fname] = {"key": key, **entry}
+            trainer_screens.save_manifest(base_out, manifest)
+            regenerated = len(todo)
+        else:
+            generated = list(mod.generate_screens(base_out / "screens"))
+            regenerated = len(generated)
+        runtime_scripts, app_script, app_src = self.runtime
+        write_trainer(mod.SCENARIO, generated, base_out, runtime_scripts, app_script,
+                      manifest, app_src)
+        return {
+            "scenario":    module_name,
+            "id":          mod.SCENARIO["id"],
+            "url":         f"/trainer/{mod.SCENARIO['id']}/",
+            "screens":     len(generated),
+            "regenerated": regenerated,
+            "seconds":     round(time.perf_counter() - t0, 3),
+        }
+
+    def build(self, module_name, force=False):
+        """
+        Build a scenario. Returns (result, coalesced): coalesced is True when
+        this call joined a build of the same scenario, with the same force
+        flag, that was already running. A forced request never joins an
+        incremental build.
+        """
+        job = (module_name, bool(force))
+        with self._lock:
+            fut = self._inflight.get(job)
+            coalesced = fut is not None
+            if not coalesced:
+                fut = self._inflight[job] = Future()
+        if coalesced:
+            return fut.result(), True
+        try:
+            with self._build_lock:
+                fut.set_result(self._build(module_name, force))
+        except Exception as e:
+            fut.set_exception(e)
+        finally:
+            with self._lock:
+                del self._inflight[job]
+        return fut.result(), False
+
+
+# ── HTTP ──────────────────────────────────────────────────────────────────────
+_etags = {}   # path -> (mtime_ns, size, ETag); one entry per file served
+
+
+def etag_for(path, st):
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _etags.get(str(path))
+    if cached is not None and cached[:2] == stamp:
+        return cached[2]
+    with open(path, "rb") as f:
+        tag = '"' + hashlib.sha256(f.read()).hexdigest()[:32] + '"'
+    _etags[str(path)] = (*stamp, tag)
+    return tag
+
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = "TrainerBuild/1.0"
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _redirect(self, location):
+        self.send_response(HTTPStatus.MOVED_PERMANENTLY)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        m = re.fullmatch(r"/build/([\w.-]+)/?", url.path)
+        if not m:
+            return self._send_json(HTTPStatus.NOT_FOUND, {"error": "expected POST /build/<scenario>"})
+        builder = self.server.builder
+        module_name = builder.resolve(m.group(1))
+        if module_name is None:
+            return self._send_json(HTTPStatus.NOT_FOUND,
+                                   {"error": f"unknown scenario {m.group(1)!r}"})
+        force = parse_qs(url.query).get("force", ["0"])[0] not in ("0", "", "false")
+        try:
+            result, coalesced = builder.build(module_name, force)
+        except Exception as e:
+            traceback.print_exc()
+            return self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR,
+                                   {"scenario": module_name, "error": f"{type(e).__name__}: {e}"})
+        return self._send_json(HTTPStatus.OK, {**result, "coalesced": coalesced})
+
+    def do_HEAD(self):
+        self.do_GET(head=True)
+
+    def do_GET(self, head=False):
+        path = unquote(urlsplit(self.path).path)
+        if path == "/trainer":
+            return self._redirect("/trainer/")
+        if not path.startswith("/trainer/"):
+            return self._send_json(HTTPStatus.NOT_FOUND, {"error": "expected GET /trainer/<scenario>/"})
+        root = self.server.builder.output_root.resolve()
+        rel = path[len("/trainer/"):]
+        first, _, rest = rel.partition("/")
+        module_name = self.server.builder.resolve(first)
+        if module_name and first != load_scenario(module_name).SCENARIO["id"]:
+            # Module name in place of the scenario id
+            return self._redirect(f"/trainer/{load_scenario(module_name).SCENARIO['id']}/{rest}")
+        target = (root / rel).resolve()
+        if target != root and root not in target.parents:
+            return self._send_json(HTTPStatus.NOT_FOUND, {"error": "not found"})
+        if target.is_dir():
+            if not path.endswith("/"):
+                return self._redirect(path + "/")
+            target = target / "index.html"
+        if not target.is_file():
+            return self._send_json(HTTPStatus.NOT_FOUND, {"error": f"{path} not built "
+                                   f"(POST /build/<scenario> first)"})
+        self._send_file(target, head)
+
+    def _send_file(self, path, head):
+        st = path.stat()
+        tag = etag_for(path, st)
+        cache = "public, max-age=31536000, immutable" if HASHED_FILE.search(path.name) else "no-cache"
+        if tag in [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", tag)
+            self.send_header("Cache-Control", cache)
+            self.end_headers()
+            return
+        ctype = CONTENT_TYPES.get(path.suffix) or mimetypes.guess_type(path.name)[0] \
+            or "application/octet-stream"
+        if ctype.startswith("text/") or ctype.endswith(("json", "html")):
+            ctype += "; charset=utf-8"
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(st.st_size))
+        self.send_header("ETag", tag)
+        self.send_header("Cache-Control", cache)
+        self.end_headers()
+        if not head:
+            with open(path, "rb") as f:
+                self.wfile.write(f.read())
+
+
+# ── Main ──────────────────────────────────────────────────────────────────────
+def main():
+    ap = argparse.ArgumentParser(description="Serve on-demand UI trainer builds over HTTP.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--bundle", choices=BUNDLES, default="cdn",
+                    help="runtime libraries from cdnjs (default) or vendored into _runtime/")
+    ap.add_argument("--data", choices=DATA_MODES, default="inline",
+                    help="scenario data in index.html (default) or a hashed scenario.<hash>.json")
+    ap.add_argument("--no-optimize", dest="optimize", action="store_false",
+                    help="plain PNG screens only (no palette PNG, WebP or downscaled variants)")
+    ap.add_argument("--no-overlay", dest="overlay", action="store_false",
+                    help="store full highlighted screens instead of overlay tiles")
+    ap.add_argument("--allow-babel", action="store_true",
+                    help="without esbuild, compile the engine in the browser with Babel")
+    args = ap.parse_args()
+
+    print("Loading scenario packs …")
+    builder = Builder(OUTPUT_ROOT, args.bundle, args.data, args.optimize, args.overlay,
+                      args.allow_babel)
+    print(f"  {len(set(builder.modules.values()))} scenario packs ready")
+
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    server.daemon_threads = True
+    server.builder = builder
+    print(f"\n✅  Trainer build server on http://{args.host}:{args.port}/")
+    print("   POST /build/<scenario>   GET /trainer/<scenario>/\n")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped.")
+
+
+if __name__ == "__main__":
+    main()
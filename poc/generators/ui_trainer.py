@@ -14,10 +14,23 @@ Usage:
   python3 generators/ui_trainer.py                         # default SE-DC GR
   python3 generators/ui_trainer.py scenarios/pharma_gr     # pharma scenario
   python3 generators/ui_trainer.py scenarios/hazmat_gr     # hazmat scenario
+  python3 generators/ui_trainer.py --bundle offline        # vendor React/three.js, no CDN
+  python3 generators/ui_trainer.py --data external         # scenario data as a cached .json
+  python3 generators/ui_trainer.py --all                   # every scenario pack + index.html
 
-Output:  poc/output/ui_trainer/{scenario_id}/
-  ├── index.html   ← open in any browser, no server needed
-  └── screens/     ← placeholder PNGs (swap with real screenshots)
+Output:  poc/output/ui_trainer/
+  ├── _runtime/trainer_app.<hash>.js  ← compiled engine, shared by all scenarios
+  ├── _runtime/<lib>.<hash>.js        ← vendored React/three.js (--bundle offline)
+  ├── _runtime/branding.<hash>.js     ← branding presets shared by all scenarios
+  └── {scenario_id}/
+      ├── index.html         ← open in any browser, no server needed
+      ├── scenario.<hash>.json  ← scenario data (--data external; needs a web server)
+      ├── screens_neutral/   ← placeholder PNGs (swap with real screenshots)
+      └── screens/           ← highlight overlay tiles (full PNGs with --no-overlay)
+
+The engine (trainer_app.jsx) is compiled ahead of time by trainer_build.py.
+Without esbuild or a cached build, index.html inlines the JSX and compiles it
+in the browser with Babel standalone instead.
 
 Scenario pack contract
 ──────────────────────
@@ -53,9 +66,16 @@ Each scenario is a Python module (in generators/scenarios/) that exports:
 To create a new scenario, copy scenarios/sedc_goods_receipt.py and edit it.
 """
 
-import sys, os, json, importlib
+import sys, os, importlib, argparse, time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+from trainer_build import (BUNDLES, cdn_integrity, compact_json, compile_engine, engine_source,
+                           runtime_pins, runtime_srcs, shared_script, write_atomic,
+                           write_hashed)
+import trainer_screens
+
 
 # ── Resolve scenario module ───────────────────────────────────────────────────
 def load_scenario(module_path: str):
@@ -77,8 +97,10 @@ def load_scenario(module_path: str):
 
 
 # ── React HTML wrapper ────────────────────────────────────────────────────────
-# Loads React 18 + Babel standalone from CDN.
-# Injects scenario data as window globals, then includes the JSX inline.
+# Loads React 18 + three.js (+ Babel standalone when the engine isn't
+# precompiled) from CDN or from the vendored _runtime/ copies.
+# Injects scenario data as window globals (or, with --data external, fetches
+# it from a hashed scenario.<hash>.json), then loads the engine.
 
 REACT_WRAPPER = r"""<!DOCTYPE html>
 <html lang="en">
@@ -86,10 +108,7 @@ REACT_WRAPPER = r"""<!DOCTYPE html>
 <meta charset="UTF-8">
 <meta name="viewport" content="width=device-width, initial-scale=1.0">
 <title>Interactive UI Trainer</title>
-<script src="https://cdnjs.cloudflare.com/ajax/libs/react/18.2.0/umd/react.production.min.js"></script>
-<script src="https://cdnjs.cloudflare.com/ajax/libs/react-dom/18.2.0/umd/react-dom.production.min.js"></script>
-<script src="https://cdnjs.cloudflare.com/ajax/libs/babel-standalone/7.23.9/babel.min.js"></script>
-<script src="https://cdnjs.cloudflare.com/ajax/libs/three.js/r128/three.min.js"></script>
+__DATA_PRELOAD____RUNTIME_SCRIPTS__
 <style>
   *, *::before, *::after { box-sizing: border-box; margin: 0; padding: 0; }
   body { background: #0a0a1a; margin: 0; }
@@ -101,26 +120,324 @@ REACT_WRAPPER = r"""<!DOCTYPE html>
 <div id="root"></div>
 
 <script>
-// ── Scenario data (injected by ui_trainer.py) ──
-window.__SCENARIO__        = __SCENARIO_JSON__;
-window.__SCREENS__         = __SCREENS_JSON__;
-window.__SCREENS_NEUTRAL__ = __SCREENS_NEUTRAL_JSON__;
+__DATA_SCRIPT__
 </script>
 
-<script type="text/babel">
-__JSX_CODE__
-// ── Mount ──
-ReactDOM.createRoot(document.getElementById("root")).render(<App />);
-</script>
+__APP_SCRIPT__
 </body>
 </html>
 """
 
+INLINE_DATA = """// ── Scenario data (injected by ui_trainer.py) ──
+window.__SCENARIO__        = __SCENARIO_JSON__;
+window.__SCREENS__         = __SCREENS_JSON__;
+window.__SCREENS_NEUTRAL__ = __SCREENS_NEUTRAL_JSON__;
+window.__STEP_ASSETS__     = __STEP_ASSETS_JSON__;"""
+
+# --data external: the engine is loaded once the data has arrived
+DATA_PRELOAD = '<link id="trainer-data" rel="preload" as="fetch" crossorigin href="__DATA_SRC__">\n'
+FETCH_DATA = """// ── Scenario data (fetched from scenario.<hash>.json, see ui_trainer.py) ──
+fetch(document.getElementById("trainer-data").href)
+  .then(function (r) { if (!r.ok) throw new Error(r.status + " " + r.url); return r.json(); })
+  .then(function (d) {
+    window.__SCENARIO__        = d.scenario;
+    window.__SCREENS__         = d.screens;
+    window.__SCREENS_NEUTRAL__ = d.screens_neutral;
+    window.__STEP_ASSETS__     = d.step_assets;
+    var app = document.createElement("script");
+    app.src = "__APP_SRC__";
+    document.body.appendChild(app);
+  })
+  .catch(function (e) {
+    document.getElementById("root").textContent = "Could not load scenario data: " + e.message;
+  });"""
+DATA_MODES = ("inline", "external")
+
+SCRIPT_TAG   = '<script src="__SRC__"></script>'
+SRI_TAG      = '<script src="__SRC__" integrity="__SRI__" crossorigin="anonymous"></script>'
+INLINE_APP   = '<script type="text/babel">\n__JSX_CODE__</script>'
+
+
+def script_tags(srcs, prefix="", integrity=None):
+    """
+    <script> tags for absolute URLs or paths relative to output/ui_trainer/.
+    URLs found in `integrity` (URL -> SRI hash) get integrity attributes.
+    """
+    integrity = integrity or {}
+    return "\n".join(
+        SRI_TAG.replace("__SRC__", src).replace("__SRI__", integrity[src]) if src in integrity
+        else SCRIPT_TAG.replace("__SRC__", src if "://" in src else prefix + src)
+        for src in srcs
+    )
+
+
+# ── Build steps ───────────────────────────────────────────────────────────────
+OUTPUT_ROOT = Path(__file__).parent.parent / "output" / "ui_trainer"
+
+
+def branding_presets():
+    """Branding shared by many scenarios, shipped once as _runtime/branding.<hash>.js."""
+    from scenarios.base import SAP_BRANDING
+    from scenarios.base_hardware import HARDWARE_BRANDING
+    return {"sap": SAP_BRANDING, "hardware": HARDWARE_BRANDING}
+
+
+def compact_branding(branding, presets):
+    """
+    {"extends": preset, **overrides} for the preset that branding extends
+    with the fewest overrides, or branding unchanged if it extends none.
+    """
+    best = None
+    for name, preset in presets.items():
+        if not isinstance(branding, dict) or not preset.keys() <= branding.keys():
+            continue
+        overrides = {k: v for k, v in branding.items() if preset.get(k) != v}
+        if best is None or len(overrides) < len(best[1]):
+            best = (name, overrides)
+    return branding if best is None else {"extends": best[0], **best[1]}
+
+
+def prepare_runtime(output_root, bundle, data="inline", allow_babel=False):
+    """
+    Compile the engine and resolve runtime scripts once for every scenario.
+    Returns (runtime <script> tags, app <script>, engine src) for write_trainer();
+    the engine src is only set for data="external", which needs a compiled engine.
+    Without esbuild or a cached engine build this exits, unless allow_babel
+    opts in to compiling the JSX in the learner's browser.
+    """
+    engine_src = compile_engine(output_root)
+    libs = ["react", "react-dom", "three"]
+    if engine_src:
+        print(f"  Engine : {output_root / engine_src}")
+        app_script = script_tags([engine_src], prefix="../")
+    elif not allow_babel:
+        print("\n  ERROR: esbuild not found and no cached engine build.\n"
+              "  Run `npm install --prefix poc` (esbuild is pinned in poc/package.json),\n"
+              "  or pass --allow-babel to compile the engine in the browser instead.")
+        sys.exit(1)
+    else:
+        print("  ⚠  esbuild not found and no cached engine build — "
+              "falling back to in-browser Babel (--allow-babel)")
+        libs.insert(2, "babel")
+        app_script = INLINE_APP.replace("__JSX_CODE__", engine_source())
+    if data == "external" and not engine_src:
+        print("  ⚠  --data external needs the compiled engine — injecting scenario data inline")
+    try:
+        runtime = runtime_srcs(libs, output_root, bundle)
+    except RuntimeError as e:
+        print(f"\n  ERROR: {e}")
+        sys.exit(1)
+    pins = runtime_pins()
+    unpinned = [lib for lib in libs if not pins[lib]]
+    if bundle == "offline":
+        print(f"  Runtime: {', '.join(runtime)}  (vendored)")
+    elif unpinned:
+        print(f"  ⚠  no integrity hash pinned for {', '.join(unpinned)} — "
+              "run `python3 poc/generators/trainer_build.py --pin-runtime`")
+    runtime.append(shared_script("__BRANDING__", branding_presets(), output_root))
+    app_src = f"../{engine_src}" if data == "external" and engine_src else None
+    return script_tags(runtime, prefix="../", integrity=cdn_integrity()), app_script, app_src
+
+
+def write_trainer(scenario, generated, base_out, runtime_scripts, app_script, manifest=None,
+                  app_src=None):
+    """
+    Write <base_out>/index.html for a scenario whose screens are generated.
+    With app_src, scenario data goes to <base_out>/scenario.<hash>.json,
+    which index.html fetches before loading the engine from app_src.
+    """
+    # Build both screen maps (relative paths / WebP srcsets for HTML)
+    screens_hl, screens_neutral = trainer_screens.screen_maps(base_out, generated, manifest)
+    # Per-step download sizes, so the engine can budget its prefetching
+    assets = trainer_screens.step_assets(base_out, scenario["tutorial"], screens_hl, screens_neutral)
+    scenario = {**scenario, "branding": compact_branding(scenario.get("branding"), branding_presets())}
+
+    data_src = None
+    if app_src:
+        payload = {"scenario": scenario, "screens": screens_hl,
+                   "screens_neutral": screens_neutral, "step_assets": assets}
+        data_src = write_hashed(base_out, "scenario.json", compact_json(payload).encode("utf-8"))
+        preload = DATA_PRELOAD.replace("__DATA_SRC__", data_src)
+        data_script = FETCH_DATA.replace("__APP_SRC__", app_src)
+        app_script = ""
+    else:
+        preload = ""
+        data_script = INLINE_DATA.replace(
+            "__SCENARIO_JSON__", compact_json(scenario)
+        ).replace(
+            "__SCREENS_JSON__", compact_json(screens_hl)
+        ).replace(
+            "__SCREENS_NEUTRAL_JSON__", compact_json(screens_neutral)
+        ).replace(
+            "__STEP_ASSETS_JSON__", compact_json(assets)
+        )
+
+    # Build the HTML wrapper with injected data + engine
+    html = REACT_WRAPPER.replace(
+        "__DATA_PRELOAD__", preload
+    ).replace(
+        "__RUNTIME_SCRIPTS__", runtime_scripts
+    ).replace(
+        "__DATA_SCRIPT__", data_script
+    ).replace(
+        "__APP_SCRIPT__", app_script
+    )
+
+    index_path = base_out / "index.html"
+    write_atomic(index_path, html.encode("utf-8"))   # may be served while we build
+    for stale in base_out.glob("scenario.*.json"):
+        if stale.name != data_src:
+            stale.unlink()
+    return index_path
+
+
+# ── Batch build (--all) ───────────────────────────────────────────────────────
+def discover_scenarios():
+    """Dotted module names of every scenario pack in scenarios/."""
+    from validate_scenario_schema import discover_scenario_modules
+    return [f"scenarios.{name}" for name in discover_scenario_modules()]
+
+
+def _render_screen(module_name, fname, base_out, optimize, overlay):
+    """Worker: render one screen (neutral base + highlight) of a scenario pack."""
+    t0 = time.perf_counter()
+    entry = trainer_screens.render_screen(load_scenario(module_name), fname,
+                                          base_out, optimize, overlay)
+    return entry, time.perf_counter() - t0
+
+
+def _generate_screens(module_name, screens_dir):
+    """Worker: run a scenario pack's own generate_screens() (no SCREEN_GENERATORS)."""
+    t0 = time.perf_counter()
+    generated = load_scenario(module_name).generate_screens(Path(screens_dir))
+    return list(generated), time.perf_counter() - t0
+
+
+def build_all(bundle="cdn", workers=None, force=False, optimize=True, overlay=True,
+              data="inline", output_root=OUTPUT_ROOT, allow_babel=False):
+    """
+    Build every scenario pack. Stale screens of all scenarios render as one
+    pool of per-screen tasks, so a large pack doesn't serialize the batch;
+    each index.html is written as soon as its scenario's screens are done.
+    """
+    t_start = time.perf_counter()
+    modules = discover_scenarios()
+    print(f"Building {len(modules)} scenario packs\n")
+    runtime_scripts, app_script, app_src = prepare_runtime(output_root, bundle, data,
+                                                           allow_babel)
+
+    jobs = {}   # module name -> state
+    for module_name in modules:
+        mod = load_scenario(module_name)
+        base_out = output_root / mod.SCENARIO["id"]
+        screens_dir = base_out / "screens"
+        screens_dir.mkdir(parents=True, exist_ok=True)
+        (base_out / "screens_neutral").mkdir(parents=True, exist_ok=True)
+        jobs[module_name] = {"mod": mod, "base_out": base_out, "pending": 0, "rendered": 0,
+                             "cpu": 0.0, "generated": None, "manifest": None, "error": None}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        for module_name, job in jobs.items():
+            mod, base_out = job["mod"], job["base_out"]
+            if hasattr(mod, "SCREEN_GENERATORS"):
+                job["generated"], todo, job["manifest"] = \
+                    trainer_screens.plan_screens(mod, base_out, force, optimize, overlay)
+                for fname, key in todo:
+                    fut = pool.submit(_render_screen, module_name, fname,
+                                      str(base_out), optimize, overlay)
+                    futures[fut] = (module_name, fname, key)
+                    job["pending"] += 1
+            else:
+                fut = pool.submit(_generate_screens, module_name, str(base_out / "screens"))
+                futures[fut] = (module_name, None, None)
+                job["pending"] += 1
+
+        def finish(job):
+            job["done_at"] = time.perf_counter() - t_start
+            sid = job["mod"].SCENARIO["id"]
+            if job["manifest"] is not None:
+                trainer_screens.save_manifest(job["base_out"], job["manifest"])
+            if job["error"]:
+                print(f"  ✗  {sid}: {job['error']}")
+                return
+            write_trainer(job["mod"].SCENARIO, job["generated"], job["base_out"],
+                          runtime_scripts, app_script, job["manifest"], app_src)
+            print(f"  ✓  {sid}  ({job['rendered']} screens regenerated)")
+
+        print()
+        for job in jobs.values():
+            if not job["pending"]:
+                finish(job)
+        for fut in as_completed(futures):
+            module_name, fname, key = futures[fut]
+            job = jobs[module_name]
+            try:
+                result, secs = fut.result()
+            except Exception as e:
+                job["error"] = job["error"] or e
+            else:
+                job["rendered"] += 1
+                job["cpu"] += secs
+                if fname:
+                    job["manifest"]["screens"][fname] = {"key": key, **result}
+                else:
+                    job["generated"] = result
+            job["pending"] -= 1
+            if not job["pending"]:
+                finish(job)
+
+    import generate_index
+    index_path = output_root / "index.html"
+    write_atomic(index_path,
+                 generate_index.generate_html(generate_index.discover_scenarios()).encode("utf-8"))
+
+    print(f"\n  {'Scenario':28s} {'Screens':>7s} {'Redrawn':>7s} {'Render':>8s} {'Done at':>8s}")
+    for job in jobs.values():
+        status = "  FAILED" if job["error"] else ""
+        print(f"  {job['mod'].SCENARIO['id']:28s} {len(job['generated'] or []):7d} "
+              f"{job['rendered']:7d} {job['cpu']:7.2f}s {job['done_at']:7.2f}s{status}")
+    failed = [m for m, job in jobs.items() if job["error"]]
+    print(f"\n{'✗' if failed else '✅'}  {len(jobs) - len(failed)}/{len(jobs)} trainers built "
+          f"in {time.perf_counter() - t_start:.1f}s")
+    print(f"   Index : {index_path}")
+    return not failed
+
 
 # ── Main ──────────────────────────────────────────────────────────────────────
 def main():
+    ap = argparse.ArgumentParser(description="Build an interactive UI trainer from a scenario pack.")
+    ap.add_argument("scenario", nargs="?", default="scenarios.sedc_goods_receipt",
+                    help="scenario module (dotted name or path)")
+    ap.add_argument("--bundle", choices=BUNDLES, default="cdn",
+                    help="cdn: load React/three.js from cdnjs (default); "
+                         "offline: vendor them into output/ui_trainer/_runtime/")
+    ap.add_argument("--all", action="store_true",
+                    help="build every scenario pack in parallel, then regenerate index.html")
+    ap.add_argument("--workers", type=int, default=None,
+                    help="screen-rendering processes for --all (default: CPU count)")
+    ap.add_argument("--force", action="store_true",
+                    help="redraw every screen, ignoring .screens_manifest.json")
+    ap.add_argument("--no-optimize", dest="optimize", action="store_false",
+                    help="plain PNG screens only (no palette PNG, WebP or downscaled variants)")
+    ap.add_argument("--no-overlay", dest="overlay", action="store_false",
+                    help="store full highlighted screens instead of overlay tiles "
+                         "on the neutral base")
+    ap.add_argument("--data", choices=DATA_MODES, default="inline",
+                    help="inline: scenario data in index.html (default); external: a hashed "
+                         "scenario.<hash>.json fetched at startup (serve over HTTP)")
+    ap.add_argument("--allow-babel", action="store_true",
+                    help="without esbuild, inline the JSX and compile it in the browser "
+                         "with Babel standalone (~3 MB per page load) instead of failing")
+    args = ap.parse_args()
+
+    if args.all:
+        sys.exit(0 if build_all(args.bundle, args.workers, args.force, args.optimize,
+                                   args.overlay, args.data,
+                                   allow_babel=args.allow_babel) else 1)
+
     # Resolve scenario
-    scenario_arg = sys.argv[1] if len(sys.argv) > 1 else "scenarios.sedc_goods_receipt"
+    scenario_arg = args.scenario
     print(f"Loading scenario: {scenario_arg}")
     mod = load_scenario(scenario_arg)
 
@@ -132,38 +449,21 @@ def main():
     print(f"  Steps   : {len(scenario['tutorial'])}")
 
     # Output paths
-    base_out    = Path(__file__).parent.parent / "output" / "ui_trainer" / sid
+    base_out    = OUTPUT_ROOT / sid
     screens_dir = base_out / "screens"
     base_out.mkdir(parents=True, exist_ok=True)
 
-    # Generate placeholder screens
+    # Generate placeholder screens (only those whose inputs changed)
     print("\nGenerating placeholder screens …")
-    generated = mod.generate_screens(screens_dir)
-    for fname in generated:
-        print(f"  ✓  {fname}")
-
-    # Build both screen maps (relative paths for HTML)
-    screens_hl      = {fname: f"screens/{fname}" for fname in generated}
-    screens_neutral = {fname: f"screens_neutral/{fname}" for fname in generated}
+    generated = trainer_screens.build_screens(mod, base_out, force=args.force,
+                                              optimize=args.optimize, overlay=args.overlay)
 
-    # Read the React JSX component source
-    jsx_path = Path(__file__).parent / "trainer_app.jsx"
-    jsx_code = jsx_path.read_text(encoding="utf-8")
-    print(f"\n  JSX source: {jsx_path}  ({len(jsx_code)} chars)")
-
-    # Build the HTML wrapper with injected data + JSX
-    html = REACT_WRAPPER.replace(
-        "__SCENARIO_JSON__", json.dumps(scenario, indent=2)
-    ).replace(
-        "__SCREENS_JSON__", json.dumps(screens_hl, indent=2)
-    ).replace(
-        "__SCREENS_NEUTRAL_JSON__", json.dumps(screens_neutral, indent=2)
-    ).replace(
-        "__JSX_CODE__", jsx_code
-    )
-
-    index_path = base_out / "index.html"
-    index_path.write_text(html, encoding="utf-8")
+    # Compile the engine once (shared by every scenario), else inline the JSX
+    print()
+    runtime_scripts, app_script, app_src = prepare_runtime(OUTPUT_ROOT, args.bundle, args.data,
+                                                           args.allow_babel)
+    index_path = write_trainer(scenario, generated, base_out, runtime_scripts, app_script,
+                               app_src=app_src)
 
     print(f"\n✅  Done!  (React version)")
     print(f"   Trainer : {index_path}")
@@ -0,0 +1,273 @@
+"""
+veo_jobs.py — Concurrent, resumable Veo 3 clip generation.
+
+gen_veo_clip() submits one operation and blocks on it, polling for up to
+20 minutes, so a 13-scene render is 13 back-to-back waits. If it crashes
+midway, the paid-for operations are lost. This scheduler:
+
+  • keeps up to `max_concurrent` Veo operations in flight
+  • records every job (operation name, state, attempts) in
+    <workdir>/veo_manifest.json after each transition, so re-running with
+    the same workdir resumes polling instead of resubmitting
+  • backs off globally on 429 quota errors, and resubmits empty results,
+    failed operations and failed downloads up to `retries` times
+  • calls on_clip(i, path) as each clip lands, so callers can overlap
+    compose/TTS work with the generations still outstanding
+
+Backends wrap the provider behind submit / poll / download. GenaiVeo talks
+to google-genai. StubVeo is an offline stand-in that needs only ffmpeg,
+for dry runs.
+
+Usage:
+    from veo_jobs import GenaiVeo, run_veo_jobs
+    paths = run_veo_jobs(GenaiVeo(key, model=VEO_MODEL, aspect=ASPECT, secs=VEO_SECS),
+                         [(scene["id"], scene["video_prompt"]) for scene in scenes],
+                         workdir, max_concurrent=3, on_clip=lambda i, p: ...)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+POLL_SECS = 20
+MAX_POLLS = 60    # per operation: 60 × 20s = 20 min
+MANIFEST  = "veo_manifest.json"
+
+
+# ── Backends ─────────────────────────────────────────────────────────────────
+class GenaiVeo:
+    """google-genai Veo backend. Operations are addressed by name so they survive restarts."""
+
+    def __init__(self, api_key, *, model, aspect, secs):
+        try:
+            from google import genai
+            from google.genai import types
+        except ImportError:
+            print("\n  ERROR: google-genai not installed. Run: pip install google-genai")
+            sys.exit(1)
+        self.client = genai.Client(api_key=api_key)
+        self.types = types
+        self.model, self.aspect, self.secs = model, aspect, secs
+
+    def submit(self, prompt):
+        operation = self.client.models.generate_videos(
+            model=self.model,
+            prompt=prompt,
+            config=self.types.GenerateVideosConfig(
+                aspect_ratio=self.aspect,
+                duration_seconds=self.secs,
+            ),
+        )
+        return operation.name
+
+    def poll(self, name):
+        """(done, error message or None, video handle or None)."""
+        operation = self.client.operations.get(self.types.GenerateVideosOperation(name=name))
+        if not operation.done:
+            return False, None, None
+        if operation.error:
+            return True, getattr(operation.error, "message", None) or str(operation.error), None
+        videos = operation.result.generated_videos if operation.result else []
+        return True, None, (videos[0].video if videos else None)
+
+    def download(self, video, out_mp4):
+        with open(out_mp4, "wb") as f:
+            f.write(bytes(self.client.files.download(file=video)))
+
+
+class StubVeo:
+    """
+    Offline backend: each operation completes after `polls` polls and
+    "downloads" an ffmpeg test pattern with a tone. Prompts listed in
+    `empty` return one empty result first, which exercises the resubmit path.
+    """
+
+    def __init__(self, *, secs=8, polls=2, empty=()):
+        self.secs, self.polls = secs, polls
+        self.empty = set(empty)
+        self._ops = {}   # name -> [prompt, polls so far]
+
+    def submit(self, prompt):
+        name = f"stub/{len(self._ops)}-{hashlib.sha256(prompt.encode()).hexdigest()[:8]}"
+        self._ops[name] = [prompt, 0]
+        return name
+
+    def poll(self, name):
+        op = self._ops.setdefault(name, [None, 0])   # unknown name: a resumed run
+        op[1] += 1
+        if op[1] < self.polls:
+            return False, None, None
+        if op[0] in self.empty:
+            self.empty.discard(op[0])
+            return True, None, None
+        return True, None, name
+
+    def download(self, video, out_mp4):
+        r = subprocess.run([
+            "ffmpeg", "-y", "-v", "error",
+            "-f", "lavfi", "-i", f"testsrc2=s=720x1280:r=24:d={self.secs}",
+            "-f", "lavfi", "-i", f"sine=f=440:d={self.secs}",
+            "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p",
+            "-c:a", "aac", "-shortest", out_mp4,
+        ], capture_output=True, text=True)
+        if r.returncode != 0:
+            raise RuntimeError(f"stub clip failed: {r.stderr[-300:]}")
+
+
+# ── Manifest ─────────────────────────────────────────────────────────────────
+def _prompt_sha(prompt):
+    return hashlib.sha256(prompt.encode()).hexdigest()[:16]
+
+
+def _load_manifest(path):
+    try:
+        return json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return {"jobs": {}}
+
+
+def _save_manifest(path, manifest):
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".json")
+    with os.fdopen(fd, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, path)
+
+
+# ── Scheduler ────────────────────────────────────────────────────────────────
+def run_veo_jobs(backend, jobs, workdir, *, max_concurrent=3, on_clip=None,
+                 poll_secs=POLL_SECS, max_polls=MAX_POLLS, retries=4, sleep=time.sleep):
+    """
+    Generate one clip per (job_id, prompt) into workdir/veo_XX.mp4 and
+    return the paths in job order. Raises RuntimeError listing any job that
+    exhausted its retries (all other clips are kept for the next run).
+    """
+    workdir = Path(workdir)
+    workdir.mkdir(parents=True, exist_ok=True)
+    manifest_path = workdir / MANIFEST
+    manifest = _load_manifest(manifest_path)
+
+    entries = []
+    for i, (job_id, prompt) in enumerate(jobs):
+        entry = manifest["jobs"].get(job_id)
+        sha = _prompt_sha(prompt)
+        if entry is None or entry.get("prompt") != sha:
+            entry = {"prompt": sha, "state": "pending", "operation": None, "attempts": 0}
+        if entry["state"] == "failed":
+            entry.update(state="pending", attempts=0)   # a rerun gets fresh retries
+        entry["file"] = f"veo_{i:02d}.mp4"
+        if entry["state"] == "done" and not (workdir / entry["file"]).exists():
+            entry["state"] = "pending"
+        manifest["jobs"][job_id] = entry
+        entries.append((i, job_id, prompt, entry))
+    _save_manifest(manifest_path, manifest)
+
+    def save():
+        _save_manifest(manifest_path, manifest)
+
+    def landed(i, entry):
+        if on_clip:
+            on_clip(i, str(workdir / entry["file"]))
+
+    def retry(job_id, entry, why):
+        entry["attempts"] += 1
+        entry["operation"] = None
+        if entry["attempts"] >= retries:
+            entry.update(state="failed", error=why)
+            print(f"  ✗  {job_id}: {why} — giving up after {entry['attempts']} attempts")
+        else:
+            entry["state"] = "pending"
+            print(f"  ⚠  {job_id}: {why} — resubmitting ({entry['attempts']}/{retries - 1})")
+
+    resumed = sum(e["state"] == "submitted" for *_, e in entries)
+    if resumed:
+        print(f"  Resuming {resumed} Veo operation(s) from {manifest_path.name}")
+    for i, job_id, _, entry in entries:
+        if entry["state"] == "done":
+            print(f"  ✓  {job_id}: clip already generated")
+            landed(i, entry)
+
+    polls = {}          # job_id -> polls of its current operation (this process)
+    cooldown_until = 0.0
+    quota_hits = 0
+    last_status = None
+    while True:
+        active = [(i, j, p, e) for i, j, p, e in entries if e["state"] == "submitted"]
+        waiting = [(i, j, p, e) for i, j, p, e in entries if e["state"] == "pending"]
+        if not active and not waiting:
+            break
+
+        # Submit within the concurrency budget unless we're cooling down from a 429.
+        if time.monotonic() >= cooldown_until:
+            for i, job_id, prompt, entry in waiting[:max(0, max_concurrent - len(active))]:
+                try:
+                    entry["operation"] = backend.submit(prompt)
+                except Exception as e:
+                    if "429" in str(e):
+                        wait = 300 * (2 ** min(quota_hits, 3))   # 5, 10, 20, 40 min
+                        quota_hits += 1
+                        cooldown_until = time.monotonic() + wait
+                        print(f"  Quota exhausted (429). Holding new submissions for {wait // 60} min …")
+                        break
+                    retry(job_id, entry, f"submit failed: {e}")
+                    save()
+                    continue
+                entry.update(state="submitted", submitted_at=time.time())
+                polls[job_id] = 0
+                active.append((i, job_id, prompt, entry))
+                save()
+
+        for i, job_id, _, entry in active:
+            polls[job_id] = polls.get(job_id, 0) + 1
+            try:
+                done, error, video = backend.poll(entry["operation"])
+            except Exception as e:
+                print(f"  ⚠  {job_id}: poll failed ({e}) — will retry")
+                done, error, video = False, None, None
+            if not done:
+                if polls[job_id] >= max_polls:
+                    retry(job_id, entry, f"timed out after {max_polls * poll_secs // 60} min")
+                    save()
+                continue
+            if error:
+                retry(job_id, entry, f"generation failed: {error}")
+            elif video is None:
+                retry(job_id, entry, "empty result (silent failure)")
+            else:
+                fd, tmp = tempfile.mkstemp(dir=workdir, suffix=".mp4")
+                os.close(fd)
+                try:
+                    backend.download(video, tmp)
+                    os.replace(tmp, workdir / entry["file"])
+                except Exception as e:
+                    retry(job_id, entry, f"download failed: {e}")
+                else:
+                    entry["state"] = "done"
+                    print(f"  ✓  {job_id}: clip ready")
+                    landed(i, entry)
+                finally:
+                    if os.path.exists(tmp):
+                        os.remove(tmp)
+            save()
+
+        counts = {s: sum(e["state"] == s for *_, e in entries)
+                  for s in ("submitted", "pending", "done", "failed")}
+        status = (f"  Veo: {counts['submitted']} running, {counts['pending']} queued, "
+                  f"{counts['done']}/{len(entries)} done")
+        if status != last_status:
+            print(status)
+            last_status = status
+        if counts["submitted"] or counts["pending"]:
+            sleep(poll_secs)
+
+    failed = [job_id for _, job_id, _, e in entries if e["state"] == "failed"]
+    if failed:
+        raise RuntimeError(f"Veo generation failed for: {', '.join(failed)} "
+                           f"(re-run with the same workdir to retry only these)")
+    return [str(workdir / e["file"]) for *_, e in entries]
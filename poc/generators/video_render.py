@@ -4,12 +4,21 @@ Video Renderer — 60-second social media reel from training script.
 
 Renders slide images with Pillow, assembles with ffmpeg concat demuxer.
 Output: 720x1280 MP4 (9:16 vertical, ~60s)
+
+--pipe streams raw RGB frames into ffmpeg's stdin instead (no PNGs on disk),
+animating the progress bar frame by frame.
 """
 
-import os, re, shutil, subprocess
+import os, re, sys, shutil, subprocess, tempfile, threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from PIL import Image, ImageDraw, ImageFont
+from functools import lru_cache
+from PIL import Image, ImageDraw
+
+from text_layout import font
+import render_engine
 
 W, H = 720, 1280
 BG = (15, 23, 42)
@@ -22,7 +31,11 @@ GRAY = (148, 163, 184)
 
 FDIR = "/usr/share/fonts/truetype/google-fonts"
 def ft(name, sz):
-    return ImageFont.truetype(os.path.join(FDIR, name), sz)
+    path = os.path.join(FDIR, name)
+    f = font(path, sz)
+    if getattr(f, "path", None) != path:   # the registry fell back to Pillow's default
+        raise OSError(f"cannot open font {path}")
+    return f
 
 FB = lambda sz: ft("Poppins-Bold.ttf", sz)
 FM = lambda sz: ft("Poppins-Medium.ttf", sz)
@@ -38,6 +51,7 @@ class Slide:
     items: list = field(default_factory=list)
 
 
+@lru_cache(maxsize=None)
 def wrap(text, f, mw):
     words, lines, cur = text.split(), [], ""
     for w in words:
@@ -47,7 +61,7 @@ def wrap(text, f, mw):
             if cur: lines.append(cur)
             cur = w
     if cur: lines.append(cur)
-    return lines
+    return tuple(lines)
 
 
 def badge(d, txt, y, c=BLUE):
@@ -273,12 +287,129 @@ def render(slides, out_path):
     return out_path
 
 
-def main():
-    slides = build_slides()
+# ─── Frame pipe ───
+
+# Slide types whose renderer ignores pct — one frame serves the whole slide.
+STATIC = {"title", "section", "end"}
+
+
+class FrameSource:
+    """
+    Produces raw RGB frames. Each slide is drawn once; animated slides then
+    only repaint the progress bar (pbar covers the whole strip it owns) on a
+    copy of that base image.
+    """
+
+    def __init__(self, slides):
+        self.slides = slides
+        self._bases = {}
+        self._lock = threading.Lock()
+
+    def _base(self, i, pct):
+        with self._lock:
+            base = self._bases.get(i)
+        if base is None:
+            s = self.slides[i]
+            img = RENDERERS.get(s.stype, r_cap)(s, pct)
+            base = img.tobytes() if s.stype in STATIC else img
+            with self._lock:
+                base = self._bases.setdefault(i, base)
+        return base
+
+    def frame(self, i, pct):
+        base = self._base(i, pct)
+        if isinstance(base, bytes):
+            return base
+        img = base.copy()
+        pbar(ImageDraw.Draw(img), pct)
+        return img.tobytes()
+
+
+def render_piped(slides, out_path, fps=12, workers=None, queue_frames=48):
+    """
+    Encode slides by piping rawvideo frames to ffmpeg. Frames are produced by
+    a thread pool; at most queue_frames are in flight, so memory stays bounded
+    (720x1280 RGB is 2.6 MB per frame) while ffmpeg consumes them in order.
+    """
     total = sum(s.dur for s in slides)
-    out = str(Path(__file__).parent.parent / "output" / "training_video_se-dc_buyer.mp4")
-    print(f"📽️  Social Reel: {len(slides)} slides, {total:.0f}s, 720x1280")
-    render(slides, out)
+    source = FrameSource(slides)
+
+    print(f"\n  Rendering {len(slides)} slides ({total:.0f}s) via frame pipe...")
+
+    # Frame boundaries from cumulative time, so rounding never drifts.
+    jobs, elapsed = [], 0.0
+    for i, s in enumerate(slides):
+        first, last = round(elapsed * fps), round((elapsed + s.dur) * fps)
+        jobs.extend((i, f / fps / total) for f in range(first, last))
+        elapsed += s.dur
+        print(f"    {i+1:2d}. [{s.stype:8s}] {s.dur:.1f}s  ({last - first} frames)")
+
+    print(f"  Streaming {len(jobs)} frames @ {fps}fps to ffmpeg...")
+    with tempfile.TemporaryFile() as err:
+        proc = subprocess.Popen([
+            "ffmpeg", "-y", "-v", "error",
+            "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{W}x{H}", "-r", str(fps),
+            "-i", "-",
+            "-c:v", "libx264", "-pix_fmt", "yuv420p",
+            "-preset", "ultrafast", "-crf", "28",
+            "-movflags", "+faststart", out_path,
+        ], stdin=subprocess.PIPE, stderr=err)
+
+        # Any failure (ffmpeg exiting, a frame raising, Ctrl-C) must not leave
+        # ffmpeg running or a truncated out_path behind.
+        ok = False
+        try:
+            broken = False
+            with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 4) as pool:
+                pending = deque()
+                todo = iter(jobs)
+                for job in todo:
+                    pending.append(pool.submit(source.frame, *job))
+                    if len(pending) >= queue_frames:
+                        break
+                try:
+                    while pending:
+                        proc.stdin.write(pending.popleft().result())
+                        nxt = next(todo, None)
+                        if nxt is not None:
+                            pending.append(pool.submit(source.frame, *nxt))
+                except BrokenPipeError:
+                    broken = True
+                finally:
+                    for fut in pending:
+                        fut.cancel()
+            try:
+                proc.stdin.close()
+            except BrokenPipeError:
+                broken = True
+            rc = proc.wait(timeout=60)
+            if rc != 0 or broken:
+                err.seek(0)
+                print(f"  ❌ ffmpeg: {err.read().decode(errors='replace')[-300:]}")
+                return None
+            ok = True
+        finally:
+            if not ok:
+                try:
+                    proc.stdin.close()
+                except OSError:
+                    pass
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
+                try:
+                    os.remove(out_path)
+                except FileNotFoundError:
+                    pass
+
+    mb = os.path.getsize(out_path) / 1048576
+    print(f"  ✅ {out_path} ({mb:.1f} MB, {total:.0f}s)")
+    return out_path
+
+
+def main():
+    # Orchestration (stage DAG, pools, caching, timings) lives in render_engine.
+    render_engine.main(["--style", "reel", *sys.argv[1:]])
 
 if __name__ == "__main__":
     main()
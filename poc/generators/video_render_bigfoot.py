@@ -10,7 +10,8 @@ Uses:
   • DALL-E 3 (1024x1792 portrait) — cinematic Bigfoot scene per slide
   • NumPy — ambient background music (no external dependency)
   • Pillow — text/branding overlay composited on each image
-  • ffmpeg — xfade transitions, audio mix, H.264 assembly
+  • ffmpeg — xfade transitions, audio mix, H.264 assembly (segment-cached,
+             see video_segments.py)
 
 One-time Mac setup:
   brew install ffmpeg
@@ -24,10 +25,17 @@ Output: poc/output/bigfoot_goods_receipt_se-dc.mp4
 Estimated API cost: ~$0.90 per full run (TTS + 15 DALL-E images)
 """
 
-import os, sys, json, time, math, wave, shutil, io, subprocess, tempfile
+import os, sys, json, time, io
 from pathlib import Path
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
-import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+
+from video_segments import build_segmented_video
+import media_probe
+from narration_cache import NARRATION_CACHE
+from ambient_music import AMBIENT_CHORDS, render_ambient
+import render_engine
+import text_layout
+from text_layout import font
 import urllib.request, urllib.error
 
 # ── Config ─────────────────────────────────────────────────────────────────
@@ -40,42 +48,24 @@ TTS_VOICE = "nova"       # alloy | echo | fable | onyx | nova | shimmer
 IMG_SIZE  = "1024x1792"  # DALL-E 3 portrait — matches 9:16 aspect ratio
 IMG_MODEL = "dall-e-3"
 
-FONT_B = None   # resolved at runtime
-FONT_R = None
-
-# Mac font candidates (fallback chain)
-MAC_BOLD = [
+# Fonts (text_layout.font uses the first that exists)
+FONT_B = (
     "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
     "/System/Library/Fonts/Helvetica.ttc",
     "/Library/Fonts/Arial Bold.ttf",
     "/usr/share/fonts/truetype/liberation2/LiberationSans-Bold.ttf",
     "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-]
-MAC_REG = [
+)
+FONT_R = (
     "/System/Library/Fonts/Supplemental/Arial.ttf",
     "/System/Library/Fonts/Helvetica.ttc",
     "/Library/Fonts/Arial.ttf",
     "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
     "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-]
-
-def find_font(candidates):
-    for p in candidates:
-        if os.path.exists(p):
-            return p
-    return None
+)
 
 def fnt(size, bold=False):
-    global FONT_B, FONT_R
-    path = (FONT_B if bold else FONT_R) or find_font(MAC_BOLD if bold else MAC_REG)
-    if bold:
-        FONT_B = path
-    else:
-        FONT_R = path
-    try:
-        return ImageFont.truetype(path, size) if path else ImageFont.load_default()
-    except Exception:
-        return ImageFont.load_default()
+    return font(FONT_B if bold else FONT_R, size)
 
 # ── Colours ─────────────────────────────────────────────────────────────────
 C_WHITE  = (255, 255, 255)
@@ -391,15 +381,18 @@ def oai_post(endpoint, payload, api_key, binary=False, retries=3):
 
 
 def gen_tts(text, out_mp3, api_key, voice=TTS_VOICE):
-    """Generate narration via OpenAI TTS API. Saves to out_mp3."""
-    audio_bytes = oai_post(
-        "audio/speech",
-        {"model": TTS_MODEL, "voice": voice, "input": text},
-        api_key,
-        binary=True,
-    )
-    with open(out_mp3, "wb") as f:
-        f.write(audio_bytes)
+    """Generate narration via OpenAI TTS API (cached). Saves to out_mp3, returns duration."""
+    def synth(path):
+        audio_bytes = oai_post(
+            "audio/speech",
+            {"model": TTS_MODEL, "voice": voice, "input": text},
+            api_key,
+            binary=True,
+        )
+        with open(path, "wb") as f:
+            f.write(audio_bytes)
+    return NARRATION_CACHE.fetch("openai", voice, TTS_MODEL, text, out_mp3,
+                                 synth=synth, probe=media_probe.duration, default=4.0)
 
 
 def gen_dalle(prompt, out_png, api_key):
@@ -443,28 +436,11 @@ def gradient_overlay(draw, top_alpha=180, bottom_alpha=220):
 
 
 def tbbox(draw, text, font):
-    bb = draw.textbbox((0, 0), text, font=font)
-    return bb[2] - bb[0], bb[3] - bb[1]
+    return text_layout.text_size(text, font)
 
 
 def draw_wrapped_centered(draw, text, font, cx, y, max_w, fill, line_gap=8):
-    words = text.split()
-    lines, cur = [], []
-    for w in words:
-        test = " ".join(cur + [w])
-        tw, _ = tbbox(draw, test, font)
-        if tw > max_w and cur:
-            lines.append(" ".join(cur))
-            cur = [w]
-        else:
-            cur.append(w)
-    if cur:
-        lines.append(" ".join(cur))
-    for line in lines:
-        tw, th = tbbox(draw, line, font)
-        draw.text((cx - tw // 2, y), line, font=font, fill=fill)
-        y += th + line_gap
-    return y
+    return text_layout.draw_wrapped(draw, text, font, cx, y, max_w, fill, "center", line_gap)
 
 
 def render_overlay(slide, bg_path, out_png, idx, total):
@@ -638,100 +614,27 @@ def render_overlay(slide, bg_path, out_png, idx, total):
 
 # ── Audio helpers ────────────────────────────────────────────────────────────
 def probe_duration(path):
-    r = subprocess.run(
-        ["ffprobe", "-v", "quiet", "-show_entries", "format=duration", path],
-        capture_output=True, text=True,
-    )
-    for line in r.stdout.splitlines():
-        if line.startswith("duration="):
-            return float(line.split("=")[1])
-    return 4.0
+    return media_probe.duration(path, default=4.0)
 
 
 def gen_music(duration_s, out_wav):
-    """Ambient chord loop — Am F C G, synthesized with numpy."""
-    sr = 44100
-    t = np.linspace(0, duration_s, int(sr * duration_s), endpoint=False)
-    chords = [
-        [110.0, 130.8, 164.8],
-        [87.3,  110.0, 130.8],
-        [130.8, 164.8, 196.0],
-        [98.0,  123.5, 146.8],
-    ]
-    cd = duration_s / len(chords)
-    audio = np.zeros(len(t))
-    for i, freqs in enumerate(chords):
-        s, e = int(i * cd * sr), int((i + 1) * cd * sr)
-        st = t[s:e]
-        for f in freqs:
-            audio[s:e] += np.sin(2 * math.pi * f * st) * 0.055
-            audio[s:e] += np.sin(2 * math.pi * f * 2 * st) * 0.018
-    fade = int(3 * sr)
-    audio[:fade] *= np.linspace(0, 1, fade)
-    audio[-fade:] *= np.linspace(1, 0, fade)
-    audio = audio / (np.max(np.abs(audio)) + 1e-9) * 0.15
-    pcm = (audio * 32767).astype(np.int16)
-    with wave.open(out_wav, "w") as wf:
-        wf.setnchannels(1); wf.setsampwidth(2)
-        wf.setframerate(sr); wf.writeframes(pcm.tobytes())
+    """Ambient chord loop — Am F C G, streamed and cached (see ambient_music.py)."""
+    render_ambient(duration_s, out_wav, chords=AMBIENT_CHORDS, gains=(0.055, 0.018), peak=0.15)
 
 
 # ── Video assembly ───────────────────────────────────────────────────────────
-def build_video(slide_pngs, narr_mp3s, durations, music_wav, output_mp4):
-    n = len(slide_pngs)
-    inputs = []
-    for png, mp3, dur in zip(slide_pngs, narr_mp3s, durations):
-        inputs += ["-loop", "1", "-t", str(dur), "-i", png]
-        inputs += ["-i", mp3]
-
-    music_idx = n * 2
-    vid_idx = [i * 2 for i in range(n)]
-    aud_idx = [i * 2 + 1 for i in range(n)]
-
-    fc = []
-    for i in range(n):
-        fc.append(f"[{vid_idx[i]}:v]scale={W}:{H}:force_original_aspect_ratio=disable,setsar=1[v{i}]")
-
-    # xfade video chain
-    cum = 0.0
-    prev = "v0"
-    for i in range(n - 1):
-        cum += durations[i] - TRANS
-        out = f"xf{i}"
-        fc.append(f"[{prev}][v{i+1}]xfade=transition=fade:duration={TRANS}:offset={cum:.3f}[{out}]")
-        prev = out
-
-    # acrossfade audio chain
-    aprev = f"{aud_idx[0]}:a"
-    for i in range(1, n):
-        aout = f"af{i-1}"
-        fc.append(f"[{aprev}][{aud_idx[i]}:a]acrossfade=d={TRANS}:c1=tri:c2=tri[{aout}]")
-        aprev = aout
-
-    total_dur = sum(durations) - (n - 1) * TRANS
-    fc.append(f"[{music_idx}:a]volume=0.12,atrim=duration={total_dur:.3f}[music]")
-    fc.append(f"[{aprev}][music]amix=inputs=2:duration=first[aout]")
-
-    cmd = (
-        ["ffmpeg", "-y"]
-        + inputs + ["-i", music_wav]
-        + [
-            "-filter_complex", "; ".join(fc),
-            "-map", f"[{prev}]",
-            "-map", "[aout]",
-            "-c:v", "libx264", "-preset", "fast", "-crf", "23",
-            "-pix_fmt", "yuv420p",
-            "-c:a", "aac", "-b:a", "192k",
-            "-r", str(FPS),
-            output_mp4,
-        ]
+def build_video(slide_pngs, narr_audio, durations, music_wav, output_mp4, workers=None):
+    """
+    Assemble via cached per-slide segments (see video_segments.py): only
+    pieces whose slide image or narration changed are re-encoded, then the
+    segments are stream-copied together and mixed with the music.
+    """
+    stats = build_segmented_video(
+        slide_pngs, narr_audio, durations, music_wav, output_mp4,
+        trans=TRANS, fps=FPS, size=(W, H), music_volume=0.12,
+        x264=("-preset", "fast", "-crf", "23"), audio_bitrate="192k", workers=workers,
     )
-    print("  Assembling with ffmpeg …")
-    r = subprocess.run(cmd, capture_output=True, text=True)
-    if r.returncode != 0:
-        print("STDERR:", r.stderr[-2000:])
-        raise RuntimeError("ffmpeg assembly failed")
-
+    print(f"  Segments: {stats['misses']} encoded, {stats['hits']} reused from cache")
 
 # ── Main ─────────────────────────────────────────────────────────────────────
 def load_api_key():
@@ -754,64 +657,9 @@ def load_api_key():
 
 
 def main():
-    api_key = load_api_key()
-    if not api_key:
-        print("ERROR: OPENAI_API_KEY not set.")
-        print("  Set it with:  export OPENAI_API_KEY='sk-...'")
-        print("  Or add it to poc/.env as OPENAI_API_KEY=sk-...")
-        sys.exit(1)
-
-    out_dir = Path(__file__).parent.parent / "output"
-    out_dir.mkdir(parents=True, exist_ok=True)
-    output_mp4 = str(out_dir / "bigfoot_goods_receipt_se-dc.mp4")
-
-    tmp = tempfile.mkdtemp(prefix="ztt_bigfoot_")
-    print(f"Workspace: {tmp}")
-    print(f"Slides: {len(SLIDES)}  |  TTS: {TTS_MODEL}/{TTS_VOICE}  |  Images: {IMG_MODEL}\n")
-
-    total = len(SLIDES)
-    slide_pngs, narr_mp3s, durations = [], [], []
-
-    for i, slide in enumerate(SLIDES):
-        print(f"[{i+1:02d}/{total}] {slide['type']}")
-
-        # 1 — Generate DALL-E scene image
-        raw_png = os.path.join(tmp, f"raw_{i:02d}.png")
-        comp_png = os.path.join(tmp, f"slide_{i:02d}.png")
-        print(f"       DALL-E 3 …", end="", flush=True)
-        gen_dalle(slide["image_prompt"], raw_png, api_key)
-        print(" ✓")
-
-        # 2 — Generate TTS narration
-        mp3_path = os.path.join(tmp, f"narr_{i:02d}.mp3")
-        print(f"       TTS …", end="", flush=True)
-        gen_tts(slide["narration"], mp3_path, api_key)
-        dur = probe_duration(mp3_path) + PAD
-        dur = max(dur, 3.5)
-        durations.append(dur)
-        print(f" ✓  ({dur:.1f}s)")
-
-        # 3 — Render text overlay on image
-        render_overlay(slide, raw_png, comp_png, i, total)
-        slide_pngs.append(comp_png)
-        narr_mp3s.append(mp3_path)
-
-    total_dur = sum(durations) - (len(durations) - 1) * TRANS
-    print(f"\nTotal duration: {total_dur:.1f}s")
-
-    print("Generating background music …")
-    music_wav = os.path.join(tmp, "music.wav")
-    gen_music(total_dur + 4, music_wav)
-
-    print("Assembling video …")
-    build_video(slide_pngs, narr_mp3s, durations, music_wav, output_mp4)
-
-    size_mb = os.path.getsize(output_mp4) / 1e6
-    print(f"\n✅  Done: {output_mp4}")
-    print(f"   {size_mb:.1f} MB  |  {total_dur:.1f}s  |  {W}x{H}  |  {FPS}fps")
-    print(f"\nEstimated API cost: TTS ~${total * 0.02:.2f}  +  Images ~${total * 0.04:.2f}  =  ~${total * 0.06:.2f}")
-
-    shutil.rmtree(tmp, ignore_errors=True)
+    # Orchestration (stage DAG, pools, caching, timings) lives in render_engine.
+    render_engine.main(["--style", "ai-stills", *sys.argv[1:]])
+
 
 
 if __name__ == "__main__":
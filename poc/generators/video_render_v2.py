@@ -2,13 +2,27 @@
 """
 video_render_v2.py — Enhanced social media training video
 Features: flite narration, xfade transitions, ambient music, improved slide design
+          segment-cached assembly (re-rendering re-encodes only changed slides)
 Output:  720x1280 vertical reel, ~60-70s, H.264
+
+Slides (Pillow, process pool) and narration (flite subprocesses, bounded
+thread pool) are produced concurrently; --workers caps both pools.
+
+Usage:
+  python3 video_render_v2.py               # workers = CPU count
+  python3 video_render_v2.py --workers 4
 """
 
-import os, sys, subprocess, tempfile, wave, struct, math, shutil
-from pathlib import Path
-from PIL import Image, ImageDraw, ImageFont
-import numpy as np
+import os, sys, subprocess
+from PIL import Image, ImageDraw
+
+from video_segments import build_segmented_video
+import media_probe
+from narration_cache import NARRATION_CACHE
+from ambient_music import AMBIENT_CHORDS, render_ambient
+import text_layout
+from text_layout import font
+import render_engine
 
 # ── Constants ─────────────────────────────────────────────────────────────────
 W, H     = 720, 1280
@@ -144,44 +158,16 @@ SLIDES = [
 
 # ── Font helpers ──────────────────────────────────────────────────────────────
 def fnt(size, bold=False):
-    path = FONT_B if bold else FONT_R
-    try:
-        return ImageFont.truetype(path, size)
-    except Exception:
-        return ImageFont.load_default()
+    return font(FONT_B if bold else FONT_R, size)
 
 def text_bbox(draw, text, font):
-    bb = draw.textbbox((0, 0), text, font=font)
-    return bb[2] - bb[0], bb[3] - bb[1]
+    return text_layout.text_size(text, font)
 
 def wrap_text(text, font, max_w, draw):
-    words = text.split()
-    lines, cur = [], []
-    for w in words:
-        test = " ".join(cur + [w])
-        tw, _ = text_bbox(draw, test, font)
-        if tw > max_w and cur:
-            lines.append(" ".join(cur))
-            cur = [w]
-        else:
-            cur.append(w)
-    if cur:
-        lines.append(" ".join(cur))
-    return lines
+    return list(text_layout.wrap_text(text, font, max_w))
 
 def draw_wrapped(draw, text, font, cx, y, max_w, fill, align="center", line_gap=8):
-    lines = wrap_text(text, font, max_w, draw)
-    for line in lines:
-        tw, th = text_bbox(draw, line, font)
-        if align == "center":
-            x = cx - tw // 2
-        elif align == "left":
-            x = cx
-        else:
-            x = cx - tw
-        draw.text((x, y), line, font=font, fill=fill)
-        y += th + line_gap
-    return y
+    return text_layout.draw_wrapped(draw, text, font, cx, y, max_w, fill, align, line_gap)
 
 def progress_bar(draw, idx, total):
     """Dots at top showing slide progress."""
@@ -480,8 +466,8 @@ RENDERERS = {
 }
 
 # ── Narration helpers ─────────────────────────────────────────────────────────
-def gen_narration(text, out_wav, voice="slt"):
-    """Generate narration using ffmpeg's libflite TTS. Returns duration in seconds.
+def _flite(text, out_wav, voice):
+    """Synthesize with ffmpeg's libflite TTS.
     Uses textfile= to avoid filter-string parsing issues with colons and special chars."""
     # Write text to a temp file — avoids ALL ffmpeg filter escaping issues
     txt_path = out_wav + ".txt"
@@ -494,191 +480,49 @@ def gen_narration(text, out_wav, voice="slt"):
         out_wav
     ]
     r = subprocess.run(cmd, capture_output=True)
+    os.remove(txt_path)
     if r.returncode != 0:
         raise RuntimeError(f"flite failed: {r.stderr.decode()[:400]}")
-    return probe_duration(out_wav)
+
+def gen_narration(text, out_wav, voice="slt"):
+    """Generate narration (cached by voice + text). Returns duration in seconds."""
+    return NARRATION_CACHE.fetch("flite", voice, "libflite", text, out_wav,
+                                 synth=lambda p: _flite(text, p, voice),
+                                 probe=media_probe.duration, default=4.0)
 
 def probe_duration(path):
-    r = subprocess.run(
-        ["ffprobe", "-v", "quiet", "-show_entries", "format=duration", path],
-        capture_output=True, text=True
-    )
-    for line in r.stdout.splitlines():
-        if line.startswith("duration="):
-            return float(line.split("=")[1])
-    return 4.0
+    return media_probe.duration(path, default=4.0)
 
 # ── Background music ──────────────────────────────────────────────────────────
 def gen_music(duration_s, out_wav):
-    sr = 44100
-    t = np.linspace(0, duration_s, int(sr * duration_s), endpoint=False)
-
-    # Am  F  C  G chord loop
-    chords = [
-        [110.0, 130.8, 164.8],   # Am (lower octave — warmer)
-        [87.3,  110.0, 130.8],   # F
-        [130.8, 164.8, 196.0],   # C
-        [98.0,  123.5, 146.8],   # G
-    ]
-    cd = duration_s / len(chords)
-    audio = np.zeros(len(t))
-    for i, freqs in enumerate(chords):
-        s, e = int(i * cd * sr), int((i + 1) * cd * sr)
-        st = t[s:e]
-        for f in freqs:
-            sig = np.sin(2 * math.pi * f * st) * 0.06
-            sig += np.sin(2 * math.pi * f * 2 * st) * 0.02
-            audio[s:e] += sig
-
-    # Slow attack / fade-out
-    fade = int(3 * sr)
-    audio[:fade] *= np.linspace(0, 1, fade)
-    audio[-fade:] *= np.linspace(1, 0, fade)
-
-    # Normalise to 20% of full scale (background feel)
-    peak = np.max(np.abs(audio)) + 1e-9
-    audio = audio / peak * 0.18
-    pcm = (audio * 32767).astype(np.int16)
-
-    with wave.open(out_wav, "w") as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(sr)
-        wf.writeframes(pcm.tobytes())
+    """Am F C G chord loop, normalised to 18% of full scale (background feel)."""
+    render_ambient(duration_s, out_wav, chords=AMBIENT_CHORDS, gains=(0.06, 0.02), peak=0.18)
 
 # ── Video builder ─────────────────────────────────────────────────────────────
-def build_video(slide_pngs, narr_wavs, durations, music_wav, output_mp4):
-    n = len(slide_pngs)
-    assert n == len(narr_wavs) == len(durations)
-
-    # Build inputs
-    inputs = []
-    for png, wav in zip(slide_pngs, narr_wavs):
-        inputs += ["-loop", "1", "-t", str(durations[0]), "-i", png]  # placeholder dur
-    # Fix: use actual durations per input
-    inputs = []
-    for i, (png, wav, dur) in enumerate(zip(slide_pngs, narr_wavs, durations)):
-        inputs += ["-loop", "1", "-t", str(dur), "-i", png]
-        inputs += ["-i", wav]
-
-    # Build filter_complex
-    # Video inputs are at indices 0, 2, 4, ...  (even)
-    # Audio inputs are at indices 1, 3, 5, ...  (odd)
-    vid_idx = [i * 2     for i in range(n)]
-    aud_idx = [i * 2 + 1 for i in range(n)]
-    music_idx = n * 2   # last input
-
-    # Scale each video to exact size
-    fc = []
-    for i in range(n):
-        fc.append(f"[{vid_idx[i]}:v]scale={W}:{H}:force_original_aspect_ratio=disable,setsar=1[v{i}]")
-
-    # xfade video chain
-    offsets, cum = [], 0.0
-    for i in range(n - 1):
-        cum += durations[i] - TRANS
-        offsets.append(cum)
-
-    prev = "v0"
-    for i in range(n - 1):
-        nxt = f"v{i+1}"
-        out = f"xf{i}"
-        fc.append(f"[{prev}][{nxt}]xfade=transition=fade:duration={TRANS}:offset={offsets[i]:.3f}[{out}]")
-        prev = out
-    video_out = prev  # final video label
-
-    # acrossfade audio chain
-    aprev = f"{aud_idx[0]}:a"
-    for i in range(1, n):
-        anxt = f"{aud_idx[i]}:a"
-        aout = f"af{i-1}"
-        fc.append(f"[{aprev}][{anxt}]acrossfade=d={TRANS}:c1=tri:c2=tri[{aout}]")
-        aprev = aout
-    audio_narr_out = aprev  # final narration audio label
-
-    # Mix narration + background music
-    total_dur = sum(durations) - (n - 1) * TRANS
-    fc.append(f"[{music_idx}:a]volume=0.15,atrim=duration={total_dur:.3f}[music_trim]")
-    fc.append(f"[{audio_narr_out}][music_trim]amix=inputs=2:duration=first[aout]")
-
-    fc_str = "; ".join(fc)
-
-    cmd = (
-        ["ffmpeg", "-y"]
-        + inputs
-        + ["-i", music_wav]
-        + [
-            "-filter_complex", fc_str,
-            "-map", f"[{video_out}]",
-            "-map", "[aout]",
-            "-c:v", "libx264",
-            "-preset", "ultrafast",
-            "-crf", "28",
-            "-pix_fmt", "yuv420p",
-            "-c:a", "aac",
-            "-b:a", "128k",
-            "-r", str(FPS),
-            output_mp4,
-        ]
+def build_video(slide_pngs, narr_audio, durations, music_wav, output_mp4, workers=None):
+    """
+    Assemble via cached per-slide segments (see video_segments.py): only
+    pieces whose slide image or narration changed are re-encoded, then the
+    segments are stream-copied together and mixed with the music.
+    """
+    stats = build_segmented_video(
+        slide_pngs, narr_audio, durations, music_wav, output_mp4,
+        trans=TRANS, fps=FPS, size=(W, H), music_volume=0.15,
+        x264=("-preset", "ultrafast", "-crf", "28"), audio_bitrate="128k", workers=workers,
     )
-    print("Running ffmpeg …")
-    r = subprocess.run(cmd, capture_output=True, text=True)
-    if r.returncode != 0:
-        print("STDERR:", r.stderr[-1500:])
-        raise RuntimeError("ffmpeg failed")
-    print("ffmpeg done.")
+    print(f"  Segments: {stats['misses']} encoded, {stats['hits']} reused from cache")
+
+# ── Parallel asset stage ──────────────────────────────────────────────────────
+def render_slide_png(slide, idx, total, png_path):
+    """Process-pool worker: render one slide and save it. Module-level so it pickles."""
+    renderer = RENDERERS.get(slide["type"], render_title)
+    renderer(slide, idx, total).save(png_path, "PNG")
+    return png_path
 
 # ── Main ──────────────────────────────────────────────────────────────────────
 def main():
-    out_dir = Path(__file__).parent.parent / "output"
-    out_dir.mkdir(parents=True, exist_ok=True)
-    output_mp4 = str(out_dir / "training_video_v2_se-dc.mp4")
-
-    tmp = tempfile.mkdtemp(prefix="ztt_v2_")
-    print(f"Working in {tmp}")
-
-    total = len(SLIDES)
-    slide_pngs, narr_wavs, durations = [], [], []
-
-    print("Generating narration + slides …")
-    for i, slide in enumerate(SLIDES):
-        print(f"  [{i+1}/{total}] {slide['type']} …", end="", flush=True)
-
-        # Narration
-        wav_path = os.path.join(tmp, f"narr_{i:02d}.wav")
-        dur = gen_narration(slide["narration"], wav_path) + PAD
-        dur = max(dur, 3.0)  # minimum 3 seconds per slide
-        durations.append(dur)
-
-        # Slide PNG
-        png_path = os.path.join(tmp, f"slide_{i:02d}.png")
-        renderer = RENDERERS.get(slide["type"], render_title)
-        img = renderer(slide, i, total)
-        img.save(png_path, "PNG")
-
-        slide_pngs.append(png_path)
-        narr_wavs.append(wav_path)
-        print(f" {dur:.1f}s")
-
-    total_dur = sum(durations) - (len(durations) - 1) * TRANS
-    print(f"\nTotal video duration: {total_dur:.1f}s")
-
-    # Background music
-    print("Generating background music …")
-    music_wav = os.path.join(tmp, "music.wav")
-    gen_music(total_dur + 4, music_wav)
-
-    # Assemble
-    print("Assembling video …")
-    build_video(slide_pngs, narr_wavs, durations, music_wav, output_mp4)
-
-    # Stats
-    size_mb = os.path.getsize(output_mp4) / 1e6
-    print(f"\n✅  Output: {output_mp4}")
-    print(f"   Size:   {size_mb:.1f} MB")
-    print(f"   Duration: {total_dur:.1f}s  |  {total} slides  |  {FPS}fps  |  {W}x{H}")
-
-    shutil.rmtree(tmp, ignore_errors=True)
+    # Orchestration (stage DAG, pools, caching, timings) lives in render_engine.
+    render_engine.main(["--style", "slides", *sys.argv[1:]])
 
 if __name__ == "__main__":
     main()
@@ -15,18 +15,24 @@ One-time Mac setup:
   pip install google-genai openai
 
 Usage:
-  python3 video_render_veo3.py
+  python3 video_render_veo3.py [--concurrency 3] [--workdir DIR] [--stub]
   # Keys auto-loaded from poc/.env: GOOGLE_API_KEY + OPENAI_API_KEY
+  # Veo jobs run concurrently (see veo_jobs.py); after a crash, re-run with the
+  # printed --workdir to resume polling the submitted operations.
 
 Output:    poc/output/bigfoot_goods_receipt_veo3.mp4
 Cost est:  13 clips × 8s × $0.40/s = ~$41.60  (Veo 3 Standard)
            13 clips × 8s × $0.15/s = ~$15.60  (Veo 3 Fast — change VEO_MODEL)
 """
 
-import os, sys, time, wave, math, shutil, subprocess, tempfile
+import os, sys, time, wave, math, subprocess, tempfile
 from pathlib import Path
 import urllib.request, urllib.error, json
 
+from narration_cache import NARRATION_CACHE
+import media_probe
+import render_engine
+
 # ── Config ───────────────────────────────────────────────────────────────────
 VEO_MODEL  = "veo-3.0-fast-generate-001"   # Fast tier: ~60% cheaper ($0.15/s vs $0.40/s)
 VEO_SECS   = 8                             # 4, 6, or 8
@@ -38,13 +44,13 @@ MAX_POLLS  = 60                            # 60 × 20s = 20 min max wait per cli
 
 # ── Character cast & scenes ──────────────────────────────────────────────────
 # Casts and scene template are defined in video_casts.py. The cast selection
-# happens in main() via --cast, defaulting to "bigfoot" for backward compatibility.
+# happens in render_engine's ai-video backend via --cast, defaulting to "bigfoot" for backward compatibility.
 # DAVE/SANDRA/MARCUS/KEISHA/SCENES below are the BIGFOOT cast bindings, kept at
 # module level so video_render_veo3_poc.py and video_render_veo3_resume.py keep
 # importing them by name without changes.
 from video_casts import (
-    CAST_BIGFOOT, CAST_HUMAN, CASTS,
-    get_cast, build_scenes, build_poc_scenes,
+    CAST_BIGFOOT, CAST_HUMAN,
+    build_scenes, build_poc_scenes,
     POC_SCENE_IDS,
 )
 
@@ -149,8 +155,7 @@ def gen_veo_clip(prompt, out_mp4, google_api_key, retries=4):
 
 
 # ── OpenAI TTS ────────────────────────────────────────────────────────────────
-def gen_tts(text, out_mp3, openai_api_key):
-    """Generate narration via OpenAI TTS API."""
+def _openai_tts(text, out_mp3, openai_api_key):
     url = "https://api.openai.com/v1/audio/speech"
     payload = json.dumps({"model": TTS_MODEL, "voice": TTS_VOICE, "input": text}).encode()
     req = urllib.request.Request(
@@ -179,33 +184,55 @@ def gen_tts(text, out_mp3, openai_api_key):
     raise RuntimeError("TTS failed after retries")
 
 
+def gen_tts(text, out_mp3, openai_api_key):
+    """Generate narration via OpenAI TTS API (cached). Returns duration in seconds."""
+    return NARRATION_CACHE.fetch("openai", TTS_VOICE, TTS_MODEL, text, out_mp3,
+                                 synth=lambda p: _openai_tts(text, p, openai_api_key),
+                                 probe=media_probe.duration, default=VEO_SECS)
+
+
 # ── Audio/video helpers ───────────────────────────────────────────────────────
 def probe_duration(path):
+    return media_probe.duration(path, default=VEO_SECS)
+
+
+# Every composed scene shares these parameters exactly, so concat_scenes can
+# join them with the concat demuxer and -c copy instead of re-encoding.
+SCENE_VIDEO = ["-c:v", "libx264", "-preset", "fast", "-crf", "23", "-profile:v", "high",
+               "-pix_fmt", "yuv420p", "-r", "24", "-video_track_timescale", "12288"]
+SCENE_AUDIO = ["-c:a", "aac", "-b:a", "192k", "-ar", "48000", "-ac", "2"]
+
+
+def _ffprobe_streams(path):
     r = subprocess.run(
-        ["ffprobe", "-v", "quiet", "-show_entries", "format=duration", path],
+        ["ffprobe", "-v", "error", "-show_entries",
+         "stream=codec_type,codec_name,profile,width,height,pix_fmt,r_frame_rate,"
+         "time_base,sample_rate,channels",
+         "-of", "json", path],
         capture_output=True, text=True,
     )
-    for line in r.stdout.splitlines():
-        if line.startswith("duration="):
-            return float(line.split("=")[1])
-    return float(VEO_SECS)
+    if r.returncode != 0:
+        return None
+    return json.loads(r.stdout).get("streams", [])
 
 
 def compose_scene(veo_mp4, out_mp4):
     """
     Transcode Veo clip preserving its native audio (lip-synced to video).
     Veo 3 generates speech + ambient audio together with the video — keep it.
+    Clips without audio get a silent track so every scene has the same layout.
     """
-    cmd = [
-        "ffmpeg", "-y",
-        "-i", veo_mp4,
-        "-map", "0:v",    # video stream
-        "-map", "0:a?",   # native Veo audio (? = skip gracefully if absent)
+    streams = _ffprobe_streams(veo_mp4) or []
+    has_audio = any(st.get("codec_type") == "audio" for st in streams)
+    cmd = ["ffmpeg", "-y", "-i", veo_mp4]
+    if not has_audio:
+        cmd += ["-f", "lavfi", "-i", "anullsrc=r=48000:cl=stereo", "-shortest"]
+    cmd += [
+        "-map", "0:v",                             # video stream
+        "-map", "0:a" if has_audio else "1:a",     # native Veo audio (or silence)
         "-vf", "scale=720:1280:force_original_aspect_ratio=disable,setsar=1",
-        "-c:v", "libx264", "-preset", "fast", "-crf", "23",
-        "-pix_fmt", "yuv420p",
-        "-c:a", "aac", "-b:a", "192k",
-        "-r", "24",
+        *SCENE_VIDEO,
+        *SCENE_AUDIO,
         out_mp4,
     ]
     r = subprocess.run(cmd, capture_output=True, text=True)
@@ -214,8 +241,43 @@ def compose_scene(veo_mp4, out_mp4):
         raise RuntimeError(f"compose_scene failed for {out_mp4}")
 
 
+def _concat_copy(scene_mp4s, output_mp4):
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write("".join(f"file '{os.path.abspath(p)}'\n" for p in scene_mp4s))
+        list_txt = f.name
+    try:
+        r = subprocess.run(
+            ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", list_txt,
+             "-map", "0:v", "-map", "0:a", "-c", "copy",
+             "-movflags", "+faststart", output_mp4],
+            capture_output=True, text=True,
+        )
+    finally:
+        os.remove(list_txt)
+    return r
+
+
 def concat_scenes(scene_mp4s, output_mp4):
-    """Concatenate all composed scene files into the final video."""
+    """
+    Concatenate all composed scene files into the final video.
+
+    Scenes from compose_scene share identical codec parameters, so they are
+    stream-copied through the concat demuxer (no second encode). The concat
+    filter re-encode is the fallback for inputs whose parameters differ.
+    """
+    signatures = [_ffprobe_streams(s) for s in scene_mp4s]
+    uniform = (signatures[0] is not None
+               and all(sig == signatures[0] for sig in signatures)
+               and {st.get("codec_type") for st in signatures[0]} == {"video", "audio"})
+    if uniform:
+        print("  Concatenating scenes (stream copy) …")
+        r = _concat_copy(scene_mp4s, output_mp4)
+        if r.returncode == 0:
+            return
+        print("  ⚠  stream-copy concat failed — re-encoding instead")
+    else:
+        print("  ⚠  scenes have mismatched stream parameters — re-encoding")
+
     n = len(scene_mp4s)
     inputs = []
     for s in scene_mp4s:
@@ -245,73 +307,9 @@ def concat_scenes(scene_mp4s, output_mp4):
 
 # ── Main ──────────────────────────────────────────────────────────────────────
 def main():
-    import argparse
-    ap = argparse.ArgumentParser(
-        description="Veo 3 Goods Receipt video. Default cast: bigfoot."
-    )
-    ap.add_argument(
-        "--cast",
-        default="bigfoot",
-        choices=sorted(CASTS.keys()),
-        help="Character cast to render with (default: bigfoot)",
-    )
-    args = ap.parse_args()
-
-    cast = get_cast(args.cast)
-    scenes = build_scenes(cast)
-
-    keys = load_keys()
-    missing = [k for k, v in keys.items() if not v]
-    if missing:
-        for k in missing:
-            print(f"ERROR: {k} not set.")
-            print(f"  Add it to poc/.env as {k}=...")
-        sys.exit(1)
-
-    google_key  = keys["GOOGLE_API_KEY"]
-    openai_key  = keys["OPENAI_API_KEY"]
-
-    out_dir = Path(__file__).parent.parent / "output"
-    out_dir.mkdir(parents=True, exist_ok=True)
-    output_mp4 = str(out_dir / f"goods_receipt_veo3_{cast.name}.mp4")
-
-    tmp = tempfile.mkdtemp(prefix=f"ztt_veo3_{cast.name}_")
-    print(f"Cast      : {cast.label}")
-    print(f"Workspace : {tmp}")
-    print(f"Scenes    : {len(scenes)}")
-    print(f"Veo model : {VEO_MODEL}  ({VEO_SECS}s clips, {ASPECT})")
-    print(f"Audio     : Veo 3 native (lip-synced, no TTS)")
-    veo_cost = len(scenes) * VEO_SECS * (0.15 if "fast" in VEO_MODEL else 0.40)
-    print(f"Est. cost : ~${veo_cost:.2f}\n")
-
-    total      = len(scenes)
-    scene_mp4s = []
-
-    for i, scene in enumerate(scenes):
-        print(f"[{i+1:02d}/{total}] {scene['id']}")
-
-        veo_mp4  = os.path.join(tmp, f"veo_{i:02d}.mp4")
-        comp_mp4 = os.path.join(tmp, f"scene_{i:02d}.mp4")
-
-        # 1 — Generate Veo clip
-        print(f"       Veo 3 generating (video + audio) …", end="", flush=True)
-        gen_veo_clip(scene["video_prompt"], veo_mp4, google_key)
-        print(f" ✓  ({VEO_SECS}s clip)")
-
-        # 2 — Compose: transcode + preserve native Veo audio (lip-synced)
-        compose_scene(veo_mp4, comp_mp4)
-        scene_mp4s.append(comp_mp4)
-
-    # Final assembly
-    concat_scenes(scene_mp4s, output_mp4)
-
-    size_mb   = os.path.getsize(output_mp4) / 1e6
-    total_dur = sum(probe_duration(s) for s in scene_mp4s)
-    print(f"\n✅  Done: {output_mp4}")
-    print(f"   {size_mb:.1f} MB  |  ~{total_dur:.0f}s total  |  720×1280  |  24fps")
-    print(f"\nActual API cost: ~${veo_cost:.2f} Veo  (native audio — no TTS charge)")
+    # Orchestration (stage DAG, pools, caching, timings) lives in render_engine.
+    render_engine.main(["--style", "ai-video", *sys.argv[1:]])
 
-    shutil.rmtree(tmp, ignore_errors=True)
 
 
 if __name__ == "__main__":
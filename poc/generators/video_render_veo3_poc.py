@@ -20,83 +20,21 @@ Output: poc/output/goods_receipt_poc_<cast>.mp4
 Run:
   python3 poc/generators/video_render_veo3_poc.py                 # bigfoot
   python3 poc/generators/video_render_veo3_poc.py --cast human    # human cast
+  python3 poc/generators/video_render_veo3_poc.py --workdir /tmp/poc   # resumable
+  python3 poc/generators/video_render_veo3_poc.py --stub          # offline dry run
 """
 
-import sys, os
+import sys
 from pathlib import Path
-import tempfile, shutil
-import argparse
 
 sys.path.insert(0, str(Path(__file__).parent))
-from video_render_veo3 import (
-    VEO_MODEL, VEO_SECS, ASPECT,
-    load_keys, gen_veo_clip,
-    compose_scene, concat_scenes, probe_duration,
-)
-from video_casts import CASTS, get_cast, build_poc_scenes
+import render_engine
 
 
 def main():
-    ap = argparse.ArgumentParser(
-        description="3-scene POC cut of the Goods Receipt video. ~$3.60 per run."
-    )
-    ap.add_argument(
-        "--cast",
-        default="bigfoot",
-        choices=sorted(CASTS.keys()),
-        help="Character cast to render with (default: bigfoot)",
-    )
-    args = ap.parse_args()
+    # Orchestration (stage DAG, pools, caching, timings) lives in render_engine.
+    render_engine.main(["--style", "ai-video", "--poc", *sys.argv[1:]])
 
-    cast = get_cast(args.cast)
-    poc_scenes = build_poc_scenes(cast)
-
-    keys = load_keys()
-    if not keys.get("GOOGLE_API_KEY"):
-        print("ERROR: GOOGLE_API_KEY not set. Add it to poc/.env")
-        sys.exit(1)
-
-    google_key = keys["GOOGLE_API_KEY"]
-
-    out_dir = Path(__file__).parent.parent / "output"
-    out_dir.mkdir(parents=True, exist_ok=True)
-    output_mp4 = str(out_dir / f"goods_receipt_poc_{cast.name}.mp4")
-
-    tmp   = tempfile.mkdtemp(prefix=f"ztt_poc_{cast.name}_")
-    total = len(poc_scenes)
-    veo_cost = total * VEO_SECS * (0.15 if "fast" in VEO_MODEL else 0.40)
-
-    print(f"Cast      : {cast.label}")
-    print(f"Workspace : {tmp}")
-    print(f"Scenes    : {total}  (POC — intro + 101 lesson + outro)")
-    print(f"Veo model : {VEO_MODEL}  ({VEO_SECS}s clips, {ASPECT})")
-    print(f"Audio     : Veo 3 native (lip-synced, no TTS)")
-    print(f"Est. cost : ~${veo_cost:.2f}\n")
-
-    scene_mp4s = []
-
-    for i, scene in enumerate(poc_scenes):
-        print(f"[{i+1:02d}/{total}] {scene['id']}  [{scene['character']}]")
-
-        veo_mp4  = os.path.join(tmp, f"veo_{i:02d}.mp4")
-        comp_mp4 = os.path.join(tmp, f"scene_{i:02d}.mp4")
-
-        print(f"       Veo 3 generating (video + audio) …", end="", flush=True)
-        gen_veo_clip(scene["video_prompt"], veo_mp4, google_key)
-        print(f" ✓  ({VEO_SECS}s clip)")
-
-        compose_scene(veo_mp4, comp_mp4)
-        scene_mp4s.append(comp_mp4)
-
-    concat_scenes(scene_mp4s, output_mp4)
-
-    size_mb   = os.path.getsize(output_mp4) / 1e6
-    total_dur = sum(probe_duration(s) for s in scene_mp4s)
-    print(f"\n✅  Done: {output_mp4}")
-    print(f"   {size_mb:.1f} MB  |  ~{total_dur:.0f}s total  |  9:16 portrait")
-    print(f"   Cost: ~${veo_cost:.2f}  (Veo native audio — no TTS charge)")
-
-    shutil.rmtree(tmp, ignore_errors=True)
 
 
 if __name__ == "__main__":
@@ -7,6 +7,10 @@ composed scene_XX.mp4, generates the rest, then concatenates everything.
 
 Usage:
   python3 generators/video_render_veo3_resume.py /path/to/ztt_veo3_XXXXX
+
+Runs started by the current video_render_veo3.py keep a veo_manifest.json in
+their workspace; resume those with `video_render_veo3.py --workdir DIR`
+instead, which re-polls in-flight Veo operations rather than resubmitting.
 """
 
 import os, sys, time, shutil, subprocess
@@ -20,6 +24,7 @@ from video_render_veo3 import (
     POLL_SECS, MAX_POLLS, load_keys, gen_veo_clip, gen_tts,
     probe_duration, compose_scene, concat_scenes,
 )
+import media_probe
 
 
 def main():
@@ -78,8 +83,8 @@ def main():
         # TTS narration
         if not (os.path.exists(narr_mp3) and os.path.getsize(narr_mp3) > 1_000):
             print(f"       TTS narration …", end="", flush=True)
-            gen_tts(SCENES[i]["narration"], narr_mp3, openai_key)
-            print(f" ✓  ({probe_duration(narr_mp3):.1f}s)")
+            dur = gen_tts(SCENES[i]["narration"], narr_mp3, openai_key)
+            print(f" ✓  ({dur:.1f}s)")
         else:
             print(f"       TTS already exists ({probe_duration(narr_mp3):.1f}s)")
 
@@ -92,7 +97,7 @@ def main():
     concat_scenes(scene_mp4s, output_mp4)
 
     size_mb   = os.path.getsize(output_mp4) / 1e6
-    total_dur = sum(probe_duration(s) for s in scene_mp4s)
+    total_dur = sum(media_probe.durations(scene_mp4s, default=VEO_SECS))
     print(f"\n✅  Done: {output_mp4}")
     print(f"   {size_mb:.1f} MB  |  ~{total_dur:.0f}s  |  720×1280  |  24fps")
     print(f"\n   Open with:  open \"{output_mp4}\"")
@@ -54,23 +54,49 @@ def extract_scenario_data(html_path):
     with open(html_path, "r", encoding="utf-8") as f:
         content = f.read()
 
-    data = {}
-    for var in ["__SCENARIO__", "__SCREENS__", "__SCREENS_NEUTRAL__"]:
-        pattern = rf'window\.{re.escape(var)}\s*=\s*(\{{.*?\}});'
-        match = re.search(pattern, content, re.DOTALL)
-        if match:
-            try:
-                data[var] = json.loads(match.group(1))
-            except json.JSONDecodeError as e:
+    # `ui_trainer.py --data external` puts the data in a hashed JSON file
+    external = re.search(r'id="trainer-data"[^>]*href="([^"]+)"', content)
+    if external:
+        with open(os.path.join(os.path.dirname(html_path), external.group(1)), encoding="utf-8") as f:
+            payload = json.load(f)
+        data = {"__SCENARIO__": payload.get("scenario"), "__SCREENS__": payload.get("screens"),
+                "__SCREENS_NEUTRAL__": payload.get("screens_neutral")}
+    else:
+        data = {}
+        for var in ["__SCENARIO__", "__SCREENS__", "__SCREENS_NEUTRAL__"]:
+            pattern = rf'window\.{re.escape(var)}\s*=\s*(\{{.*?\}});'
+            match = re.search(pattern, content, re.DOTALL)
+            if match:
+                try:
+                    data[var] = json.loads(match.group(1))
+                except json.JSONDecodeError as e:
+                    data[var] = None
+                    print(f"  {COLOR_FAIL}FAIL{COLOR_RESET} Could not parse {var}: {e}")
+            else:
                 data[var] = None
-                print(f"  {COLOR_FAIL}FAIL{COLOR_RESET} Could not parse {var}: {e}")
-        else:
-            data[var] = None
-            print(f"  {COLOR_FAIL}FAIL{COLOR_RESET} {var} not found in HTML")
+                print(f"  {COLOR_FAIL}FAIL{COLOR_RESET} {var} not found in HTML")
+
+    # Optimized builds map screens to {src, webp, width, height, tiles}; src is
+    # the PNG. Highlighted screens built as overlays share the neutral src and
+    # list the highlight tiles drawn over it.
+    data["__TILES__"] = {k: v.get("tiles", []) for k, v in (data.get("__SCREENS__") or {}).items()
+                         if isinstance(v, dict)}
+    for var in ["__SCREENS__", "__SCREENS_NEUTRAL__"]:
+        if data.get(var):
+            data[var] = {k: v["src"] if isinstance(v, dict) else v for k, v in data[var].items()}
 
     return data
 
 
+def open_highlighted(scenario_dir, data, screen_name):
+    """Highlighted screen as an RGB image, with any overlay tiles composited in."""
+    img = Image.open(os.path.join(scenario_dir, data["__SCREENS__"][screen_name])).convert("RGB")
+    for tile in data.get("__TILES__", {}).get(screen_name, []):
+        img.paste(Image.open(os.path.join(scenario_dir, tile["src"])).convert("RGB"),
+                  (tile["x"], tile["y"]))
+    return img
+
+
 def check_structural(scenario_dir, data):
     """Check that all referenced files exist and images are valid."""
     issues = []
@@ -111,6 +137,11 @@ def check_structural(scenario_dir, data):
                 except Exception as e:
                     issues.append(("FAIL", f"Cannot open {label}/{key}: {e}"))
 
+    for key, tiles in data.get("__TILES__", {}).items():
+        for tile in tiles:
+            if not os.path.exists(os.path.join(scenario_dir, tile["src"])):
+                issues.append(("FAIL", f"Missing highlight tile: {tile['src']}"))
+
     # Check required scenario fields
     for field in ["id", "title", "site", "role", "branding", "mission"]:
         if field not in scenario:
@@ -202,7 +233,7 @@ def check_highlight_alignment(scenario_dir, data):
     highlight is, then verify the hotspot actually overlaps it.
 
     The screen generator bakes highlights (orange borders, tinted cells) into
-    the 'screens/' images. The 'screens_neutral/' images are identical except
+    the 'screens/' images (or overlay tiles drawn over the neutral base). The 'screens_neutral/' images are identical except
     without those highlights. Diffing the two reveals the highlighted region.
     If the hotspot doesn't overlap that region, the target is misaligned.
     """
@@ -229,7 +260,7 @@ def check_highlight_alignment(scenario_dir, data):
         if not os.path.exists(hi_path) or not os.path.exists(lo_path):
             continue
 
-        hi_img = np.array(Image.open(hi_path).convert("RGB"), dtype=np.int16)
+        hi_img = np.array(open_highlighted(scenario_dir, data, screen_name), dtype=np.int16)
         lo_img = np.array(Image.open(lo_path).convert("RGB"), dtype=np.int16)
 
         # Compute per-pixel colour difference
@@ -311,6 +342,12 @@ def check_back_links(scenario_dir):
     html_path = os.path.join(scenario_dir, "index.html")
     with open(html_path, "r", encoding="utf-8") as f:
         content = f.read()
+    # A precompiled engine lives in _runtime/, outside index.html
+    for src in set(re.findall(r'"(\.\./_runtime/trainer_app\.[0-9a-f]+\.js)"', content)):
+        engine_path = os.path.join(scenario_dir, src)
+        if os.path.exists(engine_path):
+            with open(engine_path, "r", encoding="utf-8") as f:
+                content += f.read()
 
     selector_refs = content.count("selector.html")
     index_refs = len(re.findall(r'["\']\.\.\/index\.html["\']', content))
@@ -358,7 +395,7 @@ def generate_visual_overlays(scenario_dir, data, output_dir):
             issues.append(("FAIL", f"Screen {i}: Cannot load {img_path}"))
             continue
 
-        img = Image.open(img_path).convert("RGBA")
+        img = open_highlighted(scenario_dir, data, screen_name).convert("RGBA")
         overlay = Image.new("RGBA", img.size, (0, 0, 0, 0))
         draw = ImageDraw.Draw(overlay)
 